@@ -0,0 +1,287 @@
+"""Micro-benchmarks for the simulator's hot paths, with a checked-in baseline.
+
+Times repository CRUD against databases of ``--rows`` tickets, catalog scenario and
+persona picks, the rule-based response engine, grading a long transcript and report
+generation over the closed-ticket set. Each case reports the best per-call time
+over ``--repeat`` timeit runs. Write cases put the seeded data back before every
+run, so each one times the same table sizes as the baseline.
+
+Usage (from the ``simulator`` directory)::
+
+    python benchmarks/bench_hot_paths.py                       # print timings
+    python benchmarks/bench_hot_paths.py --check               # fail on regressions
+    python benchmarks/bench_hot_paths.py --rows 10000,100000 --update-baseline
+
+``--check`` exits with status 1 when a case is more than ``--threshold`` times slower
+than ``baseline.json``. Baselines are machine-specific: refresh them on the machine
+that runs the check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable, Iterator
+from datetime import timedelta
+from pathlib import Path
+
+from helpdesk_sim.domain.models import TicketTier
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.services.catalog_service import CatalogService
+from helpdesk_sim.services.generation_service import GenerationService
+from helpdesk_sim.services.grading_service import GradingService
+from helpdesk_sim.services.report_service import ReportService
+from helpdesk_sim.services.response_engine import RuleBasedResponseEngine
+from helpdesk_sim.utils import utc_now
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+TEMPLATES_DIR = BENCH_DIR.parent / "src" / "helpdesk_sim" / "templates"
+TRANSCRIPT_LENGTH = 500
+SCORE = {
+    "score": {"total": 72, "sla": 8},
+    "metrics": {"first_response_minutes": 4.5, "resolution_minutes": 38.0},
+    "missed_checks": ["check vpn client version"],
+}
+
+# (name, timed call, reset run before each timeit run or None for read-only cases)
+Case = tuple[str, Callable[[], object], Callable[[], None] | None]
+
+
+def _catalog() -> CatalogService:
+    catalog = CatalogService(templates_dir=TEMPLATES_DIR, rng=random.Random(7))
+    catalog.load()
+    return catalog
+
+
+def _seed(repository: SimulatorRepository, generation: GenerationService, rows: int) -> list[str]:
+    """``rows`` closed, graded tickets with one customer interaction each, in one commit."""
+    now = utc_now()
+    profile = generation.catalog.list_profile_definitions()[0]
+    session = repository.create_session(
+        profile_name=profile.name,
+        started_at=now,
+        ends_at=now + timedelta(hours=8),
+        next_window_at=now,
+        config=profile.model_dump(mode="json"),
+    )
+    ticket_ids: list[str] = []
+    with repository.transaction():
+        for index in range(rows):
+            generated = generation.build_ticket(session_id=session.id, profile=profile)
+            record = repository.create_ticket(
+                session_id=session.id,
+                subject=generated.subject,
+                tier=generated.tier.value,
+                priority=generated.priority.value,
+                scenario_id=generated.scenario_id,
+                hidden_truth=generated.hidden_truth,
+                zammad_ticket_id=1000 + index,
+            )
+            repository.add_interaction(record.id, "customer", generated.body, {})
+            repository.close_ticket(record.id, score=SCORE)
+            ticket_ids.append(record.id)
+    return ticket_ids
+
+
+def _restore_seed(repository: SimulatorRepository) -> Callable[[], None]:
+    """A reset that deletes every ticket and interaction added after this call."""
+
+    def high_water(conn: sqlite3.Connection, table: str) -> int:
+        return conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+
+    with repository._connect() as conn:
+        marks = {table: high_water(conn, table) for table in ("tickets", "interactions")}
+
+    def reset() -> None:
+        def op(conn: sqlite3.Connection) -> None:
+            for table, mark in marks.items():
+                conn.execute(f"DELETE FROM {table} WHERE rowid > ?", (mark,))
+
+        repository._write(op)
+
+    return reset
+
+
+def repository_cases(scratch: Path, rows: int) -> Iterator[Case]:
+    repository = SimulatorRepository(scratch / f"bench-{rows}.db", write_queue=True)
+    try:
+        repository.initialize()
+        generation = GenerationService(catalog=_catalog(), rng=random.Random(7))
+        ticket_ids = _seed(repository, generation, rows)
+        reset = _restore_seed(repository)
+        session_id = repository.get_ticket(ticket_ids[0]).session_id
+        sample = repository.get_ticket(ticket_ids[0])
+        ids = itertools.cycle(random.Random(7).sample(ticket_ids, min(rows, 1000)))
+        label = f"{rows // 1000}k"
+
+        def create_ticket() -> object:
+            return repository.create_ticket(
+                session_id=session_id,
+                subject=sample.subject,
+                tier=sample.tier.value,
+                priority=sample.priority.value,
+                scenario_id=sample.scenario_id,
+                hidden_truth=sample.hidden_truth,
+                zammad_ticket_id=None,
+            )
+
+        def add_interaction() -> object:
+            return repository.add_interaction(
+                next(ids), "agent", "Could you share the exact error message?", {}
+            )
+
+        yield f"repository.create_ticket[{label}]", create_ticket, reset
+        yield f"repository.get_ticket[{label}]", lambda: repository.get_ticket(next(ids)), None
+        yield f"repository.add_interaction[{label}]", add_interaction, reset
+        yield f"repository.list_tickets_for_session[{label}]", lambda: (
+            repository.list_tickets_for_session(session_id, limit=200)
+        ), None
+        # Re-closing a closed ticket rewrites the same row; the table does not grow.
+        yield f"repository.close_ticket[{label}]", lambda: repository.close_ticket(
+            next(ids), SCORE
+        ), None
+        report = ReportService(repository=repository)
+        yield f"report.generate_weekly[{label}]", lambda: report.generate("weekly"), None
+    finally:
+        repository.close()
+
+
+def service_cases(scratch: Path) -> Iterator[Case]:
+    catalog = _catalog()
+    scenario = catalog.pick_scenario(tier=TicketTier.tier1)
+    yield "catalog.pick_scenario", lambda: catalog.pick_scenario(tier=TicketTier.tier1), None
+    yield "catalog.pick_persona", lambda: catalog.pick_persona(scenario), None
+
+    generation = GenerationService(catalog=catalog, rng=random.Random(7))
+    profile = catalog.list_profile_definitions()[0]
+    generated = generation.build_ticket(session_id="bench", profile=profile)
+    engine = RuleBasedResponseEngine()
+    questions = itertools.cycle(
+        [
+            "Could you share the exact error message?",
+            "When did this start, and does a restart help?",
+            "Please send a screenshot of what you see.",
+            *generated.hidden_truth["expected_agent_checks"],
+        ]
+    )
+    yield "response_engine.generate_reply", lambda: engine.generate_reply(
+        next(questions), generated.hidden_truth
+    ), None
+
+    repository = SimulatorRepository(scratch / "grading.db")
+    try:
+        repository.initialize()
+        session = repository.create_session(
+            profile_name=profile.name,
+            started_at=utc_now(),
+            ends_at=utc_now() + timedelta(hours=8),
+            next_window_at=utc_now(),
+            config=profile.model_dump(mode="json"),
+        )
+        ticket = repository.create_ticket(
+            session_id=session.id,
+            subject=generated.subject,
+            tier=generated.tier.value,
+            priority=generated.priority.value,
+            scenario_id=generated.scenario_id,
+            hidden_truth=generated.hidden_truth,
+            zammad_ticket_id=None,
+        )
+        with repository.transaction():
+            for index in range(TRANSCRIPT_LENGTH):
+                actor = "agent" if index % 2 else "customer"
+                repository.add_interaction(ticket.id, actor, f"{actor} message {index}", {})
+        interactions = repository.list_interactions(ticket.id)
+    finally:
+        repository.close()
+    grading = GradingService()
+    yield f"grading.grade_ticket[{TRANSCRIPT_LENGTH} interactions]", lambda: (
+        grading.grade_ticket(ticket=ticket, interactions=interactions, profile=profile)
+    ), None
+
+
+def measure(
+    func: Callable[[], object], repeat: int, reset: Callable[[], None] | None = None
+) -> float:
+    """Best per-call time in microseconds; ``reset`` runs untimed before each run."""
+    reset = reset or (lambda: None)
+    timer = timeit.Timer(func)
+    reset()
+    number, _ = timer.autorange()
+    best = float("inf")
+    for _ in range(repeat):
+        reset()
+        best = min(best, timer.timeit(number))
+    reset()
+    return best / number * 1_000_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10000", help="comma-separated repository sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--check", action="store_true", help="compare against the baseline")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown ratio")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline.exists() else {}
+    results: dict[str, float] = {}
+    regressions: list[str] = []
+    with tempfile.TemporaryDirectory(prefix="helpdesk-sim-hot-paths-") as scratch_dir:
+        scratch = Path(scratch_dir)
+        suites = [service_cases(scratch)]
+        suites.extend(repository_cases(scratch, int(rows)) for rows in args.rows.split(","))
+        print(f"{'case':<44} {'us/call':>12} {'baseline':>12} {'ratio':>7}")
+        try:
+            for name, func, reset in itertools.chain.from_iterable(suites):
+                if args.filter not in name:
+                    continue
+                results[name] = micros = round(measure(func, args.repeat, reset), 3)
+                reference = baseline.get(name)
+                ratio = micros / reference if reference else None
+                flag = ""
+                if ratio is not None and ratio > args.threshold:
+                    regressions.append(name)
+                    flag = "  REGRESSION"
+                compared = (
+                    f"{reference:>12.3f} {ratio:>7.2f}" if ratio else f"{'-':>12} {'-':>7}"
+                )
+                print(f"{name:<44} {micros:>12.3f} {compared}{flag}")
+        finally:
+            # Closes the repositories of suites an error left unfinished.
+            for suite in suites:
+                suite.close()
+
+    if args.update_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": f"{platform.system()} {platform.machine()}",
+                    "results": dict(sorted(merged.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"updated {args.baseline}")
+    if args.check and regressions:
+        print(f"{len(regressions)} case(s) slower than {args.threshold}x baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
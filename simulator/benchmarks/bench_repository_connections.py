@@ -0,0 +1,160 @@
+"""Compare repository throughput across the SQLite connection strategies.
+
+Usage (from the ``simulator`` directory)::
+
+    python benchmarks/bench_repository_connections.py --ops 2000 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import TypeVar
+
+from helpdesk_sim.repositories.migrations import apply_migrations
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.utils import utc_now
+
+T = TypeVar("T")
+
+
+class LegacyConnectRepository(SimulatorRepository):
+    """Reproduces the old behaviour: a fresh, rollback-journal connection for every call.
+
+    Reads, writes, transactions and migrations all bypass the pool and the write
+    queue, so nothing leaves the database file in WAL mode.
+    """
+
+    def initialize(self) -> None:
+        with self._open() as conn:
+            apply_migrations(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+        with self._open() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                with conn:
+                    yield
+            finally:
+                self._local.conn = None
+
+    def _write(self, op: Callable[[sqlite3.Connection], T]) -> T:
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            return op(active)
+        with self._open() as conn, conn:
+            return op(conn)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            yield active
+            return
+        with self._open() as conn, conn:
+            yield conn
+
+    @contextmanager
+    def _open(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = DELETE")
+            yield conn
+        finally:
+            conn.close()
+
+
+def _seed(repository: SimulatorRepository, tickets: int) -> list[str]:
+    now = utc_now()
+    session = repository.create_session(
+        profile_name="bench",
+        started_at=now,
+        ends_at=now + timedelta(hours=8),
+        next_window_at=now,
+        config={"name": "bench"},
+    )
+    ticket_ids: list[str] = []
+    for index in range(tickets):
+        record = repository.create_ticket(
+            session_id=session.id,
+            subject=f"Bench ticket {index}",
+            tier="tier1",
+            priority="normal",
+            scenario_id="bench",
+            hidden_truth={"persona": {"role": "HR"}},
+            zammad_ticket_id=1000 + index,
+        )
+        ticket_ids.append(record.id)
+    return ticket_ids
+
+
+def _run(repository: SimulatorRepository, ticket_ids: list[str], ops: int, threads: int) -> float:
+    per_thread = max(ops // threads, 1)
+
+    def worker(offset: int) -> None:
+        for index in range(per_thread):
+            ticket_id = ticket_ids[(offset + index) % len(ticket_ids)]
+            match index % 3:
+                case 0:
+                    repository.get_ticket(ticket_id)
+                case 1:
+                    repository.add_interaction(ticket_id=ticket_id, actor="agent", body="bench")
+                case _:
+                    repository.list_interactions(ticket_id)
+
+    pool = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return (per_thread * threads) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=3000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--tickets", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results: dict[str, float] = {}
+        for index, (label, factory) in enumerate(
+            (
+                ("per-call connect", LegacyConnectRepository),
+                ("pooled + WAL", SimulatorRepository),
+                ("write queue", partial(SimulatorRepository, write_queue=True)),
+            )
+        ):
+            repository = factory(Path(tmp) / f"bench-{index}.db")
+            repository.initialize()
+            ticket_ids = _seed(repository, args.tickets)
+            results[label] = _run(repository, ticket_ids, args.ops, args.threads)
+            repository.close()
+
+    for label, ops_per_second in results.items():
+        print(f"{label:>18}: {ops_per_second:10.1f} ops/sec")
+    baseline = results["per-call connect"]
+    if baseline:
+        for label in ("pooled + WAL", "write queue"):
+            print(f"{'speedup ' + label:>18}: {results[label] / baseline:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
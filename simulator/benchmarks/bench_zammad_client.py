@@ -0,0 +1,125 @@
+"""Compare Zammad gateway request latency: a client per call vs one pooled client.
+
+Runs against a local keep-alive stub server, so it measures connection setup and
+client construction only. Against a real Zammad over TLS the gap is larger because
+every fresh connection also pays a TLS handshake.
+
+Usage (from the ``simulator`` directory)::
+
+    python benchmarks/bench_zammad_client.py --requests 500
+
+``--fake-zammad`` swaps the stub for ``helpdesk_sim.fake_zammad`` so the requests hit
+real Zammad routes, optionally with injected latency (``--latency-ms``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+
+from helpdesk_sim.adapters.zammad_http_gateway import ZammadHttpGateway
+from helpdesk_sim.fake_zammad import FakeZammadConfig, FakeZammadServer
+
+
+class _StubZammadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus delayed
+    # ACKs add ~40 ms to every response on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.startswith("/api/v1/ticket_articles/by_ticket/"):
+            payload: Any = []
+        else:
+            payload = {"id": 1, "state": "open"}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+class PerCallClientGateway(ZammadHttpGateway):
+    """Reproduces the old behaviour: a new httpx.Client (and connection) per request."""
+
+    def _request(self, method: str, path: str, json: dict[str, Any] | None = None) -> Any:
+        headers = {
+            "Authorization": f"Token token={self.token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        with httpx.Client(base_url=self.base_url, verify=self.verify_tls, timeout=20.0) as client:
+            response = client.request(method, path, headers=headers, json=json)
+            response.raise_for_status()
+            return response.json() if response.content else {}
+
+
+def _measure(gateway: ZammadHttpGateway, requests: int) -> list[float]:
+    latencies: list[float] = []
+    for index in range(requests):
+        started = time.perf_counter()
+        if index % 2:
+            gateway.is_ticket_closed(1)
+        else:
+            gateway.fetch_new_articles(zammad_ticket_id=1, after_article_id=0)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--fake-zammad", action="store_true", help="use the fake Zammad server")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake Zammad latency")
+    args = parser.parse_args()
+
+    if args.fake_zammad:
+        fake = FakeZammadServer(
+            FakeZammadConfig(tickets=1, latency_seconds=args.latency_ms / 1000)
+        ).start()
+        base_url = fake.base_url
+        shutdown = fake.stop
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubZammadHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        shutdown = server.shutdown
+
+    results: dict[str, list[float]] = {}
+    try:
+        for label, factory in (
+            ("client per call", PerCallClientGateway),
+            ("pooled client", ZammadHttpGateway),
+        ):
+            gateway = factory(base_url=base_url, token="bench")
+            _measure(gateway, 20)  # warm-up
+            results[label] = _measure(gateway, args.requests)
+            gateway.close()
+    finally:
+        shutdown()
+
+    for label, latencies in results.items():
+        ordered = sorted(latencies)
+        p95 = ordered[int(len(ordered) * 0.95) - 1]
+        print(
+            f"{label:>16}: mean {statistics.fmean(latencies):7.3f} ms"
+            f"  p50 {statistics.median(latencies):7.3f} ms  p95 {p95:7.3f} ms"
+        )
+    baseline = statistics.fmean(results["client per call"])
+    pooled = statistics.fmean(results["pooled client"])
+    print(f"{'speedup':>16}: {baseline / pooled:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+
+from helpdesk_sim.domain.models import CustomerDirectoryEntry
+from helpdesk_sim.utils import utc_now
+
+DEPARTMENT = "department"
+EMAIL = "email"
+
+
+def normalize_key(value: str) -> str:
+    return " ".join(value.strip().split()).lower()
+
+
+class CustomerDirectory:
+    """Department and customer lookups the gateway would otherwise repeat per ticket.
+
+    Entries older than ``refresh_after_seconds`` are still served; the background
+    refresh re-resolves them, so ticket creation never waits on a search once the
+    directory is warm. ``on_update`` receives every new or refreshed entry (used to
+    persist the directory across restarts).
+    """
+
+    def __init__(
+        self,
+        refresh_after_seconds: float = 3600.0,
+        seed_departments: Iterable[str] = (),
+        seed_emails: Iterable[str] = (),
+        on_update: Callable[[CustomerDirectoryEntry], None] | None = None,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        self.refresh_after = timedelta(seconds=refresh_after_seconds)
+        self.seed_departments = sorted({normalize_key(item) for item in seed_departments} - {""})
+        self.seed_emails = sorted({normalize_key(item) for item in seed_emails} - {""})
+        self._on_update = on_update
+        self._clock = clock
+        self._entries: dict[tuple[str, str], CustomerDirectoryEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, entries: Iterable[CustomerDirectoryEntry]) -> int:
+        """Bulk-load entries, e.g. from persistent storage, without re-persisting them."""
+        loaded = 0
+        with self._lock:
+            for entry in entries:
+                self._entries[(entry.kind, entry.key)] = entry
+                loaded += 1
+        return loaded
+
+    def department(self, department: str) -> CustomerDirectoryEntry | None:
+        return self._get(DEPARTMENT, department)
+
+    def is_known_customer(self, email: str) -> bool:
+        entry = self._get(EMAIL, email)
+        return entry is not None and entry.email is not None
+
+    def record_department(self, department: str, email: str | None) -> None:
+        self._record(DEPARTMENT, department, normalize_key(email) if email else None)
+
+    def record_customer(self, email: str) -> None:
+        self._record(EMAIL, email, normalize_key(email))
+
+    def forget_customer(self, email: str) -> None:
+        self._record(EMAIL, email, None)
+
+    def stale_departments(self) -> list[str]:
+        """Seed and cached departments that were never resolved or are due a refresh."""
+        return self._stale(DEPARTMENT, self.seed_departments)
+
+    def stale_customers(self) -> list[str]:
+        return self._stale(EMAIL, self.seed_emails)
+
+    def invalidate(self, key: str | None = None) -> int:
+        with self._lock:
+            if key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            normalized = normalize_key(key)
+            doomed = [item for item in self._entries if item[1] == normalized]
+            for item in doomed:
+                del self._entries[item]
+            return len(doomed)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            departments = sum(1 for kind, _ in self._entries if kind == DEPARTMENT)
+            return {
+                "entries": len(self._entries),
+                "departments": departments,
+                "customers": len(self._entries) - departments,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _get(self, kind: str, key: str) -> CustomerDirectoryEntry | None:
+        with self._lock:
+            entry = self._entries.get((kind, normalize_key(key)))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def _record(self, kind: str, key: str, email: str | None) -> None:
+        entry = CustomerDirectoryEntry(
+            kind=kind,
+            key=normalize_key(key),
+            email=email,
+            refreshed_at=self._clock(),
+        )
+        with self._lock:
+            self._entries[(kind, entry.key)] = entry
+        if self._on_update is not None:
+            self._on_update(entry)
+
+    def _stale(self, kind: str, seeds: list[str]) -> list[str]:
+        cutoff = self._clock() - self.refresh_after
+        with self._lock:
+            cached = {
+                key: entry
+                for (entry_kind, key), entry in self._entries.items()
+                if entry_kind == kind
+            }
+        due = [key for key in seeds if key not in cached]
+        due.extend(key for key, entry in cached.items() if entry.refreshed_at <= cutoff)
+        return due
@@ -1,70 +1,322 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import bisect
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol
 
-from helpdesk_sim.adapters.gateway import TicketArticle
+from helpdesk_sim.adapters.gateway import TicketArticle, TicketUpdate
+from helpdesk_sim.adapters.zammad_resilience import ZammadApiError
 from helpdesk_sim.domain.models import GeneratedTicket
+from helpdesk_sim.utils import utc_now
+
+DEFAULT_AGENT_REPLIES = (
+    "Thanks for reaching out. Could you share the exact error message you see?",
+    "Which device and application are you using when this happens?",
+    "I've applied a fix on our side. Can you confirm whether it works now?",
+)
+
+
+@dataclass(slots=True, frozen=True)
+class AgentAction:
+    """Something the agent bot does to a ticket ``delay_seconds`` after a customer article."""
+
+    delay_seconds: float
+    body: str | None = None
+    close: bool = False
+
+
+class AgentBot(Protocol):
+    def on_customer_article(self, zammad_ticket_id: int, agent_replies: int) -> list[AgentAction]:
+        """Actions to schedule after a customer article; ``agent_replies`` counts earlier ones."""
+        ...
+
+
+class ScriptedAgentBot:
+    """Answers each customer article after a delay and closes the ticket after N replies."""
+
+    def __init__(
+        self,
+        reply_after_seconds: float = 60.0,
+        jitter_seconds: float = 0.0,
+        close_after_replies: int = 2,
+        replies: Sequence[str] = DEFAULT_AGENT_REPLIES,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.reply_after_seconds = reply_after_seconds
+        self.jitter_seconds = jitter_seconds
+        self.close_after_replies = max(close_after_replies, 1)
+        self.replies = tuple(replies) or DEFAULT_AGENT_REPLIES
+        self._rng = rng or random.Random()
+
+    def on_customer_article(self, zammad_ticket_id: int, agent_replies: int) -> list[AgentAction]:
+        delay = max(
+            self.reply_after_seconds + self._rng.uniform(-self.jitter_seconds, self.jitter_seconds),
+            0.0,
+        )
+        body = self.replies[agent_replies % len(self.replies)]
+        return [
+            AgentAction(
+                delay_seconds=delay,
+                body=body,
+                close=agent_replies + 1 >= self.close_after_replies,
+            )
+        ]
 
 
 class DryRunGateway:
-    """In-memory adapter used for local simulator development and tests."""
+    """In-memory adapter used for local simulator development, tests and soak runs.
+
+    Articles are stored per ticket in id order and ticket updates in an ordered log,
+    so polling stays cheap with very large ticket counts. ``latency_seconds`` and
+    ``failure_rate`` imitate a slow or flaky Zammad (failures raise ``ZammadApiError``
+    503, like the HTTP gateway), and an ``agent_bot`` plays the agent side: its
+    actions are applied once due, on the next gateway read.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        failure_rate: float = 0.0,
+        agent_bot: AgentBot | None = None,
+        rng: random.Random | None = None,
+        clock: Callable[[], datetime] = utc_now,
+        zammad_clock: Callable[[], datetime] = utc_now,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.agent_bot = agent_bot
+        self._rng = rng or random.Random()
+        # ``clock`` times the agent bot (simulated time); ``zammad_clock`` stamps
+        # updated_at, which a real Zammad keeps in real time.
+        self._clock = clock
+        self._zammad_clock = zammad_clock
+        self._sleep = sleep
+        self._lock = threading.RLock()
         self._next_ticket_id = 1000
         self._tickets: dict[int, dict[str, object]] = {}
-        self._articles: defaultdict[int, list[TicketArticle]] = defaultdict(list)
-
-    def create_ticket(self, ticket: GeneratedTicket) -> int:
-        ticket_id = self._next_ticket_id
-        self._next_ticket_id += 1
-        self._tickets[ticket_id] = {
-            "subject": ticket.subject,
-            "closed": False,
-        }
-        self._articles[ticket_id].append(
-            TicketArticle(id=1, body=ticket.body, sender="customer")
-        )
-        return ticket_id
+        self._articles: dict[int, list[TicketArticle]] = {}
+        self._updated_at: dict[int, datetime] = {}
+        # (updated_at, ticket_id) in time order; superseded entries are skipped on
+        # read and dropped when the log is compacted.
+        self._update_log: list[tuple[datetime, int]] = []
+        self._idempotency_keys: dict[str, int] = {}
+        # Reply idempotency key -> (ticket id, article id).
+        self._article_keys: dict[str, tuple[int, int]] = {}
+        self._agent_replies: dict[int, int] = {}
+        self._agent_queue: list[tuple[datetime, int, int, AgentAction]] = []
+        self._agent_sequence = itertools.count()
+        self.injected_failures = 0
 
-    def fetch_new_articles(self, zammad_ticket_id: int, after_article_id: int) -> list[TicketArticle]:
-        return [
-            article
-            for article in self._articles.get(zammad_ticket_id, [])
-            if article.id > after_article_id
-        ]
+    def create_ticket(self, ticket: GeneratedTicket, idempotency_key: str | None = None) -> int:
+        self._simulate("create_ticket")
+        with self._lock:
+            if idempotency_key in self._idempotency_keys:
+                return self._idempotency_keys[idempotency_key]
+            ticket_id = self._next_ticket_id
+            self._next_ticket_id += 1
+            self._tickets[ticket_id] = {
+                "subject": ticket.subject,
+                "closed": False,
+            }
+            self._articles[ticket_id] = []
+            self._append_article(ticket_id, ticket.body, "customer")
+            if idempotency_key is not None:
+                self._idempotency_keys[idempotency_key] = ticket_id
+            return ticket_id
 
-    def post_customer_reply(self, zammad_ticket_id: int, body: str, subject: str) -> None:
-        next_id = len(self._articles.get(zammad_ticket_id, [])) + 1
-        self._articles[zammad_ticket_id].append(
-            TicketArticle(id=next_id, body=body, sender="customer")
-        )
+    def find_ticket_by_idempotency_key(self, idempotency_key: str) -> int | None:
+        self._simulate("find_ticket_by_idempotency_key")
+        with self._lock:
+            return self._idempotency_keys.get(idempotency_key)
+
+    def find_article_by_idempotency_key(
+        self, zammad_ticket_id: int, idempotency_key: str
+    ) -> int | None:
+        self._simulate("find_article_by_idempotency_key")
+        with self._lock:
+            found = self._article_keys.get(idempotency_key)
+            return found[1] if found and found[0] == zammad_ticket_id else None
+
+    def fetch_new_articles(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> list[TicketArticle]:
+        self._simulate("fetch_new_articles")
+        with self._lock:
+            self._apply_due_agent_actions()
+            return self._articles_after(zammad_ticket_id, after_article_id)
+
+    def post_customer_reply(
+        self,
+        zammad_ticket_id: int,
+        body: str,
+        subject: str,
+        idempotency_key: str | None = None,
+    ) -> None:
+        self._simulate("post_customer_reply")
+        with self._lock:
+            if idempotency_key in self._article_keys:
+                return
+            self._articles.setdefault(zammad_ticket_id, [])
+            article_id = self._append_article(zammad_ticket_id, body, "customer")
+            if idempotency_key is not None:
+                self._article_keys[idempotency_key] = (zammad_ticket_id, article_id)
 
     def is_ticket_closed(self, zammad_ticket_id: int) -> bool:
+        self._simulate("is_ticket_closed")
+        with self._lock:
+            self._apply_due_agent_actions()
+            return self._is_closed(zammad_ticket_id)
+
+    def fetch_ticket_updates(self, zammad_ticket_id: int, after_article_id: int) -> TicketUpdate:
+        self._simulate("fetch_ticket_updates")
+        with self._lock:
+            self._apply_due_agent_actions()
+            return TicketUpdate(
+                articles=self._articles_after(zammad_ticket_id, after_article_id),
+                closed=self._is_closed(zammad_ticket_id),
+            )
+
+    def search_updated_tickets(self, since: datetime) -> dict[int, datetime]:
+        self._simulate("search_updated_tickets")
+        with self._lock:
+            self._apply_due_agent_actions()
+            start = bisect.bisect_left(self._update_log, since, key=lambda entry: entry[0])
+            return {
+                ticket_id: updated_at
+                for updated_at, ticket_id in self._update_log[start:]
+                if self._updated_at.get(ticket_id) == updated_at
+            }
+
+    def delete_ticket(self, zammad_ticket_id: int) -> bool:
+        self._simulate("delete_ticket")
+        with self._lock:
+            existed = zammad_ticket_id in self._tickets
+            self._tickets.pop(zammad_ticket_id, None)
+            self._articles.pop(zammad_ticket_id, None)
+            self._updated_at.pop(zammad_ticket_id, None)
+            self._agent_replies.pop(zammad_ticket_id, None)
+            return existed
+
+    def close_ticket(self, zammad_ticket_id: int) -> bool:
+        self._simulate("close_ticket")
+        with self._lock:
+            return self._close(zammad_ticket_id)
+
+    def warm_up(self) -> None:
+        return None
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        return {}
+
+    def invalidate_caches(self, name: str | None = None, key: str | None = None) -> int:
+        if name is not None:
+            raise ValueError(f"unknown cache '{name}'")
+        return 0
+
+    def close(self) -> None:
+        return None
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "tickets": len(self._tickets),
+                "open_tickets": sum(1 for row in self._tickets.values() if not row["closed"]),
+                "articles": sum(len(rows) for rows in self._articles.values()),
+                "pending_agent_actions": len(self._agent_queue),
+                "injected_failures": self.injected_failures,
+            }
+
+    def run_agent_bot(self) -> int:
+        """Apply agent bot actions that are due now; returns how many were applied."""
+        with self._lock:
+            return self._apply_due_agent_actions()
+
+    # Convenience for tests/manual simulation.
+    def add_agent_reply(self, zammad_ticket_id: int, body: str) -> None:
+        with self._lock:
+            self._articles.setdefault(zammad_ticket_id, [])
+            self._append_article(zammad_ticket_id, body, "agent")
+
+    def _simulate(self, operation: str) -> None:
+        if self.latency_seconds > 0:
+            self._sleep(self.latency_seconds)
+        if self.failure_rate > 0 and self._rng.random() < self.failure_rate:
+            with self._lock:
+                self.injected_failures += 1
+            raise ZammadApiError(f"Dry-run {operation} failed (injected)", status_code=503)
+
+    def _articles_after(self, zammad_ticket_id: int, after_article_id: int) -> list[TicketArticle]:
+        articles = self._articles.get(zammad_ticket_id, [])
+        start = bisect.bisect_right(articles, after_article_id, key=lambda article: article.id)
+        return articles[start:]
+
+    def _is_closed(self, zammad_ticket_id: int) -> bool:
         ticket = self._tickets.get(zammad_ticket_id)
         if ticket is None:
             return False
         return bool(ticket.get("closed", False))
 
-    def delete_ticket(self, zammad_ticket_id: int) -> bool:
-        existed = zammad_ticket_id in self._tickets
-        self._tickets.pop(zammad_ticket_id, None)
-        self._articles.pop(zammad_ticket_id, None)
-        return existed
-
-    def close_ticket(self, zammad_ticket_id: int) -> bool:
+    def _close(self, zammad_ticket_id: int) -> bool:
         ticket = self._tickets.get(zammad_ticket_id)
         if ticket is None:
             return False
         ticket["closed"] = True
+        self._touch(zammad_ticket_id)
         return True
 
-    # Convenience for tests/manual simulation.
-    def add_agent_reply(self, zammad_ticket_id: int, body: str) -> None:
-        next_id = len(self._articles.get(zammad_ticket_id, [])) + 1
-        self._articles[zammad_ticket_id].append(
-            TicketArticle(id=next_id, body=body, sender="agent")
-        )
+    def _append_article(self, zammad_ticket_id: int, body: str, sender: str) -> int:
+        articles = self._articles[zammad_ticket_id]
+        article_id = len(articles) + 1
+        articles.append(TicketArticle(id=article_id, body=body, sender=sender))
+        self._touch(zammad_ticket_id)
+        if sender == "customer" and self.agent_bot is not None:
+            self._schedule_agent_actions(zammad_ticket_id)
+        return article_id
+
+    def _touch(self, zammad_ticket_id: int) -> None:
+        updated_at = self._zammad_clock()
+        self._updated_at[zammad_ticket_id] = updated_at
+        if self._update_log and updated_at < self._update_log[-1][0]:
+            bisect.insort(self._update_log, (updated_at, zammad_ticket_id))
+        else:
+            self._update_log.append((updated_at, zammad_ticket_id))
+        if len(self._update_log) > 2 * len(self._updated_at) + 1024:
+            self._update_log = sorted(
+                (stamp, ticket_id) for ticket_id, stamp in self._updated_at.items()
+            )
+
+    def _schedule_agent_actions(self, zammad_ticket_id: int) -> None:
+        if self._is_closed(zammad_ticket_id):
+            return
+        replies = self._agent_replies.get(zammad_ticket_id, 0)
+        now = self._clock()
+        for action in self.agent_bot.on_customer_article(zammad_ticket_id, replies):
+            due_at = now + timedelta(seconds=action.delay_seconds)
+            heapq.heappush(
+                self._agent_queue, (due_at, next(self._agent_sequence), zammad_ticket_id, action)
+            )
+            if action.body is not None:
+                replies += 1
+        self._agent_replies[zammad_ticket_id] = replies
 
-    def close_ticket(self, zammad_ticket_id: int) -> None:
-        if zammad_ticket_id in self._tickets:
-            self._tickets[zammad_ticket_id]["closed"] = True
+    def _apply_due_agent_actions(self) -> int:
+        applied = 0
+        now = self._clock()
+        while self._agent_queue and self._agent_queue[0][0] <= now:
+            _, _, ticket_id, action = heapq.heappop(self._agent_queue)
+            if ticket_id not in self._tickets or self._is_closed(ticket_id):
+                continue
+            if action.body is not None:
+                self._append_article(ticket_id, action.body, "agent")
+            if action.close:
+                self._close(ticket_id)
+            applied += 1
+        return applied
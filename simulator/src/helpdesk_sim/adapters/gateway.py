@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Protocol
 
 from helpdesk_sim.domain.models import GeneratedTicket
@@ -18,21 +20,129 @@ class TicketArticle:
         return "agent" in sender_lower or "system" in sender_lower
 
 
+@dataclass(slots=True)
+class TicketUpdate:
+    """What the poller needs about one ticket per tick: new articles and closed state."""
+
+    articles: list[TicketArticle]
+    closed: bool
+
+
 class ZammadGateway(Protocol):
-    def create_ticket(self, ticket: GeneratedTicket) -> int | None:
+    def create_ticket(
+        self, ticket: GeneratedTicket, idempotency_key: str | None = None
+    ) -> int | None:
+        ...
+
+    def find_ticket_by_idempotency_key(self, idempotency_key: str) -> int | None:
         ...
 
-    def fetch_new_articles(self, zammad_ticket_id: int, after_article_id: int) -> list[TicketArticle]:
+    def find_article_by_idempotency_key(
+        self, zammad_ticket_id: int, idempotency_key: str
+    ) -> int | None:
         ...
 
-    def post_customer_reply(self, zammad_ticket_id: int, body: str, subject: str) -> None:
+    def fetch_new_articles(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> list[TicketArticle]:
+        ...
+
+    def post_customer_reply(
+        self,
+        zammad_ticket_id: int,
+        body: str,
+        subject: str,
+        idempotency_key: str | None = None,
+    ) -> None:
         ...
 
     def is_ticket_closed(self, zammad_ticket_id: int) -> bool:
         ...
 
+    def fetch_ticket_updates(self, zammad_ticket_id: int, after_article_id: int) -> TicketUpdate:
+        ...
+
+    def search_updated_tickets(self, since: datetime) -> dict[int, datetime]:
+        ...
+
     def delete_ticket(self, zammad_ticket_id: int) -> bool:
         ...
 
     def close_ticket(self, zammad_ticket_id: int) -> bool:
         ...
+
+    def warm_up(self) -> None:
+        ...
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        ...
+
+    def invalidate_caches(self, name: str | None = None, key: str | None = None) -> int:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class AsyncZammadGateway(Protocol):
+    """The polling subset of the gateway, for concurrent fan-out on the event loop."""
+
+    async def fetch_new_articles(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> list[TicketArticle]:
+        ...
+
+    async def post_customer_reply(self, zammad_ticket_id: int, body: str, subject: str) -> None:
+        ...
+
+    async def is_ticket_closed(self, zammad_ticket_id: int) -> bool:
+        ...
+
+    async def fetch_ticket_updates(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> TicketUpdate:
+        ...
+
+    async def search_updated_tickets(self, since: datetime) -> dict[int, datetime]:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class ThreadedAsyncGateway:
+    """Runs a synchronous gateway's polling calls in worker threads.
+
+    Lets the async poller drive gateways that have no native async client, such
+    as DryRunGateway.
+    """
+
+    def __init__(self, gateway: ZammadGateway) -> None:
+        self.gateway = gateway
+
+    async def fetch_new_articles(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> list[TicketArticle]:
+        return await asyncio.to_thread(
+            self.gateway.fetch_new_articles, zammad_ticket_id, after_article_id
+        )
+
+    async def post_customer_reply(self, zammad_ticket_id: int, body: str, subject: str) -> None:
+        await asyncio.to_thread(self.gateway.post_customer_reply, zammad_ticket_id, body, subject)
+
+    async def is_ticket_closed(self, zammad_ticket_id: int) -> bool:
+        return await asyncio.to_thread(self.gateway.is_ticket_closed, zammad_ticket_id)
+
+    async def fetch_ticket_updates(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> TicketUpdate:
+        return await asyncio.to_thread(
+            self.gateway.fetch_ticket_updates, zammad_ticket_id, after_article_id
+        )
+
+    async def search_updated_tickets(self, since: datetime) -> dict[int, datetime]:
+        return await asyncio.to_thread(self.gateway.search_updated_tickets, since)
+
+    async def aclose(self) -> None:
+        # The wrapped gateway is owned (and closed) by whoever created it.
+        return None
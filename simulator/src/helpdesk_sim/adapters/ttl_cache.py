@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass(slots=True)
+class _Entry(Generic[V]):
+    value: V
+    expires_at: float
+
+
+class TtlCache(Generic[V]):
+    """Thread-safe key/value cache whose entries expire ``ttl_seconds`` after loading."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: dict[Hashable, _Entry[V]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    def get(self, key: Hashable) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], V]) -> V:
+        """Return the cached value, calling ``loader`` on a miss.
+
+        Loader errors propagate and are not cached. Concurrent misses for the same
+        key may each call the loader; the last result wins, which is harmless for
+        the idempotent lookups this cache is used for.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > self._clock():
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+        value = loader()
+        self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self.loads += 1
+            self._entries[key] = _Entry(value=value, expires_at=self._clock() + self.ttl_seconds)
+
+    def invalidate(self, key: Hashable | None = None) -> int:
+        """Drop one key, or everything when ``key`` is None; returns entries removed."""
+        with self._lock:
+            if key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            return 1 if self._entries.pop(key, None) is not None else 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            now = self._clock()
+            live = sum(1 for entry in self._entries.values() if entry.expires_at > now)
+            return {
+                "entries": live,
+                "hits": self.hits,
+                "misses": self.misses,
+                "loads": self.loads,
+            }
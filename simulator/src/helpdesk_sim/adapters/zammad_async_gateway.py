@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any
+
+import httpx
+
+from helpdesk_sim.adapters.gateway import TicketArticle, TicketUpdate
+from helpdesk_sim.adapters.ttl_cache import TtlCache
+from helpdesk_sim.adapters.zammad_http_gateway import (
+    METADATA_PATHS,
+    TICKET_SEARCH_MAX_PAGES,
+    TICKET_SEARCH_PAGE_SIZE,
+    ZammadHttpGateway,
+    client_options,
+    closed_from_states,
+    customer_reply_payload,
+    decode_response,
+    parse_ticket_all,
+    parse_ticket_articles,
+    parse_ticket_search,
+    state_type_name,
+    ticket_all_path,
+    ticket_search_path,
+)
+from helpdesk_sim.adapters.zammad_resilience import ZammadResilience
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncZammadHttpGateway:
+    """httpx.AsyncClient implementation of the calls the poller makes per ticket.
+
+    Ticket creation and admin operations stay on ZammadHttpGateway; this class
+    only covers the hot polling path so many tickets can be polled concurrently.
+    Pass the sync gateway's ``metadata_cache`` so ticket-state lookups share its
+    warm-up, stats and invalidation.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        verify_tls: bool = True,
+        timeout_seconds: float = 20.0,
+        connect_timeout_seconds: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry_seconds: float = 30.0,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        metadata_ttl_seconds: float = 900.0,
+        resilience: ZammadResilience | None = None,
+        metadata_cache: TtlCache[list[dict[str, Any]]] | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.resilience = resilience or ZammadResilience()
+        self._client = httpx.AsyncClient(
+            **client_options(
+                base_url=self.base_url,
+                token=token,
+                verify_tls=verify_tls,
+                timeout_seconds=timeout_seconds,
+                connect_timeout_seconds=connect_timeout_seconds,
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry_seconds=keepalive_expiry_seconds,
+                http2=http2,
+            ),
+            transport=transport,
+        )
+        # Keyed like ZammadHttpGateway's metadata cache, so the two can share one.
+        self._metadata: TtlCache[list[dict[str, Any]]] = metadata_cache or TtlCache(
+            ttl_seconds=metadata_ttl_seconds
+        )
+
+    async def fetch_new_articles(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> list[TicketArticle]:
+        data = await self._request("GET", f"/api/v1/ticket_articles/by_ticket/{zammad_ticket_id}")
+        return parse_ticket_articles(data, after_article_id)
+
+    async def post_customer_reply(self, zammad_ticket_id: int, body: str, subject: str) -> None:
+        payload = customer_reply_payload(zammad_ticket_id, body, subject)
+        await self._request("POST", "/api/v1/ticket_articles", json=payload)
+
+    async def is_ticket_closed(self, zammad_ticket_id: int) -> bool:
+        data = await self._request("GET", f"/api/v1/tickets/{zammad_ticket_id}")
+        return await self._ticket_closed(data)
+
+    async def fetch_ticket_updates(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> TicketUpdate:
+        data = await self._request("GET", ticket_all_path(zammad_ticket_id))
+        parsed = parse_ticket_all(data, zammad_ticket_id, after_article_id)
+        if parsed is None:
+            return TicketUpdate(
+                articles=await self.fetch_new_articles(zammad_ticket_id, after_article_id),
+                closed=await self.is_ticket_closed(zammad_ticket_id),
+            )
+        ticket, articles, states = parsed
+        return TicketUpdate(articles=articles, closed=await self._ticket_closed(ticket, states))
+
+    async def search_updated_tickets(self, since: datetime) -> dict[int, datetime]:
+        changes: dict[int, datetime] = {}
+        for page in range(1, TICKET_SEARCH_MAX_PAGES + 1):
+            data = await self._request("GET", ticket_search_path(since, page))
+            rows, count = parse_ticket_search(data)
+            changes.update(rows)
+            if count < TICKET_SEARCH_PAGE_SIZE:
+                break
+        return changes
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _ticket_closed(
+        self,
+        ticket: dict[str, Any],
+        embedded_states: list[dict[str, Any]] | None = None,
+    ) -> bool:
+        closed = closed_from_states(ticket, embedded_states or [])
+        if closed is None:
+            closed = closed_from_states(ticket, await self._ticket_state_rows())
+        if closed is None:
+            state_id = ticket["state_id"]
+            cached = self._metadata.get(("ticket_state", state_id))
+            if cached is None:
+                cached = [await self._request("GET", f"/api/v1/ticket_states/{state_id}")]
+                self._metadata.put(("ticket_state", state_id), cached)
+            closed = "closed" in state_type_name(cached[0])
+        return closed
+
+    async def _ticket_state_rows(self) -> list[dict[str, Any]]:
+        rows = self._metadata.get("ticket_states")
+        if rows is not None:
+            return rows
+        try:
+            data = await self._request("GET", METADATA_PATHS["ticket_states"])
+            rows = ZammadHttpGateway._extract_rows(data)
+        except Exception as exc:
+            # Same policy as the sync gateway: cache the failure for the TTL.
+            logger.warning("Could not load Zammad ticket_states: %s", exc)
+            rows = []
+        self._metadata.put("ticket_states", rows)
+        return rows
+
+    async def _request(self, method: str, path: str, json: dict[str, Any] | None = None) -> Any:
+        async def send() -> Any:
+            response = await self._client.request(method, path, json=json)
+            return decode_response(method, path, response)
+
+        return await self.resilience.acall(method, send)
@@ -1,13 +1,255 @@
 from __future__ import annotations
 
+import importlib.util
+import logging
 import urllib.parse
+from collections.abc import Iterable
+from datetime import UTC, datetime
 from typing import Any
 
 import httpx
 
-from helpdesk_sim.adapters.gateway import TicketArticle
+from helpdesk_sim.adapters.customer_directory import CustomerDirectory
+from helpdesk_sim.adapters.gateway import TicketArticle, TicketUpdate
+from helpdesk_sim.adapters.ttl_cache import TtlCache
+from helpdesk_sim.adapters.zammad_resilience import ZammadApiError, ZammadResilience
 from helpdesk_sim.domain.models import GeneratedTicket, TicketPriority, TicketTier
 
+logger = logging.getLogger(__name__)
+
+METADATA_PATHS: dict[str, str] = {
+    "roles": "/api/v1/roles",
+    "ticket_states": "/api/v1/ticket_states",
+    "groups": "/api/v1/groups",
+    "ticket_priorities": "/api/v1/ticket_priorities",
+}
+
+
+# Zammad seeds these ticket_article_senders rows; ``?all=true`` assets only carry sender_id.
+DEFAULT_ARTICLE_SENDERS: dict[int, str] = {1: "Agent", 2: "Customer", 3: "System"}
+
+# Pages of GET /tickets/search read per poll in change-driven mode. Results are sorted
+# by updated_at, so anything beyond the last page is picked up by the next tick.
+TICKET_SEARCH_PAGE_SIZE = 100
+TICKET_SEARCH_MAX_PAGES = 20
+
+
+def client_options(
+    base_url: str,
+    token: str,
+    verify_tls: bool,
+    timeout_seconds: float,
+    connect_timeout_seconds: float,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry_seconds: float,
+    http2: bool,
+) -> dict[str, Any]:
+    """Keyword arguments shared by the sync and async Zammad httpx clients."""
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+        http2 = False
+    return {
+        "base_url": base_url,
+        "verify": verify_tls,
+        "http2": http2,
+        "timeout": httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds),
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        ),
+        "headers": {
+            "Authorization": f"Token token={token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        },
+    }
+
+
+def decode_response(method: str, path: str, response: httpx.Response) -> Any:
+    if response.status_code >= 400:
+        raise ZammadApiError(
+            f"Zammad API {method} {path} failed with {response.status_code}: {response.text}",
+            status_code=response.status_code,
+            retry_after=_retry_after_seconds(response),
+        )
+    if not response.content:
+        return {}
+    return response.json()
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def parse_ticket_articles(data: Any, after_article_id: int) -> list[TicketArticle]:
+    articles: list[TicketArticle] = []
+    if not isinstance(data, list):
+        return articles
+    for item in data:
+        article_id = int(item.get("id", 0))
+        if article_id <= after_article_id:
+            continue
+        body = str(item.get("body") or item.get("content") or "").strip()
+        sender = str(item.get("sender") or item.get("from") or "unknown")
+        articles.append(TicketArticle(id=article_id, body=body, sender=sender))
+    return sorted(articles, key=lambda article: article.id)
+
+
+def ticket_all_path(zammad_ticket_id: int) -> str:
+    return f"/api/v1/tickets/{zammad_ticket_id}?all=true"
+
+
+def parse_ticket_all(
+    data: Any,
+    zammad_ticket_id: int,
+    after_article_id: int,
+) -> tuple[dict[str, Any], list[TicketArticle], list[dict[str, Any]]] | None:
+    """Split a ``GET /tickets/{id}?all=true`` response into ticket, new articles and states.
+
+    Returns None when the response lacks the expected assets (e.g. an older Zammad),
+    so callers can fall back to separate article and state requests.
+    """
+    assets = data.get("assets") if isinstance(data, dict) else None
+    if not isinstance(assets, dict):
+        return None
+    tickets = assets.get("Ticket")
+    ticket = tickets.get(str(zammad_ticket_id)) if isinstance(tickets, dict) else None
+    article_rows = assets.get("TicketArticle")
+    if not isinstance(ticket, dict) or not isinstance(article_rows, dict):
+        return None
+
+    rows: list[dict[str, Any]] = []
+    for row in article_rows.values():
+        if not isinstance(row, dict):
+            continue
+        if not row.get("sender") and "sender_id" in row:
+            # "from" holds a display name here, so derive the sender type from its id.
+            row = {**row, "sender": DEFAULT_ARTICLE_SENDERS.get(row["sender_id"], "unknown")}
+        rows.append(row)
+
+    state_rows = assets.get("TicketState")
+    states = (
+        [row for row in state_rows.values() if isinstance(row, dict)]
+        if isinstance(state_rows, dict)
+        else []
+    )
+    return ticket, parse_ticket_articles(rows, after_article_id), states
+
+
+def ticket_search_path(since: datetime, page: int) -> str:
+    stamp = since.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+    query = urllib.parse.quote_plus(f"updated_at:>={stamp}")
+    return (
+        f"/api/v1/tickets/search?query={query}&sort_by=updated_at&order_by=asc"
+        f"&page={page}&per_page={TICKET_SEARCH_PAGE_SIZE}"
+    )
+
+
+def idempotency_search_path(idempotency_key: str) -> str:
+    query = urllib.parse.quote_plus(
+        f'article.message_id:"{idempotency_message_id(idempotency_key)}"'
+    )
+    return f"/api/v1/tickets/search?query={query}&limit=1"
+
+
+def parse_ticket_search(data: Any) -> tuple[dict[int, datetime], int]:
+    """Ticket id -> updated_at from a search response, plus the page's row count.
+
+    Handles both the default ``{"tickets": [...], "assets": {...}}`` shape and the
+    ``expand=true`` list of ticket objects.
+    """
+    if isinstance(data, list):
+        rows = [row for row in data if isinstance(row, dict)]
+        count = len(data)
+    elif isinstance(data, dict):
+        assets = data.get("assets")
+        tickets = assets.get("Ticket") if isinstance(assets, dict) else None
+        rows = (
+            [row for row in tickets.values() if isinstance(row, dict)]
+            if isinstance(tickets, dict)
+            else []
+        )
+        ids = data.get("tickets")
+        count = len(ids) if isinstance(ids, list) else len(rows)
+    else:
+        return {}, 0
+
+    changes: dict[int, datetime] = {}
+    for row in rows:
+        ticket_id = row.get("id")
+        updated_at = row.get("updated_at")
+        if not isinstance(ticket_id, int) or not isinstance(updated_at, str):
+            continue
+        try:
+            changes[ticket_id] = datetime.fromisoformat(updated_at)
+        except ValueError:
+            continue
+    return changes, count
+
+
+def idempotency_message_id(idempotency_key: str) -> str:
+    """Article ``message_id`` that tags a simulator write so a retry can find it."""
+    return f"<{idempotency_key}@helpdesk-sim>"
+
+
+def customer_reply_payload(
+    zammad_ticket_id: int,
+    body: str,
+    subject: str,
+    idempotency_key: str | None = None,
+) -> dict[str, Any]:
+    payload: dict[str, Any] = {
+        "ticket_id": zammad_ticket_id,
+        "subject": subject,
+        "body": body,
+        "type": "note",
+        "internal": False,
+        "sender": "Customer",
+    }
+    if idempotency_key:
+        payload["message_id"] = idempotency_message_id(idempotency_key)
+    return payload
+
+
+def ticket_state_name(data: dict[str, Any]) -> str:
+    return str(
+        data.get("state")
+        or data.get("state_name")
+        or data.get("state_type")
+        or ""
+    ).lower()
+
+
+def closed_from_states(
+    ticket: dict[str, Any], state_rows: Iterable[dict[str, Any]]
+) -> bool | None:
+    """Whether the ticket is closed, from its state name or its row in ``state_rows``.
+
+    None when the ticket only has a ``state_id`` and ``state_rows`` lacks it.
+    """
+    state_value = ticket_state_name(ticket)
+    if state_value:
+        return "closed" in state_value
+    state_id = ticket.get("state_id")
+    if state_id is None:
+        return False
+    state_meta = next((row for row in state_rows if row.get("id") == state_id), None)
+    return None if state_meta is None else "closed" in state_type_name(state_meta)
+
+
+def state_type_name(state_meta: dict[str, Any]) -> str:
+    return str(
+        state_meta.get("state_type")
+        or state_meta.get("state_type_name")
+        or state_meta.get("name")
+        or ""
+    ).lower()
+
 
 class ZammadHttpGateway:
     def __init__(
@@ -19,24 +261,51 @@ class ZammadHttpGateway:
         group_tier2: str = "Tier 2",
         group_sysadmin: str = "Systems",
         customer_fallback_email: str = "",
+        timeout_seconds: float = 20.0,
+        connect_timeout_seconds: float = 5.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry_seconds: float = 30.0,
+        http2: bool = False,
+        transport: httpx.BaseTransport | None = None,
+        metadata_ttl_seconds: float = 900.0,
+        customer_directory: CustomerDirectory | None = None,
+        resilience: ZammadResilience | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
+        self.resilience = resilience or ZammadResilience()
         self.token = token
         self.verify_tls = verify_tls
+        # One pooled client for the gateway's lifetime: every Zammad call reuses
+        # warm keep-alive connections instead of paying a TCP/TLS handshake each time.
+        self._client = httpx.Client(
+            **client_options(
+                base_url=self.base_url,
+                token=token,
+                verify_tls=verify_tls,
+                timeout_seconds=timeout_seconds,
+                connect_timeout_seconds=connect_timeout_seconds,
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry_seconds=keepalive_expiry_seconds,
+                http2=http2,
+            ),
+            transport=transport,
+        )
         self.group_mapping: dict[TicketTier, str] = {
             TicketTier.tier1: group_tier1,
             TicketTier.tier2: group_tier2,
             TicketTier.sysadmin: group_sysadmin,
         }
         self.customer_fallback_email = customer_fallback_email.strip().lower()
-        self._known_customers: set[str] = set()
+        self.customer_directory = customer_directory or CustomerDirectory()
         self._known_organizations: dict[str, int] = {}
-        self._new_ticket_state_id_cache: int | None = None
-        self._new_ticket_state_id_loaded = False
-        self._closed_ticket_state_id_cache: int | None = None
-        self._closed_ticket_state_id_loaded = False
+        # Rows of the slow-changing admin lists (METADATA_PATHS), keyed by kind.
+        self._metadata: TtlCache[list[dict[str, Any]]] = TtlCache(
+            ttl_seconds=metadata_ttl_seconds
+        )
 
-    def create_ticket(self, ticket: GeneratedTicket) -> int:
+    def create_ticket(self, ticket: GeneratedTicket, idempotency_key: str | None = None) -> int:
         customer_email = self._resolve_customer_email(ticket)
 
         payload = {
@@ -54,22 +323,56 @@ class ZammadHttpGateway:
                 "sender": "Customer",
             },
         }
+        if idempotency_key:
+            payload["article"]["message_id"] = idempotency_message_id(idempotency_key)
         new_state_id = self._new_ticket_state_id()
         if new_state_id is not None:
             payload["state_id"] = new_state_id
+        group_id = self._metadata_id("groups", payload["group"])
+        if group_id is not None:
+            payload["group_id"] = group_id
+        priority_id = self._metadata_id("ticket_priorities", payload["priority"])
+        if priority_id is not None:
+            payload["priority_id"] = priority_id
         data = self._request("POST", "/api/v1/tickets", json=payload)
         ticket_id = data.get("id")
         if ticket_id is None:
             raise RuntimeError("Zammad ticket creation did not return an id")
         return int(ticket_id)
 
+    def find_ticket_by_idempotency_key(self, idempotency_key: str) -> int | None:
+        """Ticket whose first article carries the key, if an earlier attempt created it.
+
+        Relies on Zammad's search index. A failed search raises, so the caller
+        retries later instead of creating the ticket a second time.
+        """
+        data = self._request("GET", idempotency_search_path(idempotency_key))
+        rows, _ = parse_ticket_search(data)
+        return min(rows) if rows else None
+
+    def find_article_by_idempotency_key(
+        self, zammad_ticket_id: int, idempotency_key: str
+    ) -> int | None:
+        """Article on the ticket that carries the key, if an earlier attempt posted it.
+
+        Reads the ticket's articles directly rather than the search index, so a
+        failed lookup raises and the caller retries later instead of posting twice.
+        """
+        message_id = idempotency_message_id(idempotency_key)
+        data = self._request("GET", f"/api/v1/ticket_articles/by_ticket/{zammad_ticket_id}")
+        for row in self._extract_rows(data):
+            if row.get("message_id") == message_id:
+                return int(row["id"])
+        return None
+
     def _resolve_customer_email(self, ticket: GeneratedTicket) -> str:
         persona_email = ticket.customer_email.strip().lower()
         department = self._extract_customer_department(ticket)
         if department:
             department_customer_email = self._find_department_customer_email(department)
             if department_customer_email:
-                self._known_customers.add(department_customer_email)
+                if not self.customer_directory.is_known_customer(department_customer_email):
+                    self.customer_directory.record_customer(department_customer_email)
                 return department_customer_email
 
         if persona_email:
@@ -102,10 +405,18 @@ class ZammadHttpGateway:
         role = str(persona.get("role", "")).strip()
         return role or None
 
-    def _find_department_customer_email(self, department: str) -> str | None:
+    def _find_department_customer_email(
+        self,
+        department: str,
+        refresh: bool = False,
+    ) -> str | None:
         normalized = " ".join(department.strip().split())
         if not normalized:
             return None
+        if not refresh:
+            cached = self.customer_directory.department(normalized)
+            if cached is not None:
+                return cached.email
 
         try:
             query = urllib.parse.quote_plus(normalized)
@@ -147,60 +458,67 @@ class ZammadHttpGateway:
             else:
                 fallback.append(email)
 
-        if preferred:
-            return preferred[0]
-        if fallback:
-            return fallback[0]
-        return None
+        found = preferred[0] if preferred else fallback[0] if fallback else None
+        self.customer_directory.record_department(normalized, found)
+        return found
 
     def fetch_new_articles(self, zammad_ticket_id: int, after_article_id: int) -> list[TicketArticle]:
         data = self._request("GET", f"/api/v1/ticket_articles/by_ticket/{zammad_ticket_id}")
-        articles: list[TicketArticle] = []
-        if not isinstance(data, list):
-            return articles
-        for item in data:
-            article_id = int(item.get("id", 0))
-            if article_id <= after_article_id:
-                continue
-            body = str(item.get("body") or item.get("content") or "").strip()
-            sender = str(item.get("sender") or item.get("from") or "unknown")
-            articles.append(TicketArticle(id=article_id, body=body, sender=sender))
-        return sorted(articles, key=lambda article: article.id)
+        return parse_ticket_articles(data, after_article_id)
 
-    def post_customer_reply(self, zammad_ticket_id: int, body: str, subject: str) -> None:
-        payload = {
-            "ticket_id": zammad_ticket_id,
-            "subject": subject,
-            "body": body,
-            "type": "note",
-            "internal": False,
-            "sender": "Customer",
-        }
+    def post_customer_reply(
+        self,
+        zammad_ticket_id: int,
+        body: str,
+        subject: str,
+        idempotency_key: str | None = None,
+    ) -> None:
+        payload = customer_reply_payload(zammad_ticket_id, body, subject, idempotency_key)
         self._request("POST", "/api/v1/ticket_articles", json=payload)
 
     def is_ticket_closed(self, zammad_ticket_id: int) -> bool:
         data = self._request("GET", f"/api/v1/tickets/{zammad_ticket_id}")
-        state_value = str(
-            data.get("state")
-            or data.get("state_name")
-            or data.get("state_type")
-            or ""
-        ).lower()
-        if state_value:
-            return "closed" in state_value
-
-        state_id = data.get("state_id")
-        if state_id is None:
-            return False
-
-        state_meta = self._request("GET", f"/api/v1/ticket_states/{state_id}")
-        state_type_name = str(
-            state_meta.get("state_type")
-            or state_meta.get("state_type_name")
-            or state_meta.get("name")
-            or ""
-        ).lower()
-        return "closed" in state_type_name
+        return self._ticket_closed(data)
+
+    def fetch_ticket_updates(self, zammad_ticket_id: int, after_article_id: int) -> TicketUpdate:
+        """New articles and closed state from one ``?all=true`` request when Zammad supports it."""
+        data = self._request("GET", ticket_all_path(zammad_ticket_id))
+        parsed = parse_ticket_all(data, zammad_ticket_id, after_article_id)
+        if parsed is None:
+            return TicketUpdate(
+                articles=self.fetch_new_articles(zammad_ticket_id, after_article_id),
+                closed=self.is_ticket_closed(zammad_ticket_id),
+            )
+        ticket, articles, states = parsed
+        return TicketUpdate(articles=articles, closed=self._ticket_closed(ticket, states))
+
+    def search_updated_tickets(self, since: datetime) -> dict[int, datetime]:
+        """Ids and updated_at of Zammad tickets updated at or after ``since``."""
+        changes: dict[int, datetime] = {}
+        for page in range(1, TICKET_SEARCH_MAX_PAGES + 1):
+            rows, count = parse_ticket_search(self._request("GET", ticket_search_path(since, page)))
+            changes.update(rows)
+            if count < TICKET_SEARCH_PAGE_SIZE:
+                break
+        return changes
+
+    def _ticket_closed(
+        self,
+        ticket: dict[str, Any],
+        embedded_states: list[dict[str, Any]] | None = None,
+    ) -> bool:
+        closed = closed_from_states(ticket, embedded_states or [])
+        if closed is None:
+            closed = closed_from_states(ticket, self._metadata_rows("ticket_states"))
+        if closed is None:
+            # Not in the (possibly inaccessible) state list: cache the single lookup instead.
+            state_id = ticket["state_id"]
+            state_meta = self._metadata.get_or_load(
+                ("ticket_state", state_id),
+                lambda: [self._request("GET", f"/api/v1/ticket_states/{state_id}")],
+            )[0]
+            closed = "closed" in state_type_name(state_meta)
+        return closed
 
     def delete_ticket(self, zammad_ticket_id: int) -> bool:
         delete_paths = [
@@ -243,15 +561,7 @@ class ZammadHttpGateway:
         return self.is_ticket_closed(zammad_ticket_id)
 
     def _new_ticket_state_id(self) -> int | None:
-        if self._new_ticket_state_id_loaded:
-            return self._new_ticket_state_id_cache
-        self._new_ticket_state_id_loaded = True
-        try:
-            data = self._request("GET", "/api/v1/ticket_states")
-        except Exception:
-            return None
-
-        for row in self._extract_rows(data):
+        for row in self._metadata_rows("ticket_states"):
             name = str(row.get("name", "")).strip().lower()
             state_type = str(
                 row.get("state_type")
@@ -261,21 +571,11 @@ class ZammadHttpGateway:
             if name == "new" or state_type == "new":
                 state_id = row.get("id")
                 if isinstance(state_id, int):
-                    self._new_ticket_state_id_cache = state_id
                     return state_id
         return None
 
     def _closed_ticket_state_id(self) -> int | None:
-        if self._closed_ticket_state_id_loaded:
-            return self._closed_ticket_state_id_cache
-        self._closed_ticket_state_id_loaded = True
-
-        try:
-            data = self._request("GET", "/api/v1/ticket_states")
-        except Exception:
-            return None
-
-        for row in self._extract_rows(data):
+        for row in self._metadata_rows("ticket_states"):
             name = str(row.get("name", "")).strip().lower()
             state_type = str(
                 row.get("state_type")
@@ -285,25 +585,86 @@ class ZammadHttpGateway:
             if "closed" in name or "closed" in state_type:
                 state_id = row.get("id")
                 if isinstance(state_id, int):
-                    self._closed_ticket_state_id_cache = state_id
                     return state_id
         return None
 
-    def _request(self, method: str, path: str, json: dict[str, Any] | None = None) -> Any:
-        headers = {
-            "Authorization": f"Token token={self.token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
+    def warm_up(self) -> None:
+        """Load metadata and resolve due directory entries so tickets skip those lookups.
+
+        Safe to call repeatedly: only expired metadata and stale or missing directory
+        entries cause Zammad requests.
+        """
+        for kind in METADATA_PATHS:
+            self._metadata_rows(kind)
+        departments = self.customer_directory.stale_departments()
+        for department in departments:
+            self._find_department_customer_email(department, refresh=True)
+        customers = self.customer_directory.stale_customers()
+        for email in customers:
+            self._verify_customer(email)
+        logger.info(
+            "Zammad caches warmed: %s department(s), %s customer(s) refreshed",
+            len(departments),
+            len(customers),
+        )
+
+    @property
+    def metadata_cache(self) -> TtlCache[list[dict[str, Any]]]:
+        """The metadata cache, for sharing with AsyncZammadHttpGateway."""
+        return self._metadata
+
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        return {
+            "metadata": self._metadata.stats(),
+            "customers": self.customer_directory.stats(),
         }
-        with httpx.Client(base_url=self.base_url, verify=self.verify_tls, timeout=20.0) as client:
-            response = client.request(method, path, headers=headers, json=json)
-            if response.status_code >= 400:
-                raise RuntimeError(
-                    f"Zammad API {method} {path} failed with {response.status_code}: {response.text}"
-                )
-            if not response.content:
-                return {}
-            return response.json()
+
+    def invalidate_caches(self, name: str | None = None, key: str | None = None) -> int:
+        if name not in (None, "metadata", "customers"):
+            raise ValueError(f"unknown cache '{name}'")
+        removed = 0
+        if name in (None, "metadata"):
+            removed += self._metadata.invalidate(key)
+        if name in (None, "customers"):
+            removed += self.customer_directory.invalidate(key)
+        return removed
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _metadata_rows(self, kind: str, strict: bool = False) -> list[dict[str, Any]]:
+        """Cached rows of a Zammad admin list such as roles or ticket states.
+
+        A failed load is cached as an empty list for the TTL so a token without
+        admin read access does not retry on every ticket; ``strict`` re-raises instead.
+        """
+
+        def load() -> list[dict[str, Any]]:
+            return self._extract_rows(self._request("GET", METADATA_PATHS[kind]))
+
+        if strict:
+            return self._metadata.get_or_load(kind, load)
+        try:
+            return self._metadata.get_or_load(kind, load)
+        except Exception as exc:
+            logger.warning("Could not load Zammad %s: %s", kind, exc)
+            self._metadata.put(kind, [])
+            return []
+
+    def _metadata_id(self, kind: str, name: str) -> int | None:
+        wanted = name.strip().lower()
+        for row in self._metadata_rows(kind):
+            if str(row.get("name", "")).strip().lower() == wanted:
+                row_id = row.get("id")
+                if isinstance(row_id, int):
+                    return row_id
+        return None
+
+    def _request(self, method: str, path: str, json: dict[str, Any] | None = None) -> Any:
+        return self.resilience.call(
+            method,
+            lambda: decode_response(method, path, self._client.request(method, path, json=json)),
+        )
 
     def _ensure_customer_exists(
         self,
@@ -314,7 +675,7 @@ class ZammadHttpGateway:
         normalized_email = email.strip().lower()
         if not normalized_email:
             raise RuntimeError("customer email is required")
-        if normalized_email in self._known_customers:
+        if self.customer_directory.is_known_customer(normalized_email):
             return
 
         search_failed = False
@@ -323,7 +684,7 @@ class ZammadHttpGateway:
             data = self._request("GET", f"/api/v1/users/search?query={query}")
             existing_user = self._find_user_in_search_result(data, normalized_email)
             if existing_user is not None:
-                self._known_customers.add(normalized_email)
+                self.customer_directory.record_customer(normalized_email)
                 if department:
                     user_id = existing_user.get("id")
                     if isinstance(user_id, int):
@@ -352,7 +713,7 @@ class ZammadHttpGateway:
 
         try:
             self._request("POST", "/api/v1/users", json=payload)
-            self._known_customers.add(normalized_email)
+            self.customer_directory.record_customer(normalized_email)
         except Exception as exc:
             message = str(exc).lower()
             duplicate_markers = (
@@ -361,7 +722,7 @@ class ZammadHttpGateway:
                 "email address has already been taken",
             )
             if search_failed and any(marker in message for marker in duplicate_markers):
-                self._known_customers.add(normalized_email)
+                self.customer_directory.record_customer(normalized_email)
                 if department:
                     try:
                         retry = self._request("GET", f"/api/v1/users/search?query={query}")
@@ -375,6 +736,18 @@ class ZammadHttpGateway:
                 return
             raise
 
+    def _verify_customer(self, email: str) -> None:
+        query = urllib.parse.quote_plus(email)
+        try:
+            data = self._request("GET", f"/api/v1/users/search?query={query}")
+        except Exception as exc:
+            logger.warning("Could not verify Zammad customer %s: %s", email, exc)
+            return
+        if self._find_user_in_search_result(data, email) is not None:
+            self.customer_directory.record_customer(email)
+        else:
+            self.customer_directory.forget_customer(email)
+
     def _update_customer_department(self, user_id: int, department: str) -> None:
         normalized = " ".join(department.strip().split())
         if not normalized:
@@ -425,9 +798,7 @@ class ZammadHttpGateway:
         return None
 
     def _customer_role_id(self) -> int | None:
-        data = self._request("GET", "/api/v1/roles")
-        rows = self._extract_rows(data)
-        for row in rows:
+        for row in self._metadata_rows("roles", strict=True):
             if str(row.get("name", "")).strip().lower() == "customer":
                 role_id = row.get("id")
                 if isinstance(role_id, int):
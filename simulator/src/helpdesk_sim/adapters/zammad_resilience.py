@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Safe to send twice: retrying them after a timeout cannot duplicate anything.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Statuses that say "try again later" rather than "this request is wrong".
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# The request never left the client, so even a POST can be retried.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ZammadApiError(RuntimeError):
+    """Zammad answered with an error status."""
+
+    def __init__(self, message: str, status_code: int, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without contacting Zammad while the circuit breaker is open."""
+
+
+def is_server_failure(exc: BaseException) -> bool:
+    """Errors that suggest Zammad is struggling, as opposed to a bad request."""
+    if isinstance(exc, ZammadApiError):
+        return exc.status_code >= 500 or exc.status_code == 429
+    return isinstance(exc, httpx.TransportError)
+
+
+def is_retryable(method: str, exc: BaseException) -> bool:
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, _NOT_SENT_ERRORS):
+        return True
+    if method.upper() not in IDEMPOTENT_METHODS:
+        return False
+    if isinstance(exc, ZammadApiError):
+        return exc.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+
+class TokenBucket:
+    """Client-side rate limit: ``rate_per_second`` sustained, bursts up to ``burst``.
+
+    ``reserve`` takes a token and returns how long the caller must wait before using
+    it, so the same bucket serves threads (``time.sleep``) and the event loop
+    (``asyncio.sleep``). A rate of zero disables the limit.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        if self.rate_per_second <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate_per_second
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+
+class CircuitBreaker:
+    """Fail fast after ``failure_threshold`` consecutive failures.
+
+    Once open, calls are rejected until ``reset_timeout_seconds`` pass; then a single
+    probe is let through and its outcome closes or re-opens the circuit. A probe that
+    ends without an outcome (cancelled) is released, and one that never reports back
+    expires after another ``reset_timeout_seconds``. A threshold of zero disables the
+    breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            now = self._clock()
+            started = self._opened_at if self._state == self.OPEN else self._probe_started_at
+            if now - started >= self.reset_timeout_seconds:
+                self._state = self.HALF_OPEN
+                self._probe_started_at = now
+                return True
+            # Open, or half-open with the probe still in flight.
+            return False
+
+    def release(self) -> None:
+        """Give up a half-open probe that ended without an outcome; the next call probes."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._state = self.OPEN
+                self._opened_at = self._clock() - self.reset_timeout_seconds
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self.times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class ZammadResilience:
+    """Rate limit, retries and circuit breaking around every Zammad HTTP call.
+
+    Share one instance between the sync and async gateways so the limit and the
+    breaker describe the Zammad server, not one client. The defaults pass calls
+    straight through.
+    """
+
+    def __init__(
+        self,
+        rate_limit_per_second: float = 0.0,
+        rate_limit_burst: int = 1,
+        max_attempts: int = 1,
+        retry_base_seconds: float = 0.2,
+        retry_max_seconds: float = 2.0,
+        breaker_failure_threshold: int = 0,
+        breaker_reset_seconds: float = 30.0,
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.bucket = TokenBucket(rate_limit_per_second, rate_limit_burst, clock=clock)
+        self.breaker = CircuitBreaker(
+            breaker_failure_threshold, breaker_reset_seconds, clock=clock
+        )
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = max(retry_max_seconds, retry_base_seconds)
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "rejected": 0,
+            "throttled": 0,
+        }
+        self._throttled_seconds = 0.0
+
+    def call(self, method: str, send: Callable[[], T]) -> T:
+        attempt = 0
+        while True:
+            wait = self._admit()
+            try:
+                time.sleep(wait)
+                result = send()
+            except Exception as exc:
+                attempt += 1
+                delay = self._after_failure(method, exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, method: str, send: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            wait = self._admit()
+            try:
+                if wait:
+                    await asyncio.sleep(wait)
+                result = await send()
+            except Exception as exc:
+                attempt += 1
+                delay = self._after_failure(method, exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (e.g. on worker shutdown) before Zammad answered.
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            stats: dict[str, object] = dict(self._counters)
+            stats["throttled_seconds"] = round(self._throttled_seconds, 3)
+        stats["breaker_state"] = self.breaker.state
+        stats["breaker_opened"] = self.breaker.times_opened
+        return stats
+
+    def _admit(self) -> float:
+        """Check the breaker and take a rate-limit token; returns the wait in seconds."""
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError("Zammad circuit breaker is open; not sending request")
+        wait = self.bucket.reserve()
+        with self._lock:
+            self._counters["requests"] += 1
+            if wait > 0:
+                self._counters["throttled"] += 1
+                self._throttled_seconds += wait
+        return wait
+
+    def _after_failure(self, method: str, exc: Exception, attempt: int) -> float | None:
+        """Record a failed attempt; the delay before retrying, or None to give up."""
+        if is_server_failure(exc):
+            self.breaker.record_failure()
+        else:
+            # Zammad answered; a rejected request says nothing about its health.
+            self.breaker.record_success()
+        self._count("failures")
+        if attempt >= self.max_attempts or not is_retryable(method, exc):
+            return None
+        self._count("retries")
+        # Full jitter keeps many pollers from retrying in lockstep.
+        cap = min(self.retry_base_seconds * 2 ** min(attempt - 1, 32), self.retry_max_seconds)
+        delay = self._rng.uniform(0, cap)
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_max_seconds))
+        return delay
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
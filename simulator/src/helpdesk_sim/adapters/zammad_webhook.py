@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+from typing import Any
+
+# Zammad signs webhook bodies with the webhook's "HMAC SHA1 Signature Token".
+SIGNATURE_HEADER = "X-Hub-Signature"
+
+_DIGESTS = {"sha1": hashlib.sha1, "sha256": hashlib.sha256}
+
+
+def sign_payload(body: bytes, secret: str, algorithm: str = "sha1") -> str:
+    digest = hmac.new(secret.encode(), body, _DIGESTS[algorithm]).hexdigest()
+    return f"{algorithm}={digest}"
+
+
+def verify_signature(body: bytes, secret: str, signature: str | None) -> bool:
+    """Check an ``X-Hub-Signature`` value (``sha1=<hex>``, or ``sha256=<hex>``)."""
+    if not secret or not signature:
+        return False
+    algorithm, _, _ = signature.partition("=")
+    if algorithm not in _DIGESTS:
+        return False
+    return hmac.compare_digest(sign_payload(body, secret, algorithm), signature.strip())
+
+
+def webhook_ticket_id(payload: Any) -> int | None:
+    """Zammad ticket id from a webhook payload.
+
+    Accepts Zammad's default payload (``{"ticket": {"id": ...}, "article": {...}}``)
+    and custom payloads that template ``"ticket_id": "#{ticket.id}"``.
+    """
+    if not isinstance(payload, dict):
+        return None
+    ticket = payload.get("ticket")
+    candidates = [ticket.get("id")] if isinstance(ticket, dict) else []
+    candidates.append(payload.get("ticket_id"))
+    for value in candidates:
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value.strip())
+    return None
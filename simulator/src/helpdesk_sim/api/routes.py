@@ -1,11 +1,30 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Query, Request
-
-from helpdesk_sim.domain.models import ClockInRequest, ManualTicketRequest, HintRequest
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from helpdesk_sim.adapters.zammad_webhook import verify_signature, webhook_ticket_id
+from helpdesk_sim.clock import SimulationClock
+from helpdesk_sim.domain.models import (
+    ClockAdvanceRequest,
+    ClockInRequest,
+    HintRequest,
+    ManualTicketRequest,
+)
+from helpdesk_sim.services.event_bus import SimEvent
+from helpdesk_sim.utils import decode_change_cursor, encode_change_cursor, encode_cursor
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+# Real time; scaled to the simulation clock that stamps updated_at.
+CHANGES_CURSOR_OVERLAP = timedelta(seconds=2)
+
 
 @router.get("/health")
 def health() -> dict[str, str]:
@@ -54,17 +73,8 @@ def list_knowledge_articles(request: Request) -> dict[str, list[dict]]:
 @router.get("/v1/sessions")
 def list_sessions(request: Request) -> dict[str, list[dict]]:
     runtime = request.app.state.runtime
-    sessions = runtime.repository.list_active_sessions()
-    payload: list[dict] = []
-    for session in sessions:
-        tickets = runtime.repository.list_tickets_for_session(session.id)
-        payload.append(
-            {
-                **session.model_dump(mode="json"),
-                "ticket_count": len(tickets),
-            }
-        )
-    return {"sessions": payload}
+    sessions = runtime.repository.list_session_summaries()
+    return {"sessions": [session.model_dump(mode="json") for session in sessions]}
 
 
 @router.post("/v1/sessions/clock-in")
@@ -104,28 +114,85 @@ def clock_out_all(request: Request) -> dict[str, object]:
 
 
 @router.get("/v1/sessions/{session_id}")
-def get_session(request: Request, session_id: str) -> dict:
+def get_session(
+    request: Request,
+    session_id: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(default=None),
+    include_hidden_truth: bool = Query(default=False),
+) -> dict:
     runtime = request.app.state.runtime
+    read_started_at = runtime.clock()
     session = runtime.repository.get_session(session_id)
     if session is None:
         raise HTTPException(status_code=404, detail="session not found")
-    tickets = runtime.repository.list_tickets_for_session(session_id)
+    try:
+        tickets = runtime.repository.list_tickets_for_session(
+            session_id,
+            limit=limit,
+            after=after,
+            include_hidden_truth=include_hidden_truth,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    exclude = None if include_hidden_truth else {"hidden_truth"}
     return {
         "session": session.model_dump(mode="json"),
-        "tickets": [ticket.model_dump(mode="json") for ticket in tickets],
+        "tickets": [ticket.model_dump(mode="json", exclude=exclude) for ticket in tickets],
+        "next_cursor": _next_cursor(tickets, limit),
+        "changes_cursor": _changes_cursor(runtime.clock, read_started_at),
+    }
+
+
+@router.get("/v1/sessions/{session_id}/changes")
+def get_session_changes(
+    request: Request,
+    session_id: str,
+    since: str = Query(...),
+    include_hidden_truth: bool = Query(default=False),
+) -> dict:
+    runtime = request.app.state.runtime
+    try:
+        since_at = decode_change_cursor(since)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    read_started_at = runtime.clock()
+    session = runtime.repository.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="session not found")
+    tickets, interactions = runtime.repository.list_session_changes(
+        session_id,
+        since=since_at,
+        include_hidden_truth=include_hidden_truth,
+    )
+    exclude = None if include_hidden_truth else {"hidden_truth"}
+    return {
+        "session": session.model_dump(mode="json"),
+        "tickets": [ticket.model_dump(mode="json", exclude=exclude) for ticket in tickets],
+        "interactions": [row.model_dump(mode="json") for row in interactions],
+        "next_cursor": _changes_cursor(runtime.clock, read_started_at),
     }
 
 
 @router.get("/v1/tickets/{ticket_id}")
-def get_ticket(request: Request, ticket_id: str) -> dict:
+def get_ticket(
+    request: Request,
+    ticket_id: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(default=None),
+) -> dict:
     runtime = request.app.state.runtime
     ticket = runtime.repository.get_ticket(ticket_id)
     if ticket is None:
         raise HTTPException(status_code=404, detail="ticket not found")
-    interactions = runtime.repository.list_interactions(ticket_id)
+    try:
+        interactions = runtime.repository.list_interactions(ticket_id, limit=limit, after=after)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {
         "ticket": ticket.model_dump(mode="json"),
         "interactions": [row.model_dump(mode="json") for row in interactions],
+        "next_cursor": _next_cursor(interactions, limit),
     }
 
 
@@ -381,7 +448,7 @@ def delete_all_tickets_for_session(
     if session is None:
         raise HTTPException(status_code=404, detail="session not found")
 
-    tickets = runtime.repository.list_tickets_for_session(session_id)
+    tickets = runtime.repository.list_tickets_for_session(session_id, include_hidden_truth=False)
     zammad_deleted_count = 0
     zammad_closed_fallback_count = 0
     zammad_attempted = 0
@@ -443,6 +510,109 @@ def delete_all_tickets_for_session(
     }
 
 
+@router.get("/v1/events")
+async def stream_events(
+    request: Request,
+    session_id: str | None = Query(default=None),
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    runtime = request.app.state.runtime
+    event_bus = runtime.event_bus
+    heartbeat_seconds = runtime.settings.event_heartbeat_seconds
+    resume_after = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    async def stream() -> AsyncIterator[str]:
+        async with event_bus.subscribe(
+            session_id=session_id,
+            last_event_id=resume_after,
+        ) as subscription:
+            yield "retry: 3000\n\n"
+            while True:
+                event = await subscription.next(timeout=heartbeat_seconds)
+                if event is not None:
+                    yield _format_sse(event)
+                elif subscription.closed or await request.is_disconnected():
+                    return
+                else:
+                    yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/v1/admin/caches")
+def get_cache_stats(request: Request) -> dict[str, object]:
+    runtime = request.app.state.runtime
+    return {"caches": runtime.scheduler_service.zammad_gateway.cache_stats()}
+
+
+@router.get("/v1/admin/zammad-client")
+def get_zammad_client_stats(request: Request) -> dict[str, object]:
+    runtime = request.app.state.runtime
+    resilience = runtime.zammad_resilience
+    if resilience is None:
+        return {
+            "client": None,
+            "english_summary": "Dry-run mode: no Zammad HTTP client is in use.",
+        }
+    stats = resilience.stats()
+    return {
+        "client": stats,
+        "english_summary": (
+            f"Circuit breaker is {stats['breaker_state']}; {stats['retries']} retries and "
+            f"{stats['rejected']} fast-failed requests so far."
+        ),
+    }
+
+
+@router.get("/v1/admin/clock")
+def get_clock(request: Request) -> dict[str, object]:
+    runtime = request.app.state.runtime
+    clock = runtime.clock.describe()
+    return {
+        "clock": clock,
+        "english_summary": (
+            f"Simulated time is {clock['now']}, running at {clock['time_scale']}x real time."
+        ),
+    }
+
+
+@router.post("/v1/admin/clock/advance")
+async def advance_clock(request: Request, payload: ClockAdvanceRequest) -> dict[str, object]:
+    runtime = request.app.state.runtime
+    now = runtime.clock.advance(payload.seconds)
+    ticks = await runtime.workers.run_ticks_once() if payload.run_ticks else None
+    return {
+        "clock": runtime.clock.describe(),
+        "ticks": ticks,
+        "english_summary": (
+            f"Moved the simulation clock forward {payload.seconds:g} seconds to {now.isoformat()}."
+        ),
+    }
+
+
+@router.post("/v1/admin/caches/invalidate")
+def invalidate_caches(
+    request: Request,
+    name: str | None = Query(default=None),
+    key: str | None = Query(default=None),
+) -> dict[str, object]:
+    runtime = request.app.state.runtime
+    gateway = runtime.scheduler_service.zammad_gateway
+    try:
+        removed = gateway.invalidate_caches(name=name, key=key)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return {
+        "invalidated": removed,
+        "caches": gateway.cache_stats(),
+        "english_summary": f"Dropped {removed} cached entr{'y' if removed == 1 else 'ies'}.",
+    }
+
+
 @router.post("/v1/scheduler/run-once")
 async def run_scheduler_once(request: Request) -> dict[str, int]:
     runtime = request.app.state.runtime
@@ -455,6 +625,43 @@ async def run_poller_once(request: Request) -> dict[str, int]:
     return await runtime.workers.run_poller_once()
 
 
+@router.post("/v1/outbox/run-once")
+async def run_outbox_once(request: Request) -> dict[str, int]:
+    runtime = request.app.state.runtime
+    return await runtime.workers.run_outbox_once()
+
+
+@router.post("/v1/webhooks/zammad", status_code=202)
+async def zammad_webhook(
+    request: Request,
+    x_hub_signature: str | None = Header(default=None),
+) -> dict[str, object]:
+    runtime = request.app.state.runtime
+    secret = runtime.settings.zammad_webhook_secret
+    if not secret:
+        raise HTTPException(status_code=404, detail="Zammad webhook receiver is not configured")
+    body = await request.body()
+    if not verify_signature(body, secret, x_hub_signature):
+        raise HTTPException(status_code=401, detail="invalid webhook signature")
+    try:
+        payload = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="webhook body is not valid JSON") from exc
+
+    zammad_ticket_id = webhook_ticket_id(payload)
+    if zammad_ticket_id is None:
+        return {
+            "accepted": False,
+            "english_summary": "Webhook payload did not name a ticket; nothing to do.",
+        }
+    runtime.workers.enqueue_tickets([zammad_ticket_id])
+    return {
+        "accepted": True,
+        "zammad_ticket_id": zammad_ticket_id,
+        "english_summary": f"Zammad ticket {zammad_ticket_id} queued for processing.",
+    }
+
+
 @router.get("/v1/reports/daily")
 def report_daily(request: Request) -> dict:
     runtime = request.app.state.runtime
@@ -471,6 +678,27 @@ def report_weekly(request: Request) -> dict:
     return report
 
 
+def _next_cursor(records: list, limit: int) -> str | None:
+    # A short page is the last one; a full page may or may not have a successor.
+    if len(records) < limit:
+        return None
+    last = records[-1]
+    return encode_cursor(last.created_at, last.id)
+
+
+def _format_sse(event: SimEvent) -> str:
+    return f"id: {event.id}\ndata: {json.dumps(event.to_payload())}\n\n"
+
+
+def _changes_cursor(clock: SimulationClock, read_started_at: datetime) -> str:
+    # Rows are stamped before they commit, so a write racing this read can land
+    # slightly behind it. Overlapping the next window re-sends those rows instead of
+    # losing them; clients apply changes as upserts by id. The commit skew is real
+    # time, so an accelerated clock needs a proportionally wider overlap.
+    overlap = clock.simulated_span(CHANGES_CURSOR_OVERLAP)
+    return encode_change_cursor(read_started_at - overlap)
+
+
 def _report_summary(report_type: str, report: dict) -> str:
     label = "Daily" if report_type == "daily" else "Weekly"
     closed = int(report.get("tickets_closed", 0))
@@ -0,0 +1,401 @@
+"""End-to-end load test: whole shifts on a frozen simulation clock.
+
+Clocks in sessions across the shipped profiles, then repeatedly advances the clock
+and runs a scheduler tick, a poller tick and the outbox until every session has
+ended and every ticket is closed. A synthetic agent answers and closes tickets,
+either the dry-run gateway's agent bot or, with ``--gateway fake-zammad``, an agent
+driving ``helpdesk_sim.fake_zammad`` over real HTTP.
+
+Reports throughput, per-stage latency percentiles and peak memory, and writes the
+same numbers as JSON so runs can be compared in CI::
+
+    helpdesk-sim-bench --sessions 20 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import inspect
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from helpdesk_sim.bootstrap import Runtime, build_runtime
+from helpdesk_sim.config import Settings
+from helpdesk_sim.fake_zammad import CLOSED_STATE_ID, FakeZammadConfig, FakeZammadServer
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+# A Monday morning, so business-hours-only profiles generate from the first window.
+DEFAULT_START = datetime(2026, 3, 2, 9, 0, tzinfo=UTC)
+STAGES = ("generation", "zammad_io", "response_engine", "grading", "db")
+GATEWAY_METHODS = frozenset(
+    {
+        "create_ticket",
+        "find_ticket_by_idempotency_key",
+        "find_article_by_idempotency_key",
+        "fetch_new_articles",
+        "fetch_ticket_updates",
+        "post_customer_reply",
+        "is_ticket_closed",
+        "search_updated_tickets",
+        "close_ticket",
+        "delete_ticket",
+    }
+)
+# Repository methods that are not a unit of DB work on their own.
+_UNTIMED_REPOSITORY_METHODS = frozenset({"transaction", "initialize", "close"})
+
+
+@dataclass(slots=True)
+class BenchOptions:
+    sessions: int = 4
+    profiles: list[str] = field(default_factory=list)
+    gateway: str = "dry-run"
+    step_seconds: float = 300.0
+    max_ticks: int = 2000
+    agent_reply_seconds: float = 300.0
+    agent_close_after: int = 2
+    latency_ms: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 7
+    db_path: Path | None = None
+
+
+class StageTimer:
+    """Collects call durations per stage; nested calls within a stage count once."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._depth = threading.local()
+
+    def wrap(self, stage: str, func: Any) -> Any:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def timed_async(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self._record(stage, time.perf_counter() - started)
+
+            return timed_async
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            depth = getattr(self._depth, stage, 0)
+            setattr(self._depth, stage, depth + 1)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                setattr(self._depth, stage, depth)
+                if depth == 0:
+                    self._record(stage, time.perf_counter() - started)
+
+        return timed
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            samples = {stage: sorted(self.samples.get(stage, [])) for stage in STAGES}
+        return {stage: _latency_stats(values) for stage, values in samples.items()}
+
+    def _record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+
+class _Timed:
+    """Proxy that times the named methods of ``target`` and passes everything else through."""
+
+    def __init__(self, target: Any, stage: str, methods: frozenset[str], timer: StageTimer) -> None:
+        self._target = target
+        self._stage = stage
+        self._methods = methods
+        self._timer = timer
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        if name in self._methods and callable(value):
+            return self._timer.wrap(self._stage, value)
+        return value
+
+
+class FakeZammadAgent:
+    """Answers customer articles on the fake Zammad, then closes after ``close_after`` replies.
+
+    The close carries no reply of its own: a customer answer would reopen the ticket.
+    """
+
+    def __init__(self, server: FakeZammadServer, close_after: int) -> None:
+        self.state = server.state
+        self.close_after = max(close_after, 1)
+
+    def act(self) -> int:
+        acted = 0
+        for ticket_id, ticket in list(self.state.tickets.items()):
+            if ticket["state_id"] == CLOSED_STATE_ID:
+                continue
+            articles = self.state.ticket_articles(ticket_id) or []
+            if not articles or articles[-1]["sender"] != "Customer":
+                continue
+            replies = sum(1 for article in articles if article["sender"] == "Agent")
+            if replies >= self.close_after:
+                self.state.update_ticket(ticket_id, {"state_id": CLOSED_STATE_ID})
+            else:
+                self.state.add_agent_reply(ticket_id, "Could you share the exact error message?")
+            acted += 1
+        return acted
+
+
+def instrument(runtime: Runtime, timer: StageTimer) -> None:
+    scheduler = runtime.scheduler_service
+    poller = runtime.poller_service
+    scheduler.generation_service = _Timed(
+        scheduler.generation_service, "generation", frozenset({"build_ticket"}), timer
+    )
+    gateway = _Timed(scheduler.zammad_gateway, "zammad_io", GATEWAY_METHODS, timer)
+    scheduler.zammad_gateway = gateway
+    poller.zammad_gateway = gateway
+    if runtime.workers.outbox_dispatcher is not None:
+        runtime.workers.outbox_dispatcher.zammad_gateway = gateway
+    if poller.async_gateway is not None:
+        poller.async_gateway = _Timed(poller.async_gateway, "zammad_io", GATEWAY_METHODS, timer)
+    poller.response_engine = _Timed(
+        poller.response_engine, "response_engine", frozenset({"generate_reply"}), timer
+    )
+    poller.grading_service = _Timed(
+        poller.grading_service, "grading", frozenset({"grade_ticket"}), timer
+    )
+    repository = runtime.repository
+    for name in dir(SimulatorRepository):
+        if name.startswith("_") or name in _UNTIMED_REPOSITORY_METHODS:
+            continue
+        method = getattr(repository, name)
+        if callable(method):
+            setattr(repository, name, timer.wrap("db", method))
+
+
+def run_benchmark(options: BenchOptions) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="helpdesk-sim-bench-") as scratch:
+        db_path = options.db_path or Path(scratch) / "bench.db"
+        server = None
+        if options.gateway == "fake-zammad":
+            server = FakeZammadServer(
+                FakeZammadConfig(
+                    latency_seconds=options.latency_ms / 1000,
+                    error_rate=options.failure_rate,
+                    seed=options.seed,
+                )
+            ).start()
+        try:
+            return asyncio.run(_drive(options, _settings(options, db_path, server), server))
+        finally:
+            if server is not None:
+                server.stop()
+
+
+def _settings(options: BenchOptions, db_path: Path, server: FakeZammadServer | None) -> Settings:
+    overrides: dict[str, Any] = {
+        "db_path": db_path,
+        "templates_dir": TEMPLATES_DIR,
+        "time_scale": 0,
+        "simulation_start": DEFAULT_START,
+        "poll_mode": "full",
+        # The bench drives every tick itself; no caps or client-side throttling.
+        "poll_tick_budget_seconds": 0,
+        "poll_tick_max_tickets": 0,
+        "zammad_rate_limit_per_second": 0,
+    }
+    if server is None:
+        overrides.update(
+            use_dry_run=True,
+            dry_run_latency_seconds=options.latency_ms / 1000,
+            dry_run_failure_rate=options.failure_rate,
+            dry_run_agent_bot=True,
+            dry_run_agent_reply_seconds=options.agent_reply_seconds,
+            dry_run_agent_jitter_seconds=0,
+            dry_run_agent_close_after=options.agent_close_after,
+        )
+    else:
+        overrides.update(use_dry_run=False, zammad_url=server.base_url, zammad_token="bench")
+    return Settings(_env_file=None, **overrides)
+
+
+async def _drive(
+    options: BenchOptions,
+    settings: Settings,
+    server: FakeZammadServer | None,
+) -> dict[str, Any]:
+    runtime = build_runtime(settings=settings, cwd=Path.cwd())
+    rng = random.Random(options.seed)
+    runtime.scheduler_service.rng = rng
+    runtime.scheduler_service.generation_service.rng = rng
+    agent = FakeZammadAgent(server, options.agent_close_after) if server is not None else None
+
+    profiles = options.profiles or runtime.session_service.list_profiles()
+    for index in range(options.sessions):
+        runtime.session_service.clock_in(profiles[index % len(profiles)])
+
+    timer = StageTimer()
+    instrument(runtime, timer)
+    totals = {"ticks": 0, "tickets_generated": 0, "replies_sent": 0, "tickets_closed": 0}
+    finished = False
+    started = time.perf_counter()
+    try:
+        while not finished and totals["ticks"] < options.max_ticks:
+            runtime.clock.advance(options.step_seconds)
+            if agent is not None:
+                await asyncio.to_thread(agent.act)
+            ticks = await runtime.workers.run_ticks_once()
+            totals["ticks"] += 1
+            totals["tickets_generated"] += ticks["scheduler"]["tickets_generated"]
+            totals["replies_sent"] += ticks["poller"]["replies_sent"]
+            totals["tickets_closed"] += ticks["poller"]["tickets_closed"]
+            finished = _finished(runtime.repository, ticks["outbox"]["pending"])
+        wall_seconds = time.perf_counter() - started
+    finally:
+        await runtime.workers.stop()
+
+    return {
+        "options": {**asdict(options), "db_path": str(options.db_path or "")},
+        "completed": finished,
+        "totals": {
+            **totals,
+            "sessions": options.sessions,
+            "simulated_hours": round(totals["ticks"] * options.step_seconds / 3600, 2),
+            "wall_seconds": round(wall_seconds, 3),
+        },
+        "throughput": {
+            "tickets_per_second": _rate(totals["tickets_generated"], wall_seconds),
+            "replies_per_second": _rate(totals["replies_sent"], wall_seconds),
+        },
+        "stages": timer.summary(),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _finished(repository: SimulatorRepository, outbox_pending: int) -> bool:
+    # Unbound calls skip the timing wrappers: the bench's own checks are not DB load.
+    return (
+        outbox_pending == 0
+        and not SimulatorRepository.list_active_sessions(repository)
+        and not SimulatorRepository.list_open_tickets(repository)
+    )
+
+
+def _latency_stats(values: list[float]) -> dict[str, float]:
+    if not values:
+        return dict.fromkeys(("count", "total_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"), 0)
+
+    def percentile(fraction: float) -> float:
+        index = min(int(len(values) * fraction), len(values) - 1)
+        return round(values[index] * 1000, 3)
+
+    return {
+        "count": len(values),
+        "total_ms": round(sum(values) * 1000, 3),
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": round(values[-1] * 1000, 3),
+    }
+
+
+def _rate(count: int, seconds: float) -> float:
+    return round(count / seconds, 2) if seconds > 0 else 0.0
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def format_report(report: dict[str, Any]) -> str:
+    totals = report["totals"]
+    throughput = report["throughput"]
+    lines = [
+        f"sessions {totals['sessions']}  ticks {totals['ticks']}  "
+        f"simulated {totals['simulated_hours']} h  wall {totals['wall_seconds']} s"
+        + ("" if report["completed"] else "  (stopped at --max-ticks)"),
+        f"tickets {totals['tickets_generated']} ({throughput['tickets_per_second']}/s)  "
+        f"replies {totals['replies_sent']} ({throughput['replies_per_second']}/s)  "
+        f"closed {totals['tickets_closed']}",
+        f"{'stage':>16} {'calls':>8} {'total ms':>10} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8}",
+    ]
+    for stage, stats in report["stages"].items():
+        lines.append(
+            f"{stage:>16} {stats['count']:>8} {stats['total_ms']:>10.1f} {stats['p50_ms']:>8.3f} "
+            f"{stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f} {stats['max_ms']:>8.3f}"
+        )
+    lines.append(f"peak RSS {report['peak_rss_mb']} MB")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="helpdesk-sim-bench",
+        description="Run whole simulated shifts and report throughput and latency.",
+    )
+    parser.add_argument("--sessions", type=int, default=4, help="sessions to clock in")
+    parser.add_argument(
+        "--profiles", default="", help="comma-separated profile names (default: all shipped)"
+    )
+    parser.add_argument("--gateway", choices=("dry-run", "fake-zammad"), default="dry-run")
+    parser.add_argument(
+        "--step-seconds", type=float, default=300.0, help="simulated seconds per tick"
+    )
+    parser.add_argument("--max-ticks", type=int, default=2000)
+    parser.add_argument("--agent-reply-seconds", type=float, default=300.0)
+    parser.add_argument("--agent-close-after", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="injected gateway latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="injected failure rate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", type=Path, default=None, help="keep the SQLite database here")
+    parser.add_argument(
+        "--output", type=Path, default=Path("helpdesk-sim-bench.json"), help="JSON report path"
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        BenchOptions(
+            sessions=args.sessions,
+            profiles=[name.strip() for name in args.profiles.split(",") if name.strip()],
+            gateway=args.gateway,
+            step_seconds=args.step_seconds,
+            max_ticks=args.max_ticks,
+            agent_reply_seconds=args.agent_reply_seconds,
+            agent_close_after=args.agent_close_after,
+            latency_ms=args.latency_ms,
+            failure_rate=args.failure_rate,
+            seed=args.seed,
+            db_path=args.db,
+        )
+    )
+    print(format_report(report))
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {args.output}")
+    return 0 if report["completed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,17 +2,25 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
-from helpdesk_sim.adapters.dry_run_gateway import DryRunGateway
-from helpdesk_sim.adapters.gateway import ZammadGateway
+from helpdesk_sim.adapters.customer_directory import CustomerDirectory
+from helpdesk_sim.adapters.dry_run_gateway import DryRunGateway, ScriptedAgentBot
+from helpdesk_sim.adapters.gateway import AsyncZammadGateway, ZammadGateway
+from helpdesk_sim.adapters.ttl_cache import TtlCache
+from helpdesk_sim.adapters.zammad_async_gateway import AsyncZammadHttpGateway
 from helpdesk_sim.adapters.zammad_http_gateway import ZammadHttpGateway
+from helpdesk_sim.adapters.zammad_resilience import ZammadResilience
+from helpdesk_sim.clock import SimulationClock
 from helpdesk_sim.config import Settings
 from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
 from helpdesk_sim.services.background_worker import BackgroundWorkers
 from helpdesk_sim.services.catalog_service import CatalogService
+from helpdesk_sim.services.event_bus import EventBus
 from helpdesk_sim.services.generation_service import GenerationService
 from helpdesk_sim.services.grading_service import GradingService
 from helpdesk_sim.services.hint_service import HintService
+from helpdesk_sim.services.outbox_dispatcher import OutboxDispatcher
 from helpdesk_sim.services.poller_service import PollerService
 from helpdesk_sim.services.report_service import ReportService
 from helpdesk_sim.services.response_engine import OllamaResponseEngine, ResponseEngine, RuleBasedResponseEngine
@@ -31,43 +39,107 @@ class Runtime:
     hint_service: HintService
     report_service: ReportService
     workers: BackgroundWorkers
+    event_bus: EventBus
+    clock: SimulationClock
+    # Shared by both Zammad HTTP gateways; None in dry-run mode.
+    zammad_resilience: ZammadResilience | None = None
 
 
 def build_runtime(settings: Settings, cwd: Path) -> Runtime:
     db_path = settings.resolve_db_path(cwd)
     templates_dir = settings.resolve_templates_dir(cwd)
+    clock = SimulationClock(time_scale=settings.time_scale, start=settings.simulation_start)
 
-    repository = SimulatorRepository(db_path=db_path)
+    repository = SimulatorRepository(
+        db_path=db_path,
+        pool_size=settings.db_pool_size,
+        busy_timeout_ms=settings.db_busy_timeout_ms,
+        write_queue=settings.db_write_queue_enabled,
+        write_queue_size=settings.db_write_queue_size,
+        write_batch_window_ms=settings.db_write_batch_window_ms,
+        write_batch_max=settings.db_write_batch_max,
+        clock=clock,
+    )
     repository.initialize()
 
     catalog = CatalogService(templates_dir=templates_dir)
     catalog.load()
 
-    zammad_gateway = _build_zammad_gateway(settings)
+    zammad_resilience = _build_zammad_resilience(settings)
+    zammad_gateway = _build_zammad_gateway(
+        settings, catalog, repository, zammad_resilience, clock
+    )
+    async_zammad_gateway = _build_async_zammad_gateway(
+        settings,
+        zammad_resilience,
+        (
+            zammad_gateway.metadata_cache
+            if isinstance(zammad_gateway, ZammadHttpGateway)
+            else None
+        ),
+    )
     response_engine = _build_response_engine(settings)
+    event_bus = EventBus(
+        history_size=settings.event_history_size,
+        max_pending=settings.event_subscriber_queue_size,
+    )
 
-    session_service = SessionService(repository=repository, catalog=catalog)
+    session_service = SessionService(repository=repository, catalog=catalog, clock=clock)
     generation_service = GenerationService(catalog=catalog)
     scheduler_service = SchedulerService(
         repository=repository,
         generation_service=generation_service,
         zammad_gateway=zammad_gateway,
+        event_bus=event_bus,
+        use_outbox=settings.outbox_enabled,
+        clock=clock,
     )
-    grading_service = GradingService()
+    grading_service = GradingService(clock=clock)
     poller_service = PollerService(
         repository=repository,
         zammad_gateway=zammad_gateway,
         response_engine=response_engine,
         grading_service=grading_service,
+        event_bus=event_bus,
+        async_gateway=async_zammad_gateway,
+        poll_concurrency=settings.poll_concurrency,
+        poll_mode=settings.poll_mode,
+        poll_interval_seconds=settings.poll_interval_seconds,
+        hot_poll_interval_seconds=settings.poll_hot_interval_seconds,
+        max_poll_interval_seconds=settings.poll_max_interval_seconds,
+        poll_backoff_factor=settings.poll_backoff_factor,
+        tick_budget_seconds=settings.poll_tick_budget_seconds,
+        tick_max_tickets=settings.poll_tick_max_tickets,
+        use_outbox=settings.outbox_enabled,
+        clock=clock,
     )
-    hint_service = HintService(repository=repository)
-    report_service = ReportService(repository=repository)
+    outbox_dispatcher = None
+    if settings.outbox_enabled:
+        outbox_dispatcher = OutboxDispatcher(
+            repository=repository,
+            zammad_gateway=zammad_gateway,
+            event_bus=event_bus,
+            batch_size=settings.outbox_batch_size,
+            max_attempts=settings.outbox_max_attempts,
+            retry_base_seconds=settings.outbox_retry_base_seconds,
+            retry_max_seconds=settings.outbox_retry_max_seconds,
+            clock=clock,
+        )
+    hint_service = HintService(repository=repository, event_bus=event_bus)
+    report_service = ReportService(repository=repository, clock=clock)
 
     workers = BackgroundWorkers(
+        repository=repository,
+        zammad_gateway=zammad_gateway,
+        async_zammad_gateway=async_zammad_gateway,
         scheduler_service=scheduler_service,
         poller_service=poller_service,
         scheduler_interval_seconds=settings.scheduler_interval_seconds,
-        poll_interval_seconds=settings.poll_interval_seconds,
+        poll_interval_seconds=_poll_loop_interval(settings),
+        cache_refresh_interval_seconds=settings.zammad_cache_refresh_interval_seconds,
+        outbox_dispatcher=outbox_dispatcher,
+        outbox_interval_seconds=settings.outbox_interval_seconds,
+        sleep=clock.sleep,
     )
 
     return Runtime(
@@ -80,12 +152,105 @@ def build_runtime(settings: Settings, cwd: Path) -> Runtime:
         hint_service=hint_service,
         report_service=report_service,
         workers=workers,
+        event_bus=event_bus,
+        clock=clock,
+        zammad_resilience=zammad_resilience,
+    )
+
+
+def _poll_loop_interval(settings: Settings) -> int:
+    # With webhooks delivering changes, polling is only a reconciliation sweep.
+    if settings.zammad_webhook_secret:
+        return settings.webhook_reconcile_interval_seconds
+    # Full ticks only read tickets that are due, so wake often enough for hot ones.
+    if settings.poll_mode == "full":
+        return min(settings.poll_interval_seconds, settings.poll_hot_interval_seconds)
+    return settings.poll_interval_seconds
+
+
+def _build_zammad_resilience(settings: Settings) -> ZammadResilience | None:
+    if settings.use_dry_run:
+        return None
+    return ZammadResilience(
+        rate_limit_per_second=settings.zammad_rate_limit_per_second,
+        rate_limit_burst=settings.zammad_rate_limit_burst,
+        max_attempts=settings.zammad_retry_attempts,
+        retry_base_seconds=settings.zammad_retry_base_seconds,
+        retry_max_seconds=settings.zammad_retry_max_seconds,
+        breaker_failure_threshold=settings.zammad_breaker_failure_threshold,
+        breaker_reset_seconds=settings.zammad_breaker_reset_seconds,
     )
 
 
-def _build_zammad_gateway(settings: Settings) -> ZammadGateway:
+def _build_async_zammad_gateway(
+    settings: Settings,
+    resilience: ZammadResilience | None = None,
+    metadata_cache: TtlCache[list[dict[str, Any]]] | None = None,
+) -> AsyncZammadGateway | None:
     if settings.use_dry_run:
-        return DryRunGateway()
+        # The poller wraps DryRunGateway in worker threads instead.
+        return None
+
+    return AsyncZammadHttpGateway(
+        base_url=settings.zammad_url,
+        token=settings.zammad_token,
+        verify_tls=settings.zammad_verify_tls,
+        timeout_seconds=settings.zammad_timeout_seconds,
+        connect_timeout_seconds=settings.zammad_connect_timeout_seconds,
+        # Enough connections that concurrent polls never queue for the pool.
+        max_connections=max(settings.zammad_max_connections, settings.poll_concurrency),
+        max_keepalive_connections=max(
+            settings.zammad_max_keepalive_connections, settings.poll_concurrency
+        ),
+        keepalive_expiry_seconds=settings.zammad_keepalive_expiry_seconds,
+        http2=settings.zammad_http2,
+        metadata_ttl_seconds=settings.zammad_metadata_ttl_seconds,
+        resilience=resilience,
+        # One cache behind warm-up, /v1/admin/caches and invalidation for both gateways.
+        metadata_cache=metadata_cache,
+    )
+
+
+def _build_dry_run_gateway(settings: Settings, clock: SimulationClock) -> DryRunGateway:
+    agent_bot = None
+    if settings.dry_run_agent_bot:
+        agent_bot = ScriptedAgentBot(
+            reply_after_seconds=settings.dry_run_agent_reply_seconds,
+            jitter_seconds=settings.dry_run_agent_jitter_seconds,
+            close_after_replies=settings.dry_run_agent_close_after,
+        )
+    return DryRunGateway(
+        latency_seconds=settings.dry_run_latency_seconds,
+        failure_rate=settings.dry_run_failure_rate,
+        agent_bot=agent_bot,
+        clock=clock,
+    )
+
+
+def _build_zammad_gateway(
+    settings: Settings,
+    catalog: CatalogService,
+    repository: SimulatorRepository,
+    resilience: ZammadResilience | None = None,
+    clock: SimulationClock | None = None,
+) -> ZammadGateway:
+    if settings.use_dry_run:
+        return _build_dry_run_gateway(settings, clock or SimulationClock())
+
+    personas = catalog.list_personas()
+    customer_directory = CustomerDirectory(
+        refresh_after_seconds=settings.zammad_customer_refresh_seconds,
+        seed_departments=[persona.role for persona in personas],
+        seed_emails=[persona.email for persona in personas],
+        on_update=(
+            repository.save_customer_directory_entry
+            if settings.zammad_customer_directory_persist
+            else None
+        ),
+    )
+    if settings.zammad_customer_directory_persist:
+        customer_directory.load(repository.list_customer_directory())
+
     return ZammadHttpGateway(
         base_url=settings.zammad_url,
         token=settings.zammad_token,
@@ -94,6 +259,15 @@ def _build_zammad_gateway(settings: Settings) -> ZammadGateway:
         group_tier2=settings.zammad_group_tier2,
         group_sysadmin=settings.zammad_group_sysadmin,
         customer_fallback_email=settings.zammad_customer_fallback_email,
+        timeout_seconds=settings.zammad_timeout_seconds,
+        connect_timeout_seconds=settings.zammad_connect_timeout_seconds,
+        max_connections=settings.zammad_max_connections,
+        max_keepalive_connections=settings.zammad_max_keepalive_connections,
+        keepalive_expiry_seconds=settings.zammad_keepalive_expiry_seconds,
+        http2=settings.zammad_http2,
+        metadata_ttl_seconds=settings.zammad_metadata_ttl_seconds,
+        customer_directory=customer_directory,
+        resilience=resilience,
     )
 
 
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from helpdesk_sim.utils import to_iso, utc_now
+
+# Floor for scaled background-loop sleeps, so a large time scale cannot busy-spin.
+MIN_REAL_SLEEP_SECONDS = 0.05
+
+
+class SimulationClock:
+    """The simulator's notion of "now".
+
+    Simulated time starts at ``start`` (default: the real time at construction) and
+    runs ``time_scale`` times faster than real time; ``advance`` jumps it forward.
+    A scale of 1 without advances is the real clock, and a scale of 0 freezes time
+    between advances. Instances are callable, so they fit every ``clock`` parameter.
+    """
+
+    def __init__(
+        self,
+        time_scale: float = 1.0,
+        start: datetime | None = None,
+        monotonic: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if time_scale < 0:
+            raise ValueError("time_scale must be zero or positive")
+        self.time_scale = time_scale
+        self._monotonic = monotonic
+        self._anchor = start or utc_now()
+        self._anchor_monotonic = monotonic()
+        self._advanced_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> datetime:
+        return self.now()
+
+    def now(self) -> datetime:
+        with self._lock:
+            elapsed = (self._monotonic() - self._anchor_monotonic) * self.time_scale
+            return self._anchor + timedelta(seconds=elapsed + self._advanced_seconds)
+
+    def advance(self, seconds: float) -> datetime:
+        if seconds < 0:
+            raise ValueError("the simulation clock cannot move backwards")
+        with self._lock:
+            self._advanced_seconds += seconds
+        return self.now()
+
+    def real_seconds(self, simulated_seconds: float) -> float:
+        """Real time that covers ``simulated_seconds`` of simulated time."""
+        if self.time_scale in (0, 1):
+            # Frozen time only moves on advance, so loops keep their real cadence.
+            return simulated_seconds
+        return max(simulated_seconds / self.time_scale, MIN_REAL_SLEEP_SECONDS)
+
+    def simulated_span(self, real: timedelta) -> timedelta:
+        """Simulated time that passes during ``real`` of real time (at least ``real``)."""
+        return real * max(self.time_scale, 1)
+
+    async def sleep(self, simulated_seconds: float) -> None:
+        await asyncio.sleep(self.real_seconds(simulated_seconds))
+
+    def describe(self) -> dict[str, object]:
+        with self._lock:
+            advanced = self._advanced_seconds
+        return {
+            "now": to_iso(self.now()),
+            "real_now": to_iso(utc_now()),
+            "time_scale": self.time_scale,
+            "advanced_seconds": advanced,
+        }
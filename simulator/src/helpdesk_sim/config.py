@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
 
@@ -22,8 +23,25 @@ class Settings(BaseSettings):
 
     db_path: Path = Field(default=Path("./data/simulator.db"))
     templates_dir: Path = Field(default=Path("./src/helpdesk_sim/templates"))
+    db_pool_size: int = 8
+    db_busy_timeout_ms: int = 5000
+    db_write_queue_enabled: bool = True
+    db_write_queue_size: int = 1024
+    db_write_batch_window_ms: float = 0.0
+    db_write_batch_max: int = 256
+
+    event_history_size: int = 256
+    event_subscriber_queue_size: int = 512
+    event_heartbeat_seconds: float = 15.0
 
     poll_interval_seconds: int = 30
+    poll_concurrency: int = 16
+    poll_mode: str = "full"
+    poll_hot_interval_seconds: int = 10
+    poll_max_interval_seconds: int = 1800
+    poll_backoff_factor: float = 2.0
+    poll_tick_budget_seconds: float = 20.0
+    poll_tick_max_tickets: int = 500
     scheduler_interval_seconds: int = 30
 
     zammad_url: str = "http://localhost"
@@ -33,7 +51,40 @@ class Settings(BaseSettings):
     zammad_group_tier2: str = "Tier 2"
     zammad_group_sysadmin: str = "Systems"
     zammad_customer_fallback_email: str = ""
+    zammad_timeout_seconds: float = 20.0
+    zammad_connect_timeout_seconds: float = 5.0
+    zammad_max_connections: int = 20
+    zammad_max_keepalive_connections: int = 10
+    zammad_keepalive_expiry_seconds: float = 30.0
+    zammad_http2: bool = False
+    zammad_metadata_ttl_seconds: float = 900.0
+    zammad_customer_refresh_seconds: float = 3600.0
+    zammad_customer_directory_persist: bool = True
+    zammad_cache_refresh_interval_seconds: int = 300
+    zammad_rate_limit_per_second: float = 20.0
+    zammad_rate_limit_burst: int = 40
+    zammad_retry_attempts: int = 3
+    zammad_retry_base_seconds: float = 0.2
+    zammad_retry_max_seconds: float = 2.0
+    zammad_breaker_failure_threshold: int = 5
+    zammad_breaker_reset_seconds: float = 30.0
+    zammad_webhook_secret: str = ""
+    webhook_reconcile_interval_seconds: int = 300
+    outbox_enabled: bool = True
+    outbox_interval_seconds: float = 2.0
+    outbox_batch_size: int = 50
+    outbox_max_attempts: int = 0
+    outbox_retry_base_seconds: float = 5.0
+    outbox_retry_max_seconds: float = 900.0
     use_dry_run: bool = True
+    time_scale: float = Field(default=1.0, ge=0)
+    simulation_start: datetime | None = None
+    dry_run_latency_seconds: float = 0.0
+    dry_run_failure_rate: float = 0.0
+    dry_run_agent_bot: bool = False
+    dry_run_agent_reply_seconds: float = 120.0
+    dry_run_agent_jitter_seconds: float = 60.0
+    dry_run_agent_close_after: int = 2
 
     response_engine: str = "rule_based"
     ollama_url: str = "http://127.0.0.1:11434"
@@ -180,6 +180,12 @@ class SessionRecord(BaseModel):
     config: dict[str, Any]
 
 
+class SessionSummary(SessionRecord):
+    ticket_count: int = 0
+    open_ticket_count: int = 0
+    closed_ticket_count: int = 0
+
+
 class TicketRecord(BaseModel):
     id: str
     session_id: str
@@ -195,6 +201,8 @@ class TicketRecord(BaseModel):
     updated_at: datetime
     closed_at: datetime | None = None
     last_seen_article_id: int = 0
+    next_poll_at: datetime | None = None
+    poll_interval_seconds: float | None = None
 
 
 class InteractionRecord(BaseModel):
@@ -215,11 +223,55 @@ class ReportRecord(BaseModel):
     created_at: datetime
 
 
+class CustomerDirectoryEntry(BaseModel):
+    """A cached Zammad customer lookup.
+
+    ``department`` entries map a department to the customer its tickets are filed
+    under; ``email`` entries record whether a customer exists. ``email`` is None
+    when the lookup found nobody.
+    """
+
+    kind: str
+    key: str
+    email: str | None = None
+    refreshed_at: datetime
+
+
+class OutboxStatus(str, Enum):
+    pending = "pending"
+    failed = "failed"
+
+
+class OutboxEntry(BaseModel):
+    """A Zammad write committed locally and waiting for the outbox dispatcher.
+
+    Delivered entries are deleted; ``failed`` entries gave up and are kept for
+    inspection.
+    """
+
+    id: int
+    ticket_id: str
+    action: str
+    payload: dict[str, Any]
+    idempotency_key: str
+    status: OutboxStatus
+    attempts: int = 0
+    next_attempt_at: datetime
+    last_error: str | None = None
+    created_at: datetime
+
+
 class ClockInRequest(BaseModel):
     profile_name: str
     start_now: bool = True
 
 
+class ClockAdvanceRequest(BaseModel):
+    seconds: float = Field(gt=0)
+    # Run scheduler, poller and outbox once afterwards so the jump takes effect at once.
+    run_ticks: bool = True
+
+
 class HintRequest(BaseModel):
     ticket_id: str
     level: HintLevel
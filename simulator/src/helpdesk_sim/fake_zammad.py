@@ -0,0 +1,556 @@
+"""A stand-in Zammad server for exercising the real HTTP gateways offline.
+
+Implements the subset of the Zammad REST API that ``ZammadHttpGateway`` and
+``AsyncZammadHttpGateway`` call, backed by an in-memory dataset, with optional
+latency and error injection. Run it on its own::
+
+    python -m helpdesk_sim.fake_zammad --port 3000 --tickets 500 --latency-ms 40
+
+or start it in-process with ``FakeZammadServer`` (tests and benchmarks do).
+Control endpoints under ``/__fake__`` inspect request counts, change fault
+injection at runtime and add agent replies.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from datetime import UTC, datetime
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+DEPARTMENTS = ("Finance", "Human Resources", "Sales", "Operations", "Engineering", "Legal")
+TICKET_STATES = (
+    {"id": 1, "name": "new", "state_type": "new"},
+    {"id": 2, "name": "open", "state_type": "open"},
+    {"id": 3, "name": "pending reminder", "state_type": "pending reminder"},
+    {"id": 4, "name": "closed", "state_type": "closed"},
+)
+ROLES = ({"id": 1, "name": "Admin"}, {"id": 2, "name": "Agent"}, {"id": 3, "name": "Customer"})
+GROUPS = (
+    {"id": 1, "name": "Service Desk"},
+    {"id": 2, "name": "Tier 2"},
+    {"id": 3, "name": "Systems"},
+)
+PRIORITIES = (
+    {"id": 1, "name": "1 low"},
+    {"id": 2, "name": "2 normal"},
+    {"id": 3, "name": "3 high"},
+)
+# Zammad's ticket_article_senders ids.
+SENDER_IDS = {"Agent": 1, "Customer": 2, "System": 3}
+CUSTOMER_ROLE_ID = 3
+CLOSED_STATE_ID = 4
+
+
+@dataclass(slots=True)
+class FakeZammadConfig:
+    tickets: int = 0
+    articles_per_ticket: int = 2
+    customers: int = 20
+    latency_seconds: float = 0.0
+    latency_jitter_seconds: float = 0.0
+    # Share of /api requests answered with ``error_status`` instead of being served.
+    error_rate: float = 0.0
+    error_status: int = 503
+    # When set, requests must send "Authorization: Token token=<token>".
+    token: str | None = None
+    seed: int = 7
+
+
+def _now() -> str:
+    return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class FakeZammadState:
+    """The in-memory Zammad dataset; thread-safe so tests can edit it while serving."""
+
+    def __init__(self, config: FakeZammadConfig) -> None:
+        self.config = config
+        self.requests: Counter[str] = Counter()
+        self.injected_errors = 0
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._ticket_ids = itertools.count(1)
+        self._article_ids = itertools.count(1)
+        self._user_ids = itertools.count(10)
+        self._organization_ids = itertools.count(1)
+        self.tickets: dict[int, dict[str, Any]] = {}
+        self.articles: dict[int, list[dict[str, Any]]] = {}
+        self.users: dict[int, dict[str, Any]] = {}
+        self.organizations: dict[int, dict[str, Any]] = {}
+        self._seed()
+
+    def _seed(self) -> None:
+        for index in range(self.config.customers):
+            department = DEPARTMENTS[index % len(DEPARTMENTS)]
+            self.create_user(
+                {
+                    "firstname": "Customer",
+                    "lastname": str(index),
+                    "email": f"customer{index}@example.test",
+                    "organization": department,
+                    "note": f"Department: {department}",
+                    "role_ids": [CUSTOMER_ROLE_ID],
+                }
+            )
+        for index in range(self.config.tickets):
+            ticket = self.create_ticket(
+                {
+                    "title": f"Seeded ticket {index}",
+                    "group": GROUPS[index % len(GROUPS)]["name"],
+                    "customer": f"customer{index % max(self.config.customers, 1)}@example.test",
+                    "article": {"body": f"Seeded problem report {index}", "sender": "Customer"},
+                }
+            )
+            for reply in range(1, self.config.articles_per_ticket):
+                sender = "Agent" if reply % 2 else "Customer"
+                self.add_article(ticket["id"], {"body": f"{sender} message {reply}"}, sender)
+
+    # -- tickets -------------------------------------------------------------------
+
+    def create_ticket(self, payload: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            ticket_id = next(self._ticket_ids)
+            stamp = _now()
+            ticket = {
+                "id": ticket_id,
+                "number": str(50000 + ticket_id),
+                "title": payload.get("title", ""),
+                "group": payload.get("group"),
+                "group_id": payload.get("group_id"),
+                "customer": payload.get("customer"),
+                "priority_id": payload.get("priority_id", 2),
+                "state_id": payload.get("state_id", 1),
+                "created_at": stamp,
+                "updated_at": stamp,
+            }
+            self.tickets[ticket_id] = ticket
+            self.articles[ticket_id] = []
+        article = payload.get("article")
+        if isinstance(article, dict):
+            self.add_article(ticket_id, article, str(article.get("sender") or "Customer"))
+        return dict(ticket)
+
+    def get_ticket(self, ticket_id: int) -> dict[str, Any] | None:
+        with self._lock:
+            ticket = self.tickets.get(ticket_id)
+            return dict(ticket) if ticket else None
+
+    def update_ticket(self, ticket_id: int, payload: dict[str, Any]) -> dict[str, Any] | None:
+        with self._lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None:
+                return None
+            state_id = payload.get("state_id")
+            if state_id is None and isinstance(payload.get("state"), str):
+                state_id = next(
+                    (row["id"] for row in TICKET_STATES if row["name"] == payload["state"]),
+                    None,
+                )
+            if state_id is not None:
+                ticket["state_id"] = int(state_id)
+            ticket["updated_at"] = _now()
+            return dict(ticket)
+
+    def delete_ticket(self, ticket_id: int) -> bool:
+        with self._lock:
+            self.articles.pop(ticket_id, None)
+            return self.tickets.pop(ticket_id, None) is not None
+
+    def add_article(
+        self, ticket_id: int, payload: dict[str, Any], sender: str
+    ) -> dict[str, Any] | None:
+        with self._lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None:
+                return None
+            stamp = _now()
+            article = {
+                "id": next(self._article_ids),
+                "ticket_id": ticket_id,
+                "subject": payload.get("subject"),
+                "body": payload.get("body", ""),
+                "sender": sender,
+                "sender_id": SENDER_IDS.get(sender, 2),
+                "from": sender,
+                "message_id": payload.get("message_id"),
+                "internal": bool(payload.get("internal", False)),
+                "created_at": stamp,
+            }
+            self.articles[ticket_id].append(article)
+            if sender == "Customer" and ticket["state_id"] == CLOSED_STATE_ID:
+                # Zammad reopens a closed ticket on a customer follow-up.
+                ticket["state_id"] = 2
+            ticket["updated_at"] = stamp
+            return dict(article)
+
+    def add_agent_reply(self, ticket_id: int, body: str) -> dict[str, Any] | None:
+        return self.add_article(ticket_id, {"body": body}, "Agent")
+
+    def ticket_articles(self, ticket_id: int) -> list[dict[str, Any]] | None:
+        with self._lock:
+            if ticket_id not in self.tickets:
+                return None
+            return [dict(article) for article in self.articles[ticket_id]]
+
+    def search_tickets(self, query: str, page: int, per_page: int) -> list[dict[str, Any]]:
+        with self._lock:
+            tickets = list(self.tickets.values())
+            articles = {key: list(value) for key, value in self.articles.items()}
+        if query.startswith("updated_at:>="):
+            since = _parse_time(query.removeprefix("updated_at:>="))
+            matches = [row for row in tickets if _parse_time(row["updated_at"]) >= since]
+            matches.sort(key=lambda row: row["updated_at"])
+        elif query.startswith("article.message_id:"):
+            wanted = query.removeprefix("article.message_id:").strip('"')
+            matches = [
+                row
+                for row in tickets
+                if any(article["message_id"] == wanted for article in articles[row["id"]])
+            ]
+        else:
+            matches = [row for row in tickets if query.lower() in str(row["title"]).lower()]
+        start = (max(page, 1) - 1) * per_page
+        return [dict(row) for row in matches[start : start + per_page]]
+
+    # -- users and organizations ---------------------------------------------------
+
+    def create_user(self, payload: dict[str, Any]) -> dict[str, Any] | None:
+        email = str(payload.get("email", "")).strip().lower()
+        with self._lock:
+            if any(user["email"] == email for user in self.users.values()):
+                return None
+            user = {
+                "id": next(self._user_ids),
+                "firstname": payload.get("firstname", ""),
+                "lastname": payload.get("lastname", ""),
+                "email": email,
+                "active": payload.get("active", True),
+                "organization": payload.get("organization"),
+                "organization_id": payload.get("organization_id"),
+                "note": payload.get("note", ""),
+                "role_ids": payload.get("role_ids") or [CUSTOMER_ROLE_ID],
+            }
+            self.users[user["id"]] = user
+            return dict(user)
+
+    def update_user(self, user_id: int, payload: dict[str, Any]) -> dict[str, Any] | None:
+        with self._lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return None
+            user.update({key: value for key, value in payload.items() if key != "id"})
+            return dict(user)
+
+    def search_users(self, query: str) -> list[dict[str, Any]]:
+        needle = query.strip().lower()
+        with self._lock:
+            return [
+                dict(user)
+                for user in self.users.values()
+                if needle in user["email"]
+                or needle in str(user.get("organization") or "").lower()
+                or needle in str(user.get("note") or "").lower()
+            ]
+
+    def create_organization(self, name: str) -> dict[str, Any]:
+        with self._lock:
+            organization = {"id": next(self._organization_ids), "name": name, "active": True}
+            self.organizations[organization["id"]] = organization
+            return dict(organization)
+
+    def search_organizations(self, query: str) -> list[dict[str, Any]]:
+        needle = query.strip().lower()
+        with self._lock:
+            return [
+                dict(row) for row in self.organizations.values() if needle in row["name"].lower()
+            ]
+
+    # -- fault injection -----------------------------------------------------------
+
+    def injected_delay(self) -> float:
+        jitter = self.config.latency_jitter_seconds
+        return max(self.config.latency_seconds + self._rng.uniform(-jitter, jitter), 0.0)
+
+    def inject_error(self) -> bool:
+        return self.config.error_rate > 0 and self._rng.random() < self.config.error_rate
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "total_requests": sum(self.requests.values()),
+                "injected_errors": self.injected_errors,
+                "tickets": len(self.tickets),
+                "users": len(self.users),
+                "config": asdict(self.config),
+            }
+
+
+def _not_found(kind: str, record_id: int) -> JSONResponse:
+    return JSONResponse(
+        {"error": f"Couldn't find {kind} with 'id'={record_id}"}, status_code=404
+    )
+
+
+def _ticket_all(state: FakeZammadState, ticket: dict[str, Any]) -> dict[str, Any]:
+    articles = state.ticket_articles(ticket["id"]) or []
+    return {
+        "ticket_id": ticket["id"],
+        "ticket_article_ids": [article["id"] for article in articles],
+        "assets": {
+            "Ticket": {str(ticket["id"]): ticket},
+            # Like Zammad, ?all=true assets identify the sender by id only.
+            "TicketArticle": {
+                str(article["id"]): {k: v for k, v in article.items() if k != "sender"}
+                for article in articles
+            },
+            "TicketState": {str(row["id"]): dict(row) for row in TICKET_STATES},
+        },
+    }
+
+
+def create_fake_zammad_app(config: FakeZammadConfig | None = None) -> FastAPI:
+    state = FakeZammadState(config or FakeZammadConfig())
+    app = FastAPI(title="Fake Zammad", docs_url=None, redoc_url=None)
+    app.state.fake = state
+
+    @app.middleware("http")
+    async def faults(request: Request, call_next):
+        path = request.url.path
+        if not path.startswith("/api/"):
+            return await call_next(request)
+        route = f"{request.method} {path.rstrip('0123456789/') or path}"
+        with state._lock:
+            state.requests[route] += 1
+        expected = state.config.token
+        if expected and request.headers.get("Authorization") != f"Token token={expected}":
+            return JSONResponse({"error": "authentication failed"}, status_code=401)
+        delay = state.injected_delay()
+        if delay:
+            await asyncio.sleep(delay)
+        if state.inject_error():
+            with state._lock:
+                state.injected_errors += 1
+            return JSONResponse(
+                {"error": "injected failure"}, status_code=state.config.error_status
+            )
+        return await call_next(request)
+
+    @app.get("/api/v1/roles")
+    async def list_roles() -> list[dict[str, Any]]:
+        return [dict(row) for row in ROLES]
+
+    @app.get("/api/v1/groups")
+    async def list_groups() -> list[dict[str, Any]]:
+        return [dict(row) for row in GROUPS]
+
+    @app.get("/api/v1/ticket_priorities")
+    async def list_priorities() -> list[dict[str, Any]]:
+        return [dict(row) for row in PRIORITIES]
+
+    @app.get("/api/v1/ticket_states")
+    async def list_ticket_states() -> list[dict[str, Any]]:
+        return [dict(row) for row in TICKET_STATES]
+
+    @app.get("/api/v1/ticket_states/{state_id}")
+    async def get_ticket_state(state_id: int) -> Any:
+        row = next((row for row in TICKET_STATES if row["id"] == state_id), None)
+        return dict(row) if row else _not_found("Ticket::State", state_id)
+
+    @app.get("/api/v1/tickets/search")
+    async def search_tickets(
+        query: str = "", page: int = 1, per_page: int = 50, limit: int | None = None
+    ) -> dict[str, Any]:
+        rows = state.search_tickets(query, page, limit or per_page)
+        return {
+            "tickets": [row["id"] for row in rows],
+            "tickets_count": len(rows),
+            "assets": {"Ticket": {str(row["id"]): row for row in rows}},
+        }
+
+    @app.post("/api/v1/tickets", status_code=201)
+    async def create_ticket(request: Request) -> dict[str, Any]:
+        return state.create_ticket(await request.json())
+
+    @app.get("/api/v1/tickets/{ticket_id}")
+    async def get_ticket(ticket_id: int, all: bool = False) -> Any:  # noqa: A002 - Zammad's name
+        ticket = state.get_ticket(ticket_id)
+        if ticket is None:
+            return _not_found("Ticket", ticket_id)
+        return _ticket_all(state, ticket) if all else ticket
+
+    @app.put("/api/v1/tickets/{ticket_id}")
+    async def update_ticket(ticket_id: int, request: Request) -> Any:
+        ticket = state.update_ticket(ticket_id, await request.json())
+        return ticket if ticket is not None else _not_found("Ticket", ticket_id)
+
+    @app.delete("/api/v1/tickets/{ticket_id}")
+    async def delete_ticket(ticket_id: int) -> Any:
+        if not state.delete_ticket(ticket_id):
+            return _not_found("Ticket", ticket_id)
+        return Response(status_code=200)
+
+    @app.get("/api/v1/ticket_articles/by_ticket/{ticket_id}")
+    async def ticket_articles(ticket_id: int) -> Any:
+        articles = state.ticket_articles(ticket_id)
+        return articles if articles is not None else _not_found("Ticket", ticket_id)
+
+    @app.post("/api/v1/ticket_articles", status_code=201)
+    async def create_article(request: Request) -> Any:
+        payload = await request.json()
+        ticket_id = int(payload.get("ticket_id", 0))
+        article = state.add_article(ticket_id, payload, str(payload.get("sender") or "Agent"))
+        return article if article is not None else _not_found("Ticket", ticket_id)
+
+    @app.get("/api/v1/users/search")
+    async def search_users(query: str = "") -> list[dict[str, Any]]:
+        return state.search_users(query)
+
+    @app.post("/api/v1/users", status_code=201)
+    async def create_user(request: Request) -> Any:
+        user = state.create_user(await request.json())
+        if user is None:
+            return JSONResponse(
+                {"error": "Email address has already been taken"}, status_code=422
+            )
+        return user
+
+    @app.put("/api/v1/users/{user_id}")
+    async def update_user(user_id: int, request: Request) -> Any:
+        user = state.update_user(user_id, await request.json())
+        return user if user is not None else _not_found("User", user_id)
+
+    @app.get("/api/v1/organizations/search")
+    async def search_organizations(query: str = "") -> list[dict[str, Any]]:
+        return state.search_organizations(query)
+
+    @app.post("/api/v1/organizations", status_code=201)
+    async def create_organization(request: Request) -> dict[str, Any]:
+        payload = await request.json()
+        return state.create_organization(str(payload.get("name", "")))
+
+    @app.get("/__fake__/stats")
+    async def fake_stats() -> dict[str, Any]:
+        return state.stats()
+
+    @app.put("/__fake__/config")
+    async def fake_config(request: Request) -> dict[str, Any]:
+        """Change fault injection (latency, error_rate, ...) without restarting."""
+        payload = await request.json()
+        names = {item.name for item in fields(FakeZammadConfig)}
+        for key, value in payload.items():
+            if key in names:
+                setattr(state.config, key, value)
+        return asdict(state.config)
+
+    @app.post("/__fake__/tickets/{ticket_id}/agent_reply")
+    async def fake_agent_reply(ticket_id: int, request: Request) -> Any:
+        payload = await request.json()
+        article = state.add_agent_reply(ticket_id, str(payload.get("body", "")))
+        return article if article is not None else _not_found("Ticket", ticket_id)
+
+    return app
+
+
+class FakeZammadServer:
+    """Serve the fake Zammad from a background thread on a free local port."""
+
+    def __init__(
+        self,
+        config: FakeZammadConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.app = create_fake_zammad_app(config)
+        self.host = host
+        self.port = port
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def state(self) -> FakeZammadState:
+        return self.app.state.fake
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0) -> FakeZammadServer:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, log_level="warning", lifespan="off", access_log=False)
+        )
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("fake Zammad server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> FakeZammadServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake Zammad API for offline testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--tickets", type=int, default=100, help="tickets to seed")
+    parser.add_argument("--articles-per-ticket", type=int, default=2)
+    parser.add_argument("--customers", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--token", default=None)
+    args = parser.parse_args()
+
+    config = FakeZammadConfig(
+        tickets=args.tickets,
+        articles_per_ticket=args.articles_per_ticket,
+        customers=args.customers,
+        latency_seconds=args.latency_ms / 1000,
+        latency_jitter_seconds=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        token=args.token,
+    )
+    uvicorn.run(create_fake_zammad_app(config), host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
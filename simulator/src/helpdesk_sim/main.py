@@ -27,6 +27,7 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
+        runtime.event_bus.close()
         await runtime.workers.stop()
 
 
@@ -66,4 +67,6 @@ if __name__ == "__main__":  # pragma: no cover
         host=settings.host,
         port=settings.port,
         reload=False,
+        # Open /v1/events streams never finish on their own; cut them off on shutdown.
+        timeout_graceful_shutdown=5,
     )
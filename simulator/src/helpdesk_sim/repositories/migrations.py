@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+
+from helpdesk_sim.utils import to_iso, utc_now
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    version: int
+    name: str
+    statements: tuple[str, ...]
+
+
+# Append new migrations at the end with the next version number. Applied
+# migrations must never be edited; add a follow-up migration instead.
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        version=1,
+        name="baseline_schema",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                profile_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                started_at TEXT NOT NULL,
+                ends_at TEXT NOT NULL,
+                next_window_at TEXT NOT NULL,
+                window_index INTEGER NOT NULL DEFAULT 0,
+                config_json TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS tickets (
+                id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                zammad_ticket_id INTEGER,
+                subject TEXT NOT NULL,
+                tier TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                status TEXT NOT NULL,
+                scenario_id TEXT NOT NULL,
+                hidden_truth_json TEXT NOT NULL,
+                score_json TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                closed_at TEXT,
+                last_seen_article_id INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY(session_id) REFERENCES sessions(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS interactions (
+                id TEXT PRIMARY KEY,
+                ticket_id TEXT NOT NULL,
+                actor TEXT NOT NULL,
+                body TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                metadata_json TEXT,
+                FOREIGN KEY(ticket_id) REFERENCES tickets(id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                id TEXT PRIMARY KEY,
+                report_type TEXT NOT NULL,
+                period_start TEXT NOT NULL,
+                period_end TEXT NOT NULL,
+                payload_json TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status)",
+            "CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status)",
+            "CREATE INDEX IF NOT EXISTS idx_tickets_session ON tickets(session_id)",
+            """
+            CREATE INDEX IF NOT EXISTS idx_reports_type_created
+            ON reports(report_type, created_at)
+            """,
+        ),
+    ),
+    Migration(
+        version=2,
+        name="hot_path_indexes",
+        statements=(
+            # list_interactions: filter by ticket, return in chronological order.
+            """
+            CREATE INDEX IF NOT EXISTS idx_interactions_ticket_created
+            ON interactions(ticket_id, created_at)
+            """,
+            # list_open_tickets / list_closed_tickets_between; supersedes idx_tickets_status.
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_status_closed
+            ON tickets(status, closed_at)
+            """,
+            "DROP INDEX IF EXISTS idx_tickets_status",
+            # list_pollable_tickets: only open tickets that are linked to Zammad.
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_pollable
+            ON tickets(status, created_at)
+            WHERE status = 'open' AND zammad_ticket_id IS NOT NULL
+            """,
+        ),
+    ),
+    Migration(
+        version=3,
+        name="session_ticket_counts",
+        statements=(
+            # list_session_summaries counts tickets per status straight from the index.
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_session_status
+            ON tickets(session_id, status)
+            """,
+            "DROP INDEX IF EXISTS idx_tickets_session",
+        ),
+    ),
+    Migration(
+        version=4,
+        name="keyset_pagination",
+        statements=(
+            # Paged session ticket lists seek on (created_at, id) after the cursor.
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_session_created
+            ON tickets(session_id, created_at, id)
+            """,
+            # Paged interaction lists; supersedes idx_interactions_ticket_created.
+            """
+            CREATE INDEX IF NOT EXISTS idx_interactions_ticket_keyset
+            ON interactions(ticket_id, created_at, id)
+            """,
+            "DROP INDEX IF EXISTS idx_interactions_ticket_created",
+        ),
+    ),
+    Migration(
+        version=5,
+        name="session_change_feed",
+        statements=(
+            # list_session_changes: tickets of one session touched after a point in time.
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_session_updated
+            ON tickets(session_id, updated_at)
+            """,
+        ),
+    ),
+    Migration(
+        version=6,
+        name="customer_directory",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS customer_directory (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                email TEXT,
+                refreshed_at TEXT NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=7,
+        name="poller_state",
+        statements=(
+            # Small key/value store for poller bookkeeping such as the change watermark.
+            """
+            CREATE TABLE IF NOT EXISTS poller_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=8,
+        name="adaptive_polling",
+        statements=(
+            "ALTER TABLE tickets ADD COLUMN next_poll_at TEXT",
+            "ALTER TABLE tickets ADD COLUMN poll_interval_seconds REAL",
+            "UPDATE tickets SET next_poll_at = updated_at WHERE next_poll_at IS NULL",
+            # list_due_tickets: open Zammad-linked tickets whose next poll time has passed.
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_poll_due
+            ON tickets(status, next_poll_at)
+            WHERE status = 'open' AND zammad_ticket_id IS NOT NULL
+            """,
+        ),
+    ),
+    Migration(
+        version=9,
+        name="processed_articles",
+        statements=(
+            # One row per agent article the poller has answered; the primary key makes
+            # recording an article a second time a no-op.
+            """
+            CREATE TABLE IF NOT EXISTS processed_articles (
+                ticket_id TEXT NOT NULL,
+                zammad_article_id INTEGER NOT NULL,
+                replied INTEGER NOT NULL,
+                processed_at TEXT NOT NULL,
+                PRIMARY KEY (ticket_id, zammad_article_id),
+                FOREIGN KEY(ticket_id) REFERENCES tickets(id)
+            ) WITHOUT ROWID
+            """,
+            """
+            INSERT OR IGNORE INTO processed_articles
+                (ticket_id, zammad_article_id, replied, processed_at)
+            SELECT
+                ticket_id,
+                json_extract(metadata_json, '$.article_id'),
+                0,
+                created_at
+            FROM interactions
+            WHERE actor = 'agent' AND json_extract(metadata_json, '$.article_id') IS NOT NULL
+            """,
+            """
+            UPDATE processed_articles SET replied = 1
+            WHERE EXISTS (
+                SELECT 1 FROM interactions
+                WHERE interactions.ticket_id = processed_articles.ticket_id
+                  AND interactions.actor = 'customer'
+                  AND json_extract(interactions.metadata_json, '$.article_id')
+                      = processed_articles.zammad_article_id
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=10,
+        name="zammad_outbox",
+        statements=(
+            # Zammad writes committed with the local change that caused them and
+            # delivered later by the outbox dispatcher.
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY,
+                ticket_id TEXT NOT NULL,
+                action TEXT NOT NULL,
+                payload_json TEXT NOT NULL,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TEXT NOT NULL,
+                last_error TEXT,
+                created_at TEXT NOT NULL,
+                FOREIGN KEY(ticket_id) REFERENCES tickets(id)
+            )
+            """,
+            # list_due_outbox: pending entries whose retry time has passed.
+            """
+            CREATE INDEX IF NOT EXISTS idx_outbox_due
+            ON outbox(status, next_attempt_at)
+            """,
+            # Per-ticket ordering check and cleanup when a ticket is deleted.
+            "CREATE INDEX IF NOT EXISTS idx_outbox_ticket ON outbox(ticket_id)",
+        ),
+    ),
+    Migration(
+        version=11,
+        name="pollable_keyset",
+        statements=(
+            # The poller's round robin seeks on (created_at, id) past its cursor.
+            "DROP INDEX IF EXISTS idx_tickets_pollable",
+            """
+            CREATE INDEX IF NOT EXISTS idx_tickets_pollable
+            ON tickets(status, created_at, id)
+            WHERE status = 'open' AND zammad_ticket_id IS NOT NULL
+            """,
+        ),
+    ),
+)
+
+
+def apply_migrations(
+    conn: sqlite3.Connection,
+    migrations: tuple[Migration, ...] = MIGRATIONS,
+) -> list[int]:
+    """Apply pending migrations in version order, each in its own transaction."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+
+    applied_now: list[int] = []
+    for migration in sorted(migrations, key=lambda item: item.version):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            already_applied = conn.execute(
+                "SELECT 1 FROM schema_migrations WHERE version = ?",
+                (migration.version,),
+            ).fetchone()
+            if already_applied:
+                conn.rollback()
+                continue
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.name, to_iso(utc_now())),
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied_now.append(migration.version)
+    return applied_now
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return int(row[0] or 0)
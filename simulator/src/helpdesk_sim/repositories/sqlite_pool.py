@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class SqliteConnectionPool:
+    """Keeps long-lived SQLite connections around instead of reconnecting per query.
+
+    Connections are opened lazily, configured for WAL journaling, and handed back to
+    an idle list after each use. Connections may be checked out from any thread but
+    are only ever used by one thread at a time.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_idle: int = 8,
+        busy_timeout_ms: int = 5000,
+    ) -> None:
+        self.db_path = db_path
+        self.max_idle = max(max_idle, 1)
+        self.busy_timeout_ms = max(busy_timeout_ms, 0)
+        self._lock = threading.Lock()
+        self._idle: list[sqlite3.Connection] = []
+        self._closed = False
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self.open_connection()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # WAL keeps committed data durable across application crashes with NORMAL sync.
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
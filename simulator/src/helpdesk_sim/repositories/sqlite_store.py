@@ -4,85 +4,96 @@ import json
 import sqlite3
 import threading
 import uuid
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from helpdesk_sim.domain.models import (
+    CustomerDirectoryEntry,
     InteractionRecord,
+    OutboxEntry,
+    OutboxStatus,
     ReportRecord,
     SessionRecord,
     SessionStatus,
+    SessionSummary,
     TicketRecord,
     TicketStatus,
 )
-from helpdesk_sim.utils import from_iso, to_iso, utc_now
+from helpdesk_sim.repositories.migrations import apply_migrations, current_version
+from helpdesk_sim.repositories.sqlite_pool import SqliteConnectionPool
+from helpdesk_sim.repositories.sqlite_writer import SqliteWriteQueue
+from helpdesk_sim.utils import decode_cursor, from_iso, to_iso, utc_now
+
+T = TypeVar("T")
+
+# Every ticket column except hidden_truth_json, for list views that never show it.
+_TICKET_LIST_COLUMNS = (
+    "id, session_id, zammad_ticket_id, subject, tier, priority, status, scenario_id, "
+    "score_json, created_at, updated_at, closed_at, last_seen_article_id, "
+    "next_poll_at, poll_interval_seconds"
+)
+
+
+def _keyset_page(
+    sql: str,
+    params: tuple[Any, ...],
+    limit: int | None,
+    after: str | None,
+) -> tuple[str, tuple[Any, ...]]:
+    """Extend a filtered SELECT with (created_at, id) keyset pagination."""
+    if after is not None:
+        created_at, record_id = decode_cursor(after)
+        sql += " AND (created_at, id) > (?, ?)"
+        params += (created_at, record_id)
+    sql += " ORDER BY created_at ASC, id ASC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params += (limit,)
+    return sql, params
 
 
 class SimulatorRepository:
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        pool_size: int = 8,
+        busy_timeout_ms: int = 5000,
+        write_queue: bool = False,
+        write_queue_size: int = 1024,
+        write_batch_window_ms: float = 0.0,
+        write_batch_max: int = 256,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
         self.db_path = db_path
-        self._lock = threading.Lock()
+        # Stamps created_at, closed_at, next_poll_at, ...; a SimulationClock in accelerated runs.
+        self._clock = clock
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = SqliteConnectionPool(
+            db_path=db_path,
+            max_idle=pool_size,
+            busy_timeout_ms=busy_timeout_ms,
+        )
+        self._local = threading.local()
+        self._writer: SqliteWriteQueue | None = None
+        if write_queue:
+            self._writer = SqliteWriteQueue(
+                connection_factory=self._pool.open_connection,
+                max_pending=write_queue_size,
+                batch_window_ms=write_batch_window_ms,
+                max_batch=write_batch_max,
+            )
 
     def initialize(self) -> None:
+        with self._pool.connection() as conn:
+            apply_migrations(conn)
+
+    def schema_version(self) -> int:
         with self._connect() as conn:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id TEXT PRIMARY KEY,
-                    profile_name TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    started_at TEXT NOT NULL,
-                    ends_at TEXT NOT NULL,
-                    next_window_at TEXT NOT NULL,
-                    window_index INTEGER NOT NULL DEFAULT 0,
-                    config_json TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS tickets (
-                    id TEXT PRIMARY KEY,
-                    session_id TEXT NOT NULL,
-                    zammad_ticket_id INTEGER,
-                    subject TEXT NOT NULL,
-                    tier TEXT NOT NULL,
-                    priority TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    scenario_id TEXT NOT NULL,
-                    hidden_truth_json TEXT NOT NULL,
-                    score_json TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    closed_at TEXT,
-                    last_seen_article_id INTEGER NOT NULL DEFAULT 0,
-                    FOREIGN KEY(session_id) REFERENCES sessions(id)
-                );
-
-                CREATE TABLE IF NOT EXISTS interactions (
-                    id TEXT PRIMARY KEY,
-                    ticket_id TEXT NOT NULL,
-                    actor TEXT NOT NULL,
-                    body TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    metadata_json TEXT,
-                    FOREIGN KEY(ticket_id) REFERENCES tickets(id)
-                );
-
-                CREATE TABLE IF NOT EXISTS reports (
-                    id TEXT PRIMARY KEY,
-                    report_type TEXT NOT NULL,
-                    period_start TEXT NOT NULL,
-                    period_end TEXT NOT NULL,
-                    payload_json TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-
-                CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status);
-                CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status);
-                CREATE INDEX IF NOT EXISTS idx_tickets_session ON tickets(session_id);
-                CREATE INDEX IF NOT EXISTS idx_reports_type_created ON reports(report_type, created_at);
-                """
-            )
+            return current_version(conn)
 
     def create_session(
         self,
@@ -93,26 +104,31 @@ class SimulatorRepository:
         config: dict[str, Any],
     ) -> SessionRecord:
         session_id = str(uuid.uuid4())
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO sessions (id, profile_name, status, started_at, ends_at, next_window_at, window_index, config_json)
-                VALUES (?, ?, ?, ?, ?, ?, 0, ?)
-                """,
-                (
-                    session_id,
-                    profile_name,
-                    SessionStatus.active.value,
-                    to_iso(started_at),
-                    to_iso(ends_at),
-                    to_iso(next_window_at),
-                    json.dumps(config),
-                ),
-            )
-        session = self.get_session(session_id)
-        if session is None:
-            raise RuntimeError("failed to create session")
-        return session
+        self._execute(
+            """
+            INSERT INTO sessions (id, profile_name, status, started_at, ends_at, next_window_at, window_index, config_json)
+            VALUES (?, ?, ?, ?, ?, ?, 0, ?)
+            """,
+            (
+                session_id,
+                profile_name,
+                SessionStatus.active.value,
+                to_iso(started_at),
+                to_iso(ends_at),
+                to_iso(next_window_at),
+                json.dumps(config),
+            ),
+        )
+        return SessionRecord(
+            id=session_id,
+            profile_name=profile_name,
+            status=SessionStatus.active,
+            started_at=started_at,
+            ends_at=ends_at,
+            next_window_at=next_window_at,
+            window_index=0,
+            config=config,
+        )
 
     def get_session(self, session_id: str) -> SessionRecord | None:
         with self._connect() as conn:
@@ -127,26 +143,53 @@ class SimulatorRepository:
             ).fetchall()
         return [self._row_to_session(row) for row in rows]
 
-    def advance_session_window(self, session_id: str, next_window_at: datetime, window_index: int) -> None:
+    def list_session_summaries(
+        self,
+        status: SessionStatus = SessionStatus.active,
+    ) -> list[SessionSummary]:
         with self._connect() as conn:
-            conn.execute(
-                "UPDATE sessions SET next_window_at = ?, window_index = ? WHERE id = ?",
-                (to_iso(next_window_at), window_index, session_id),
+            rows = conn.execute(
+                """
+                SELECT
+                    s.*,
+                    COUNT(t.status) AS ticket_count,
+                    COALESCE(SUM(t.status = ?), 0) AS open_ticket_count,
+                    COALESCE(SUM(t.status = ?), 0) AS closed_ticket_count
+                FROM sessions AS s
+                LEFT JOIN tickets AS t ON t.session_id = s.id
+                WHERE s.status = ?
+                GROUP BY s.id
+                ORDER BY s.started_at ASC
+                """,
+                (TicketStatus.open.value, TicketStatus.closed.value, status.value),
+            ).fetchall()
+        return [
+            SessionSummary(
+                **self._row_to_session(row).model_dump(),
+                ticket_count=row["ticket_count"],
+                open_ticket_count=row["open_ticket_count"],
+                closed_ticket_count=row["closed_ticket_count"],
             )
+            for row in rows
+        ]
+
+    def advance_session_window(self, session_id: str, next_window_at: datetime, window_index: int) -> None:
+        self._execute(
+            "UPDATE sessions SET next_window_at = ?, window_index = ? WHERE id = ?",
+            (to_iso(next_window_at), window_index, session_id),
+        )
 
     def update_session_config(self, session_id: str, config: dict[str, Any]) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                "UPDATE sessions SET config_json = ? WHERE id = ?",
-                (json.dumps(config), session_id),
-            )
+        self._execute(
+            "UPDATE sessions SET config_json = ? WHERE id = ?",
+            (json.dumps(config), session_id),
+        )
 
     def complete_session(self, session_id: str) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                "UPDATE sessions SET status = ? WHERE id = ?",
-                (SessionStatus.completed.value, session_id),
-            )
+        self._execute(
+            "UPDATE sessions SET status = ? WHERE id = ?",
+            (SessionStatus.completed.value, session_id),
+        )
 
     def create_ticket(
         self,
@@ -159,33 +202,44 @@ class SimulatorRepository:
         zammad_ticket_id: int | None,
     ) -> TicketRecord:
         ticket_id = str(uuid.uuid4())
-        now = utc_now()
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO tickets (
-                    id, session_id, zammad_ticket_id, subject, tier, priority, status,
-                    scenario_id, hidden_truth_json, created_at, updated_at, score_json, last_seen_article_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 0)
-                """,
-                (
-                    ticket_id,
-                    session_id,
-                    zammad_ticket_id,
-                    subject,
-                    tier,
-                    priority,
-                    TicketStatus.open.value,
-                    scenario_id,
-                    json.dumps(hidden_truth),
-                    to_iso(now),
-                    to_iso(now),
-                ),
-            )
-        record = self.get_ticket(ticket_id)
-        if record is None:
-            raise RuntimeError("failed to create ticket")
-        return record
+        now = self._clock()
+        self._execute(
+            """
+            INSERT INTO tickets (
+                id, session_id, zammad_ticket_id, subject, tier, priority, status,
+                scenario_id, hidden_truth_json, created_at, updated_at, score_json, last_seen_article_id,
+                next_poll_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 0, ?)
+            """,
+            (
+                ticket_id,
+                session_id,
+                zammad_ticket_id,
+                subject,
+                tier,
+                priority,
+                TicketStatus.open.value,
+                scenario_id,
+                json.dumps(hidden_truth),
+                to_iso(now),
+                to_iso(now),
+                to_iso(now),
+            ),
+        )
+        return TicketRecord(
+            id=ticket_id,
+            session_id=session_id,
+            zammad_ticket_id=zammad_ticket_id,
+            subject=subject,
+            tier=tier,
+            priority=priority,
+            status=TicketStatus.open,
+            scenario_id=scenario_id,
+            hidden_truth=hidden_truth,
+            created_at=now,
+            updated_at=now,
+            next_poll_at=now,
+        )
 
     def get_ticket(self, ticket_id: str) -> TicketRecord | None:
         with self._connect() as conn:
@@ -200,84 +254,215 @@ class SimulatorRepository:
             ).fetchall()
         return [self._row_to_ticket(row) for row in rows]
 
-    def list_tickets_for_session(self, session_id: str) -> list[TicketRecord]:
+    def list_pollable_tickets(
+        self,
+        zammad_ticket_ids: Collection[int] | None = None,
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> list[TicketRecord]:
+        """Open Zammad-linked tickets oldest first, optionally one keyset page at a time.
+
+        ``after`` is a cursor from ``encode_cursor`` for the last ticket already seen.
+        """
+        # The literal predicate must match the partial index idx_tickets_pollable.
+        sql = "SELECT * FROM tickets WHERE status = 'open' AND zammad_ticket_id IS NOT NULL"
+        params: tuple[Any, ...] = ()
+        if zammad_ticket_ids is not None:
+            ids = sorted(set(zammad_ticket_ids))
+            if not ids:
+                return []
+            sql += f" AND zammad_ticket_id IN ({', '.join('?' for _ in ids)})"
+            params += tuple(ids)
+        sql, params = _keyset_page(sql, params, limit=limit, after=after)
         with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM tickets WHERE session_id = ? ORDER BY created_at ASC",
-                (session_id,),
-            ).fetchall()
+            rows = conn.execute(sql, params).fetchall()
         return [self._row_to_ticket(row) for row in rows]
 
-    def update_ticket_last_seen_article_id(self, ticket_id: str, article_id: int) -> None:
+    def list_pollable_zammad_ids(self, zammad_ticket_ids: Collection[int]) -> set[int]:
+        """The ids in ``zammad_ticket_ids`` that belong to open simulator tickets."""
+        ids = sorted(set(zammad_ticket_ids))
+        if not ids:
+            return set()
         with self._connect() as conn:
-            conn.execute(
-                "UPDATE tickets SET last_seen_article_id = ?, updated_at = ? WHERE id = ?",
-                (article_id, to_iso(utc_now()), ticket_id),
-            )
+            rows = conn.execute(
+                "SELECT zammad_ticket_id FROM tickets"
+                " WHERE status = 'open' AND zammad_ticket_id IS NOT NULL"
+                f" AND zammad_ticket_id IN ({', '.join('?' for _ in ids)})",
+                ids,
+            ).fetchall()
+        return {int(row[0]) for row in rows}
 
-    def update_ticket_hidden_truth(self, ticket_id: str, hidden_truth: dict[str, Any]) -> None:
+    def count_pollable_tickets(self) -> int:
         with self._connect() as conn:
-            conn.execute(
-                "UPDATE tickets SET hidden_truth_json = ?, updated_at = ? WHERE id = ?",
-                (json.dumps(hidden_truth), to_iso(utc_now()), ticket_id),
-            )
+            row = conn.execute(
+                "SELECT COUNT(*) FROM tickets"
+                " WHERE status = 'open' AND zammad_ticket_id IS NOT NULL"
+            ).fetchone()
+        return int(row[0])
+
+    def list_due_tickets(self, now: datetime, limit: int | None = None) -> list[TicketRecord]:
+        """Pollable tickets whose ``next_poll_at`` has passed, most overdue first."""
+        sql = """
+            SELECT * FROM tickets
+            WHERE status = 'open' AND zammad_ticket_id IS NOT NULL AND next_poll_at <= ?
+            ORDER BY next_poll_at ASC
+        """
+        params: tuple[Any, ...] = (to_iso(now),)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_ticket(row) for row in rows]
 
-    def close_ticket(self, ticket_id: str, score: dict[str, Any]) -> None:
-        now = utc_now()
+    def count_due_tickets(self, now: datetime) -> int:
         with self._connect() as conn:
-            conn.execute(
+            row = conn.execute(
                 """
-                UPDATE tickets
-                SET status = ?, score_json = ?, updated_at = ?, closed_at = ?
-                WHERE id = ?
+                SELECT COUNT(*) FROM tickets
+                WHERE status = 'open' AND zammad_ticket_id IS NOT NULL AND next_poll_at <= ?
                 """,
-                (
-                    TicketStatus.closed.value,
-                    json.dumps(score),
-                    to_iso(now),
-                    to_iso(now),
-                    ticket_id,
-                ),
-            )
+                (to_iso(now),),
+            ).fetchone()
+        return int(row[0])
+
+    def schedule_ticket_polls(self, schedule: list[tuple[str, datetime, float]]) -> None:
+        """Store ``(ticket_id, next_poll_at, poll_interval_seconds)`` for each ticket.
+
+        Poll bookkeeping only: ``updated_at`` is left alone so the change feed
+        does not report tickets that merely got polled.
+        """
+        if not schedule:
+            return
+        rows = [
+            (to_iso(next_poll_at), interval, ticket_id)
+            for ticket_id, next_poll_at, interval in schedule
+        ]
+        self._write(
+            lambda conn: conn.executemany(
+                "UPDATE tickets SET next_poll_at = ?, poll_interval_seconds = ? WHERE id = ?",
+                rows,
+            ).rowcount
+        )
 
-    def close_open_tickets_for_session(self, session_id: str, score: dict[str, Any]) -> int:
-        now = utc_now()
+    def list_tickets_for_session(
+        self,
+        session_id: str,
+        limit: int | None = None,
+        after: str | None = None,
+        include_hidden_truth: bool = True,
+    ) -> list[TicketRecord]:
+        """List a session's tickets oldest first, optionally one keyset page at a time.
+
+        ``after`` is a cursor from ``encode_cursor`` for the last ticket of the previous
+        page. Without ``include_hidden_truth`` the JSON blob is neither read nor decoded
+        and the returned records carry an empty ``hidden_truth``.
+        """
+        columns = "*" if include_hidden_truth else _TICKET_LIST_COLUMNS
+        sql, params = _keyset_page(
+            f"SELECT {columns} FROM tickets WHERE session_id = ?",
+            (session_id,),
+            limit=limit,
+            after=after,
+        )
         with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT id FROM tickets WHERE session_id = ? AND status = ?",
-                (session_id, TicketStatus.open.value),
-            ).fetchall()
-            ticket_ids = [str(row["id"]) for row in rows]
-            if not ticket_ids:
-                return 0
+            rows = conn.execute(sql, params).fetchall()
+        return [self._row_to_ticket(row, include_hidden_truth) for row in rows]
 
-            conn.executemany(
+    def list_session_changes(
+        self,
+        session_id: str,
+        since: datetime,
+        include_hidden_truth: bool = False,
+    ) -> tuple[list[TicketRecord], list[InteractionRecord]]:
+        """Tickets of a session updated after ``since`` and their new interactions.
+
+        Adding an interaction bumps its ticket's ``updated_at``, so interactions are
+        only looked up under the changed tickets and the cost follows the number of
+        changes, not the size of the session.
+        """
+        since_iso = to_iso(since)
+        columns = "*" if include_hidden_truth else _TICKET_LIST_COLUMNS
+        with self._connect() as conn:
+            ticket_rows = conn.execute(
+                f"""
+                SELECT {columns} FROM tickets
+                WHERE session_id = ? AND updated_at > ?
+                ORDER BY updated_at ASC
+                """,
+                (session_id, since_iso),
+            ).fetchall()
+            interaction_rows = conn.execute(
                 """
-                UPDATE tickets
-                SET status = ?, score_json = ?, updated_at = ?, closed_at = ?
-                WHERE id = ?
+                SELECT i.* FROM tickets AS t
+                JOIN interactions AS i ON i.ticket_id = t.id AND i.created_at > ?
+                WHERE t.session_id = ? AND t.updated_at > ?
+                ORDER BY i.created_at ASC, i.id ASC
                 """,
-                [
-                    (
-                        TicketStatus.closed.value,
-                        json.dumps(score),
-                        to_iso(now),
-                        to_iso(now),
-                        ticket_id,
-                    )
-                    for ticket_id in ticket_ids
-                ],
-            )
-        return len(ticket_ids)
+                (since_iso, session_id, since_iso),
+            ).fetchall()
+        tickets = [self._row_to_ticket(row, include_hidden_truth) for row in ticket_rows]
+        interactions = [self._row_to_interaction(row) for row in interaction_rows]
+        return tickets, interactions
+
+    def update_ticket_last_seen_article_id(self, ticket_id: str, article_id: int) -> None:
+        self._execute(
+            "UPDATE tickets SET last_seen_article_id = ?, updated_at = ? WHERE id = ?",
+            (article_id, to_iso(self._clock()), ticket_id),
+        )
+
+    def update_ticket_hidden_truth(self, ticket_id: str, hidden_truth: dict[str, Any]) -> None:
+        self._execute(
+            "UPDATE tickets SET hidden_truth_json = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(hidden_truth), to_iso(self._clock()), ticket_id),
+        )
+
+    def close_ticket(self, ticket_id: str, score: dict[str, Any]) -> None:
+        now = self._clock()
+        self._execute(
+            """
+            UPDATE tickets
+            SET status = ?, score_json = ?, updated_at = ?, closed_at = ?
+            WHERE id = ?
+            """,
+            (
+                TicketStatus.closed.value,
+                json.dumps(score),
+                to_iso(now),
+                to_iso(now),
+                ticket_id,
+            ),
+        )
+
+    def close_open_tickets_for_session(self, session_id: str, score: dict[str, Any]) -> int:
+        now = self._clock()
+        return self._execute(
+            """
+            UPDATE tickets
+            SET status = ?, score_json = ?, updated_at = ?, closed_at = ?
+            WHERE session_id = ? AND status = ?
+            """,
+            (
+                TicketStatus.closed.value,
+                json.dumps(score),
+                to_iso(now),
+                to_iso(now),
+                session_id,
+                TicketStatus.open.value,
+            ),
+        )
 
     def delete_ticket(self, ticket_id: str) -> bool:
-        with self._connect() as conn:
+        def op(conn: sqlite3.Connection) -> int:
             conn.execute("DELETE FROM interactions WHERE ticket_id = ?", (ticket_id,))
-            cursor = conn.execute("DELETE FROM tickets WHERE id = ?", (ticket_id,))
-        return cursor.rowcount > 0
+            conn.execute("DELETE FROM processed_articles WHERE ticket_id = ?", (ticket_id,))
+            conn.execute("DELETE FROM outbox WHERE ticket_id = ?", (ticket_id,))
+            return conn.execute("DELETE FROM tickets WHERE id = ?", (ticket_id,)).rowcount
+
+        return self._write(op) > 0
 
     def delete_tickets_for_session(self, session_id: str) -> int:
-        with self._connect() as conn:
+        def op(conn: sqlite3.Connection) -> int:
             conn.execute(
                 """
                 DELETE FROM interactions
@@ -287,8 +472,20 @@ class SimulatorRepository:
                 """,
                 (session_id,),
             )
+            for table in ("processed_articles", "outbox"):
+                conn.execute(
+                    f"""
+                    DELETE FROM {table}
+                    WHERE ticket_id IN (
+                        SELECT id FROM tickets WHERE session_id = ?
+                    )
+                    """,
+                    (session_id,),
+                )
             cursor = conn.execute("DELETE FROM tickets WHERE session_id = ?", (session_id,))
-        return int(cursor.rowcount or 0)
+            return int(cursor.rowcount or 0)
+
+        return self._write(op)
 
     def add_interaction(
         self,
@@ -298,8 +495,9 @@ class SimulatorRepository:
         metadata: dict[str, Any] | None = None,
     ) -> InteractionRecord:
         interaction_id = str(uuid.uuid4())
-        now = utc_now()
-        with self._connect() as conn:
+        now = self._clock()
+
+        def op(conn: sqlite3.Connection) -> None:
             conn.execute(
                 """
                 INSERT INTO interactions (id, ticket_id, actor, body, created_at, metadata_json)
@@ -318,6 +516,8 @@ class SimulatorRepository:
                 "UPDATE tickets SET updated_at = ? WHERE id = ?",
                 (to_iso(now), ticket_id),
             )
+
+        self._write(op)
         return InteractionRecord(
             id=interaction_id,
             ticket_id=ticket_id,
@@ -327,12 +527,20 @@ class SimulatorRepository:
             metadata=metadata or {},
         )
 
-    def list_interactions(self, ticket_id: str) -> list[InteractionRecord]:
+    def list_interactions(
+        self,
+        ticket_id: str,
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> list[InteractionRecord]:
+        sql, params = _keyset_page(
+            "SELECT * FROM interactions WHERE ticket_id = ?",
+            (ticket_id,),
+            limit=limit,
+            after=after,
+        )
         with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM interactions WHERE ticket_id = ? ORDER BY created_at ASC",
-                (ticket_id,),
-            ).fetchall()
+            rows = conn.execute(sql, params).fetchall()
         return [self._row_to_interaction(row) for row in rows]
 
     def list_closed_tickets_between(self, start: datetime, end: datetime) -> list[TicketRecord]:
@@ -355,22 +563,21 @@ class SimulatorRepository:
         payload: dict[str, Any],
     ) -> ReportRecord:
         report_id = str(uuid.uuid4())
-        now = utc_now()
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO reports (id, report_type, period_start, period_end, payload_json, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    report_id,
-                    report_type,
-                    to_iso(period_start),
-                    to_iso(period_end),
-                    json.dumps(payload),
-                    to_iso(now),
-                ),
-            )
+        now = self._clock()
+        self._execute(
+            """
+            INSERT INTO reports (id, report_type, period_start, period_end, payload_json, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                report_id,
+                report_type,
+                to_iso(period_start),
+                to_iso(period_end),
+                json.dumps(payload),
+                to_iso(now),
+            ),
+        )
         return ReportRecord(
             id=report_id,
             report_type=report_type,
@@ -388,11 +595,265 @@ class SimulatorRepository:
             ).fetchone()
         return self._row_to_report(row) if row else None
 
-    def _connect(self) -> sqlite3.Connection:
-        with self._lock:
-            conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def list_customer_directory(self) -> list[CustomerDirectoryEntry]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM customer_directory").fetchall()
+        return [
+            CustomerDirectoryEntry(
+                kind=row["kind"],
+                key=row["key"],
+                email=row["email"],
+                refreshed_at=from_iso(row["refreshed_at"]),
+            )
+            for row in rows
+        ]
+
+    def save_customer_directory_entry(self, entry: CustomerDirectoryEntry) -> None:
+        self._execute(
+            """
+            INSERT INTO customer_directory (kind, key, email, refreshed_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (kind, key) DO UPDATE
+            SET email = excluded.email, refreshed_at = excluded.refreshed_at
+            """,
+            (entry.kind, entry.key, entry.email, to_iso(entry.refreshed_at)),
+        )
+
+    def record_processed_article(
+        self, ticket_id: str, zammad_article_id: int, replied: bool
+    ) -> bool:
+        """Add an article to the processed ledger; False if it was already there.
+
+        Call it inside the transaction that stores the article's interactions, so the
+        ledger and the conversation always agree.
+        """
+        return (
+            self._execute(
+                """
+                INSERT OR IGNORE INTO processed_articles
+                    (ticket_id, zammad_article_id, replied, processed_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (ticket_id, zammad_article_id, int(replied), to_iso(self._clock())),
+            )
+            > 0
+        )
+
+    def mark_article_replied(self, ticket_id: str, zammad_article_id: int) -> None:
+        self._execute(
+            """
+            UPDATE processed_articles SET replied = 1
+            WHERE ticket_id = ? AND zammad_article_id = ?
+            """,
+            (ticket_id, zammad_article_id),
+        )
+
+    def processed_article_ids(
+        self, ticket_id: str, zammad_article_ids: Collection[int]
+    ) -> set[int]:
+        """Return which of ``zammad_article_ids`` are already in the processed ledger."""
+        if not zammad_article_ids:
+            return set()
+        ids = list(zammad_article_ids)
+        placeholders = ", ".join("?" for _ in ids)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT zammad_article_id FROM processed_articles
+                WHERE ticket_id = ? AND zammad_article_id IN ({placeholders})
+                """,
+                (ticket_id, *ids),
+            ).fetchall()
+        return {int(row["zammad_article_id"]) for row in rows}
+
+    def link_zammad_ticket(self, ticket_id: str, zammad_ticket_id: int) -> None:
+        """Attach the Zammad id once the outbox has created the ticket; it is due at once."""
+        now = to_iso(self._clock())
+        self._execute(
+            """
+            UPDATE tickets SET zammad_ticket_id = ?, updated_at = ?, next_poll_at = ?
+            WHERE id = ?
+            """,
+            (zammad_ticket_id, now, now, ticket_id),
+        )
+
+    def add_outbox_entry(
+        self,
+        ticket_id: str,
+        action: str,
+        payload: dict[str, Any],
+    ) -> OutboxEntry:
+        now = self._clock()
+        idempotency_key = uuid.uuid4().hex
+
+        def op(conn: sqlite3.Connection) -> int:
+            cursor = conn.execute(
+                """
+                INSERT INTO outbox (
+                    ticket_id, action, payload_json, idempotency_key, status,
+                    attempts, next_attempt_at, created_at
+                ) VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+                """,
+                (
+                    ticket_id,
+                    action,
+                    json.dumps(payload),
+                    idempotency_key,
+                    OutboxStatus.pending.value,
+                    to_iso(now),
+                    to_iso(now),
+                ),
+            )
+            return int(cursor.lastrowid or 0)
+
+        return OutboxEntry(
+            id=self._write(op),
+            ticket_id=ticket_id,
+            action=action,
+            payload=payload,
+            idempotency_key=idempotency_key,
+            status=OutboxStatus.pending,
+            next_attempt_at=now,
+            created_at=now,
+        )
+
+    def list_due_outbox(self, now: datetime, limit: int) -> list[OutboxEntry]:
+        """Pending entries due by ``now``, oldest first.
+
+        An entry waits while an older pending entry for the same ticket exists, so a
+        ticket's writes reach Zammad in the order they were committed.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT * FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM outbox AS earlier
+                      WHERE earlier.ticket_id = outbox.ticket_id
+                        AND earlier.status = 'pending'
+                        AND earlier.id < outbox.id
+                  )
+                ORDER BY id ASC
+                LIMIT ?
+                """,
+                (to_iso(now), limit),
+            ).fetchall()
+        return [self._row_to_outbox(row) for row in rows]
+
+    def delete_outbox_entry(self, entry_id: int) -> None:
+        self._execute("DELETE FROM outbox WHERE id = ?", (entry_id,))
+
+    def claim_outbox_entry(self, entry_id: int) -> None:
+        """Count a delivery attempt before it is sent, so a crash mid-send is remembered."""
+        self._execute("UPDATE outbox SET attempts = attempts + 1 WHERE id = ?", (entry_id,))
+
+    def reschedule_outbox_entry(
+        self,
+        entry_id: int,
+        attempts: int,
+        next_attempt_at: datetime,
+        error: str,
+        failed: bool = False,
+    ) -> None:
+        status = OutboxStatus.failed if failed else OutboxStatus.pending
+        self._execute(
+            """
+            UPDATE outbox
+            SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+            WHERE id = ?
+            """,
+            (status.value, attempts, to_iso(next_attempt_at), error, entry_id),
+        )
+
+    def outbox_counts(self) -> dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS total FROM outbox GROUP BY status"
+            ).fetchall()
+        counts = {status.value: 0 for status in OutboxStatus}
+        counts.update({row["status"]: int(row["total"]) for row in rows})
+        return counts
+
+    def get_poller_state(self, key: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM poller_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_poller_state(self, key: str, value: str) -> None:
+        self._execute(
+            """
+            INSERT INTO poller_state (key, value, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE
+            SET value = excluded.value, updated_at = excluded.updated_at
+            """,
+            (key, value, to_iso(self._clock())),
+        )
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._pool.close()
+
+    def submit_write(self, op: Callable[[sqlite3.Connection], T]) -> Future[T]:
+        """Queue a write and return a future that resolves once it is committed."""
+        active = getattr(self._local, "conn", None)
+        if active is None and self._writer is not None and not self._writer.closed:
+            return self._writer.submit(op)
+
+        future: Future[T] = Future()
+        try:
+            future.set_result(self._write(op))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group repository calls made on this thread into a single atomic commit.
+
+        Nested calls join the outer transaction. The write lock is taken up front so
+        read-modify-write sequences inside the block cannot interleave with other writers.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+
+        if self._writer is not None and not self._writer.closed:
+            connection = self._writer.lease()
+        else:
+            connection = self._pool.connection()
+
+        with connection as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                with conn:
+                    yield
+            finally:
+                self._local.conn = None
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> int:
+        return self._write(lambda conn: conn.execute(sql, params).rowcount)
+
+    def _write(self, op: Callable[[sqlite3.Connection], T]) -> T:
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            return op(active)
+        if self._writer is not None and not self._writer.closed:
+            return self._writer.submit(op).result()
+        with self._pool.connection() as conn, conn:
+            return op(conn)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        active = getattr(self._local, "conn", None)
+        if active is not None:
+            yield active
+            return
+        with self._pool.connection() as conn, conn:
+            yield conn
 
     @staticmethod
     def _row_to_session(row: sqlite3.Row) -> SessionRecord:
@@ -408,7 +869,7 @@ class SimulatorRepository:
         )
 
     @staticmethod
-    def _row_to_ticket(row: sqlite3.Row) -> TicketRecord:
+    def _row_to_ticket(row: sqlite3.Row, include_hidden_truth: bool = True) -> TicketRecord:
         score_json = json.loads(row["score_json"]) if row["score_json"] else None
         return TicketRecord(
             id=row["id"],
@@ -419,12 +880,14 @@ class SimulatorRepository:
             priority=row["priority"],
             status=row["status"],
             scenario_id=row["scenario_id"],
-            hidden_truth=json.loads(row["hidden_truth_json"]),
+            hidden_truth=json.loads(row["hidden_truth_json"]) if include_hidden_truth else {},
             score=score_json,
             created_at=from_iso(row["created_at"]),
             updated_at=from_iso(row["updated_at"]),
             closed_at=from_iso(row["closed_at"]) if row["closed_at"] else None,
             last_seen_article_id=row["last_seen_article_id"],
+            next_poll_at=from_iso(row["next_poll_at"]) if row["next_poll_at"] else None,
+            poll_interval_seconds=row["poll_interval_seconds"],
         )
 
     @staticmethod
@@ -438,6 +901,21 @@ class SimulatorRepository:
             metadata=json.loads(row["metadata_json"] or "{}"),
         )
 
+    @staticmethod
+    def _row_to_outbox(row: sqlite3.Row) -> OutboxEntry:
+        return OutboxEntry(
+            id=row["id"],
+            ticket_id=row["ticket_id"],
+            action=row["action"],
+            payload=json.loads(row["payload_json"]),
+            idempotency_key=row["idempotency_key"],
+            status=OutboxStatus(row["status"]),
+            attempts=row["attempts"],
+            next_attempt_at=from_iso(row["next_attempt_at"]),
+            last_error=row["last_error"],
+            created_at=from_iso(row["created_at"]),
+        )
+
     @staticmethod
     def _row_to_report(row: sqlite3.Row) -> ReportRecord:
         return ReportRecord(
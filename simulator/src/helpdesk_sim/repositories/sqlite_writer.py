@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteOp = Callable[[sqlite3.Connection], Any]
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    op: WriteOp
+    future: Future
+
+
+@dataclass(slots=True)
+class _Lease:
+    granted: threading.Event = field(default_factory=threading.Event)
+    released: threading.Event = field(default_factory=threading.Event)
+    conn: sqlite3.Connection | None = None
+
+
+_STOP = object()
+
+
+class SqliteWriteQueue:
+    """Funnels every write through one thread and group-commits them.
+
+    Every write already queued when the writer wakes up is committed together in a
+    single transaction, so batches grow naturally while a previous commit is in
+    flight. A positive ``batch_window_ms`` additionally lingers to collect more
+    writes before committing. Each write runs inside its own
+    savepoint, so one failing write does not discard the rest of the batch.
+    Futures resolve only after the commit, which keeps read-your-writes semantics
+    for callers that wait on them.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], sqlite3.Connection],
+        max_pending: int = 1024,
+        batch_window_ms: float = 0.0,
+        max_batch: int = 256,
+    ) -> None:
+        self._connection_factory = connection_factory
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=max(max_pending, 1))
+        self.batch_window_seconds = max(batch_window_ms, 0.0) / 1000
+        self.max_batch = max(max_batch, 1)
+        self.batches_committed = 0
+        self.writes_committed = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, op: Callable[[sqlite3.Connection], T]) -> Future[T]:
+        if self._closed:
+            raise RuntimeError("write queue is closed")
+        future: Future[T] = Future()
+        self._queue.put(_PendingWrite(op=op, future=future))
+        return future
+
+    @contextmanager
+    def lease(self) -> Iterator[sqlite3.Connection]:
+        """Borrow the writer connection for a caller-driven transaction.
+
+        Queued writes ahead of the lease are committed first; writes submitted while
+        the lease is held wait until it is released.
+        """
+        if self._closed:
+            raise RuntimeError("write queue is closed")
+        lease = _Lease()
+        self._queue.put(lease)
+        lease.granted.wait()
+        try:
+            assert lease.conn is not None
+            yield lease.conn
+        finally:
+            lease.released.set()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn = self._connection_factory()
+        try:
+            pending: object | None = None
+            while True:
+                item = pending if pending is not None else self._queue.get()
+                pending = None
+                if item is _STOP:
+                    return
+                if isinstance(item, _Lease):
+                    self._serve_lease(conn, item)
+                    continue
+
+                batch = [item]
+                pending = self._collect(batch)
+                self._commit(conn, batch)
+        finally:
+            conn.close()
+
+    def _collect(self, batch: list) -> object | None:
+        deadline = time.monotonic() + self.batch_window_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                return None
+            if not isinstance(item, _PendingWrite):
+                return item
+            batch.append(item)
+        return None
+
+    def _commit(self, conn: sqlite3.Connection, batch: list[_PendingWrite]) -> None:
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for write in batch:
+                if not write.future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT queued_write")
+                try:
+                    result = write.op(conn)
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO queued_write")
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((write.future, None, exc))
+                else:
+                    conn.execute("RELEASE queued_write")
+                    outcomes.append((write.future, result, None))
+            conn.commit()
+        except Exception as exc:
+            logger.exception("group commit of %s write(s) failed: %s", len(batch), exc)
+            if conn.in_transaction:
+                conn.rollback()
+            for write in batch:
+                if not write.future.done():
+                    write.future.set_exception(exc)
+            return
+
+        self.batches_committed += 1
+        self.writes_committed += len(outcomes)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    def _serve_lease(conn: sqlite3.Connection, lease: _Lease) -> None:
+        lease.conn = conn
+        lease.granted.set()
+        lease.released.wait()
+        if conn.in_transaction:
+            conn.rollback()
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Awaitable, Callable, Iterable
 
+from helpdesk_sim.adapters.gateway import AsyncZammadGateway, ZammadGateway
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.services.outbox_dispatcher import OutboxDispatcher
 from helpdesk_sim.services.poller_service import PollerService
 from helpdesk_sim.services.scheduler_service import SchedulerService
 
@@ -12,24 +16,50 @@ logger = logging.getLogger(__name__)
 class BackgroundWorkers:
     def __init__(
         self,
+        repository: SimulatorRepository,
+        zammad_gateway: ZammadGateway,
         scheduler_service: SchedulerService,
         poller_service: PollerService,
         scheduler_interval_seconds: int,
         poll_interval_seconds: int,
+        cache_refresh_interval_seconds: int = 300,
+        async_zammad_gateway: AsyncZammadGateway | None = None,
+        outbox_dispatcher: OutboxDispatcher | None = None,
+        outbox_interval_seconds: float = 2.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
     ) -> None:
+        self.repository = repository
+        self.zammad_gateway = zammad_gateway
+        self.async_zammad_gateway = async_zammad_gateway
         self.scheduler_service = scheduler_service
         self.poller_service = poller_service
         self.scheduler_interval_seconds = scheduler_interval_seconds
         self.poll_interval_seconds = poll_interval_seconds
+        self.cache_refresh_interval_seconds = cache_refresh_interval_seconds
+        self.outbox_dispatcher = outbox_dispatcher
+        self.outbox_interval_seconds = outbox_interval_seconds
+        # Waits between scheduler and poller ticks; SimulationClock.sleep scales them
+        # to the simulated time rate. Other loops track real-world Zammad time.
+        self._sleep = sleep
         self._tasks: list[asyncio.Task] = []
         self._scheduler_lock = asyncio.Lock()
         self._poller_lock = asyncio.Lock()
+        # Zammad ticket ids named by webhooks, waiting for the webhook loop.
+        self._pending_tickets: set[int] = set()
+        self._pending_wakeup = asyncio.Event()
+        self._outbox_lock = asyncio.Lock()
+        # Set after work that may have queued Zammad writes, so they go out promptly.
+        self._outbox_wakeup = asyncio.Event()
 
     def start(self) -> None:
         self._tasks = [
+            asyncio.create_task(self._cache_refresh_loop(), name="gateway-cache-refresh"),
             asyncio.create_task(self._scheduler_loop(), name="scheduler-loop"),
             asyncio.create_task(self._poller_loop(), name="poller-loop"),
+            asyncio.create_task(self._webhook_loop(), name="webhook-loop"),
         ]
+        if self.outbox_dispatcher is not None:
+            self._tasks.append(asyncio.create_task(self._outbox_loop(), name="outbox-loop"))
 
     async def stop(self) -> None:
         for task in self._tasks:
@@ -40,14 +70,71 @@ class BackgroundWorkers:
             except asyncio.CancelledError:
                 pass
         self._tasks = []
+        if self.async_zammad_gateway is not None:
+            await self.async_zammad_gateway.aclose()
+        self.zammad_gateway.close()
+        self.repository.close()
 
     async def run_scheduler_once(self) -> dict[str, int]:
         async with self._scheduler_lock:
-            return await asyncio.to_thread(self.scheduler_service.tick)
+            stats = await asyncio.to_thread(self.scheduler_service.tick)
+        self._outbox_wakeup.set()
+        return stats
 
     async def run_poller_once(self) -> dict[str, int]:
         async with self._poller_lock:
-            return await asyncio.to_thread(self.poller_service.tick)
+            stats = await self.poller_service.tick_async()
+        self._outbox_wakeup.set()
+        return stats
+
+    async def run_outbox_once(self) -> dict[str, int]:
+        self._outbox_wakeup.clear()
+        if self.outbox_dispatcher is None:
+            return {"delivered": 0, "retried": 0, "failed": 0, "pending": 0}
+        async with self._outbox_lock:
+            return await asyncio.to_thread(self.outbox_dispatcher.dispatch_once)
+
+    async def run_ticks_once(self) -> dict[str, dict[str, int]]:
+        """One scheduler and poller tick, each followed by an outbox delivery pass."""
+        scheduler = await self.run_scheduler_once()
+        created = await self.run_outbox_once()
+        poller = await self.run_poller_once()
+        replied = await self.run_outbox_once()
+        outbox = {key: created[key] + replied[key] for key in ("delivered", "retried", "failed")}
+        outbox["pending"] = replied["pending"]
+        return {"scheduler": scheduler, "poller": poller, "outbox": outbox}
+
+    def enqueue_tickets(self, zammad_ticket_ids: Iterable[int]) -> None:
+        """Queue tickets for immediate processing; call from the event loop thread."""
+        self._pending_tickets.update(zammad_ticket_ids)
+        self._pending_wakeup.set()
+
+    async def run_pending_tickets_once(self) -> dict[str, int]:
+        self._pending_wakeup.clear()
+        pending, self._pending_tickets = self._pending_tickets, set()
+        if not pending:
+            return {
+                "tickets_checked": 0,
+                "tickets_unchanged": 0,
+                "backlog_remaining": 0,
+                "replies_sent": 0,
+                "tickets_closed": 0,
+            }
+        # Shares the poller lock so a sweep and a webhook never reply to the same article.
+        async with self._poller_lock:
+            stats = await self.poller_service.poll_tickets_async(pending)
+        self._outbox_wakeup.set()
+        return stats
+
+    async def _cache_refresh_loop(self) -> None:
+        # The first pass warms the gateway caches at startup; later passes refresh
+        # whatever went stale so ticket creation never waits on a lookup.
+        while True:
+            try:
+                await asyncio.to_thread(self.zammad_gateway.warm_up)
+            except Exception as exc:  # pragma: no cover
+                logger.exception("gateway cache refresh error: %s", exc)
+            await asyncio.sleep(self.cache_refresh_interval_seconds)
 
     async def _scheduler_loop(self) -> None:
         while True:
@@ -55,7 +142,26 @@ class BackgroundWorkers:
                 await self.run_scheduler_once()
             except Exception as exc:  # pragma: no cover
                 logger.exception("scheduler loop error: %s", exc)
-            await asyncio.sleep(self.scheduler_interval_seconds)
+            await self._sleep(self.scheduler_interval_seconds)
+
+    async def _webhook_loop(self) -> None:
+        while True:
+            await self._pending_wakeup.wait()
+            try:
+                await self.run_pending_tickets_once()
+            except Exception as exc:  # pragma: no cover
+                logger.exception("webhook loop error: %s", exc)
+
+    async def _outbox_loop(self) -> None:
+        while True:
+            try:
+                await self.run_outbox_once()
+            except Exception as exc:  # pragma: no cover
+                logger.exception("outbox loop error: %s", exc)
+            try:
+                await asyncio.wait_for(self._outbox_wakeup.wait(), self.outbox_interval_seconds)
+            except TimeoutError:
+                pass
 
     async def _poller_loop(self) -> None:
         while True:
@@ -63,4 +169,4 @@ class BackgroundWorkers:
                 await self.run_poller_once()
             except Exception as exc:  # pragma: no cover
                 logger.exception("poller loop error: %s", exc)
-            await asyncio.sleep(self.poll_interval_seconds)
+            await self._sleep(self.poll_interval_seconds)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from helpdesk_sim.utils import to_iso, utc_now
+
+
+@dataclass(frozen=True, slots=True)
+class SimEvent:
+    id: int
+    type: str
+    session_id: str | None
+    ticket_id: str | None
+    created_at: datetime
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "session_id": self.session_id,
+            "ticket_id": self.ticket_id,
+            "created_at": to_iso(self.created_at),
+            "data": self.data,
+        }
+
+
+# Sent to a subscriber that fell too far behind; it should reload from the REST API.
+RESYNC_EVENT_TYPE = "resync"
+
+
+class Subscription:
+    def __init__(
+        self,
+        bus: EventBus,
+        loop: asyncio.AbstractEventLoop,
+        session_id: str | None,
+        max_pending: int,
+    ) -> None:
+        self._bus = bus
+        self._loop = loop
+        self.session_id = session_id
+        self._queue: asyncio.Queue[SimEvent | None] = asyncio.Queue(maxsize=max_pending)
+        self.closed = False
+
+    def wants(self, event: SimEvent) -> bool:
+        return self.session_id is None or event.session_id in (None, self.session_id)
+
+    async def next(self, timeout: float | None = None) -> SimEvent | None:
+        """Wait for the next event; ``None`` on timeout or once the bus is closed."""
+        if self.closed and self._queue.empty():
+            return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def _offer(self, event: SimEvent | None) -> None:
+        # Runs on the subscriber's event loop.
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            if event is not None:
+                event = SimEvent(
+                    id=event.id,
+                    type=RESYNC_EVENT_TYPE,
+                    session_id=self.session_id,
+                    ticket_id=None,
+                    created_at=event.created_at,
+                )
+        if event is None:
+            self.closed = True
+        self._queue.put_nowait(event)
+
+    def _deliver(self, event: SimEvent | None) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._offer, event)
+        except RuntimeError:
+            # The subscriber's loop is gone; nobody is listening any more.
+            self._bus._unsubscribe(self)
+
+
+class EventBus:
+    """In-process publish/subscribe for simulator events.
+
+    Services publish from any thread (the background workers run them through
+    ``asyncio.to_thread``); subscribers consume on their own event loop. Recent
+    events are kept so reconnecting clients can resume from the last id they saw.
+    """
+
+    def __init__(self, history_size: int = 256, max_pending: int = 512) -> None:
+        self.max_pending = max(max_pending, 1)
+        self._history: deque[SimEvent] = deque(maxlen=max(history_size, 0))
+        self._subscriptions: list[Subscription] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def publish(
+        self,
+        event_type: str,
+        session_id: str | None = None,
+        ticket_id: str | None = None,
+        **data: Any,
+    ) -> SimEvent:
+        with self._lock:
+            event = SimEvent(
+                id=next(self._ids),
+                type=event_type,
+                session_id=session_id,
+                ticket_id=ticket_id,
+                created_at=utc_now(),
+                data=data,
+            )
+            self._history.append(event)
+            subscriptions = [item for item in self._subscriptions if item.wants(event)]
+        for subscription in subscriptions:
+            subscription._deliver(event)
+        return event
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        session_id: str | None = None,
+        last_event_id: int | None = None,
+    ) -> AsyncIterator[Subscription]:
+        subscription = Subscription(
+            bus=self,
+            loop=asyncio.get_running_loop(),
+            session_id=session_id,
+            max_pending=self.max_pending,
+        )
+        with self._lock:
+            if self._closed:
+                subscription.closed = True
+            else:
+                self._subscriptions.append(subscription)
+            backlog = self._recent(last_event_id) if last_event_id is not None else []
+        for event in backlog:
+            if subscription.wants(event):
+                subscription._offer(event)
+        try:
+            yield subscription
+        finally:
+            self._unsubscribe(subscription)
+
+    def recent_events(self, after_id: int = 0) -> list[SimEvent]:
+        with self._lock:
+            return self._recent(after_id)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def close(self) -> None:
+        """Wake every subscriber with an end-of-stream marker."""
+        with self._lock:
+            self._closed = True
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._deliver(None)
+
+    def _recent(self, after_id: int) -> list[SimEvent]:
+        return [event for event in self._history if event.id > after_id]
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime
 
 from helpdesk_sim.domain.models import InteractionRecord, SessionProfile, TicketRecord, TicketScore
+from helpdesk_sim.utils import utc_now
 
 
 class GradingService:
+    def __init__(self, clock: Callable[[], datetime] = utc_now) -> None:
+        # Stands in for closed_at when grading a ticket that is still open.
+        self._clock = clock
+
     def grade_ticket(
         self,
         ticket: TicketRecord,
@@ -89,13 +95,13 @@ class GradingService:
             ],
         }
 
-    @staticmethod
     def _calculate_timing(
+        self,
         ticket: TicketRecord,
         interactions: list[InteractionRecord],
     ) -> dict[str, float]:
         created_at = ticket.created_at
-        closed_at = ticket.closed_at or datetime.now(tz=created_at.tzinfo)
+        closed_at = ticket.closed_at or self._clock()
 
         agent_interactions = [row for row in interactions if row.actor == "agent"]
         first_agent_response = agent_interactions[0].created_at if agent_interactions else closed_at
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+import httpx
+
+from helpdesk_sim.adapters.gateway import ZammadGateway
+from helpdesk_sim.adapters.zammad_resilience import ZammadApiError
+from helpdesk_sim.domain.models import GeneratedTicket, OutboxEntry, TicketStatus
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.services.event_bus import EventBus
+from helpdesk_sim.utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_CREATE_TICKET = "create_ticket"
+OUTBOX_CUSTOMER_REPLY = "customer_reply"
+
+# Client errors Zammad may still accept on a later attempt.
+_RETRYABLE_STATUS_CODES = frozenset({408, 409, 423, 425, 429})
+
+
+def is_retryable(exc: Exception) -> bool:
+    """False for errors a retry cannot fix, such as Zammad rejecting the payload."""
+    if isinstance(exc, ZammadApiError):
+        status = exc.status_code
+    elif isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    else:
+        return True
+    return status >= 500 or status in _RETRYABLE_STATUS_CODES
+
+
+class OutboxDispatcher:
+    """Delivers Zammad writes that services committed to the outbox table.
+
+    Failed deliveries are retried with exponential backoff (``retry_base_seconds``
+    doubling up to ``retry_max_seconds``). Entries are marked failed after
+    ``max_attempts`` tries (0 retries forever) or on an error a retry cannot fix.
+    Every entry carries an idempotency key the gateway attaches to the Zammad
+    article, so a retry after a lost response does not create a second ticket or reply.
+    """
+
+    def __init__(
+        self,
+        repository: SimulatorRepository,
+        zammad_gateway: ZammadGateway,
+        event_bus: EventBus | None = None,
+        batch_size: int = 50,
+        max_attempts: int = 0,
+        retry_base_seconds: float = 5.0,
+        retry_max_seconds: float = 900.0,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
+        self.repository = repository
+        self.zammad_gateway = zammad_gateway
+        self.event_bus = event_bus or EventBus()
+        self.batch_size = max(batch_size, 1)
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = max(retry_max_seconds, retry_base_seconds)
+        self._clock = clock
+
+    def dispatch_once(self) -> dict[str, int]:
+        now = self._clock()
+        delivered = retried = failed = 0
+        for entry in self.repository.list_due_outbox(now, self.batch_size):
+            try:
+                # Claimed before sending: if the process dies after Zammad accepted the
+                # write, the next attempt sees a nonzero count and looks the write up.
+                self.repository.claim_outbox_entry(entry.id)
+                zammad_ticket_id = self._deliver(entry)
+            except Exception as exc:
+                if self._reschedule(entry, exc, now):
+                    retried += 1
+                else:
+                    failed += 1
+                continue
+            self._complete(entry, zammad_ticket_id)
+            delivered += 1
+        counts = self.repository.outbox_counts()
+        return {
+            "delivered": delivered,
+            "retried": retried,
+            "failed": failed,
+            "pending": counts["pending"],
+        }
+
+    def _deliver(self, entry: OutboxEntry) -> int | None:
+        payload = entry.payload
+        if entry.action == OUTBOX_CREATE_TICKET:
+            ticket = self.repository.get_ticket(entry.ticket_id)
+            if ticket is None or ticket.status != TicketStatus.open:
+                # Closed or deleted before Zammad heard of it; nothing left to create.
+                return None
+            existing = None
+            if entry.attempts:
+                # An earlier attempt may have reached Zammad and lost the response.
+                existing = self.zammad_gateway.find_ticket_by_idempotency_key(
+                    entry.idempotency_key
+                )
+            if existing is not None:
+                return existing
+            zammad_ticket_id = self.zammad_gateway.create_ticket(
+                GeneratedTicket.model_validate(payload["ticket"]),
+                idempotency_key=entry.idempotency_key,
+            )
+            if zammad_ticket_id is None:
+                raise RuntimeError("Zammad ticket creation did not return an id")
+            return zammad_ticket_id
+        if entry.action == OUTBOX_CUSTOMER_REPLY:
+            zammad_ticket_id = int(payload["zammad_ticket_id"])
+            if entry.attempts and self.zammad_gateway.find_article_by_idempotency_key(
+                zammad_ticket_id, entry.idempotency_key
+            ) is not None:
+                # An earlier attempt posted the reply and lost the response.
+                return None
+            self.zammad_gateway.post_customer_reply(
+                zammad_ticket_id=zammad_ticket_id,
+                body=str(payload["body"]),
+                subject=str(payload["subject"]),
+                idempotency_key=entry.idempotency_key,
+            )
+            return None
+        raise ValueError(f"unknown outbox action '{entry.action}'")
+
+    def _complete(self, entry: OutboxEntry, zammad_ticket_id: int | None) -> None:
+        with self.repository.transaction():
+            if zammad_ticket_id is not None and entry.action == OUTBOX_CREATE_TICKET:
+                self.repository.link_zammad_ticket(entry.ticket_id, zammad_ticket_id)
+            self.repository.delete_outbox_entry(entry.id)
+        if zammad_ticket_id is not None and entry.action == OUTBOX_CREATE_TICKET:
+            ticket = self.repository.get_ticket(entry.ticket_id)
+            self.event_bus.publish(
+                "ticket.linked",
+                session_id=ticket.session_id if ticket else None,
+                ticket_id=entry.ticket_id,
+                zammad_ticket_id=zammad_ticket_id,
+            )
+
+    def _reschedule(self, entry: OutboxEntry, exc: Exception, now: datetime) -> bool:
+        """Record a failed attempt; True when the entry will be retried."""
+        # The attempt was already counted when the entry was claimed.
+        attempts = entry.attempts + 1
+        retry = is_retryable(exc) and (self.max_attempts <= 0 or attempts < self.max_attempts)
+        delay = min(self.retry_base_seconds * 2 ** min(attempts - 1, 32), self.retry_max_seconds)
+        self.repository.reschedule_outbox_entry(
+            entry.id,
+            attempts=attempts,
+            next_attempt_at=now + timedelta(seconds=delay),
+            error=str(exc) or type(exc).__name__,
+            failed=not retry,
+        )
+        if retry:
+            logger.warning(
+                "Outbox %s for ticket %s failed (attempt %s), retrying in %.0fs: %s",
+                entry.action,
+                entry.ticket_id,
+                attempts,
+                delay,
+                exc,
+            )
+        else:
+            logger.error(
+                "Outbox %s for ticket %s gave up after %s attempts: %s",
+                entry.action,
+                entry.ticket_id,
+                attempts,
+                exc,
+            )
+        return retry
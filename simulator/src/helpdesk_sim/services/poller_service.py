@@ -1,15 +1,70 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Callable, Collection
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 
-from helpdesk_sim.adapters.gateway import ZammadGateway
+from helpdesk_sim.adapters.gateway import (
+    AsyncZammadGateway,
+    ThreadedAsyncGateway,
+    TicketArticle,
+    TicketUpdate,
+    ZammadGateway,
+)
+from helpdesk_sim.domain.models import SessionProfile, TicketRecord
 from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.services.event_bus import EventBus
 from helpdesk_sim.services.grading_service import GradingService
+from helpdesk_sim.services.outbox_dispatcher import OUTBOX_CUSTOMER_REPLY
 from helpdesk_sim.services.response_engine import ResponseEngine
-from helpdesk_sim.domain.models import SessionProfile
+from helpdesk_sim.utils import decode_cursor, encode_cursor, from_iso, to_iso, utc_now
 
 logger = logging.getLogger(__name__)
 
+POLL_MODES = ("full", "changes")
+CHANGE_WATERMARK_KEY = "zammad_change_watermark"
+# Search a little before the watermark: Zammad's search index trails writes slightly,
+# and re-polling a ticket is harmless because articles are filtered by last seen id.
+CHANGE_WATERMARK_OVERLAP = timedelta(seconds=30)
+# Where the last change-driven tick stopped, so the next one starts after it.
+ROUND_ROBIN_CURSOR_KEY = "round_robin_cursor"
+
+
+@dataclass(slots=True)
+class PollOutcome:
+    replies_sent: int = 0
+    closed: bool = False
+    # New agent articles arrived: the conversation is live, so poll again soon.
+    agent_activity: bool = False
+    # Not polled: the tick ran out of budget first.
+    deferred: bool = False
+
+
+# None when the ticket could not be read from Zammad.
+PollResult = PollOutcome | None
+
+
+@dataclass(slots=True)
+class _PollPlan:
+    tickets: list[TicketRecord]
+    unchanged: int = 0
+    # Watermark to store once the tick succeeds; None leaves the stored one alone.
+    next_watermark: datetime | None = None
+    updated_at: dict[int, datetime] = field(default_factory=dict)
+    # Selected but cut off by the tick deadline.
+    deferred: list[TicketRecord] = field(default_factory=list)
+    # Candidates left unread by ``tick_max_tickets``; when a change search picked the
+    # candidates, their Zammad ids too (they hold the watermark back).
+    backlog: int = 0
+    backlog_zammad_ids: list[int] = field(default_factory=list)
+
+
+def _expired(deadline: float | None) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
 
 class PollerService:
     def __init__(
@@ -18,86 +73,560 @@ class PollerService:
         zammad_gateway: ZammadGateway,
         response_engine: ResponseEngine,
         grading_service: GradingService,
+        event_bus: EventBus | None = None,
+        async_gateway: AsyncZammadGateway | None = None,
+        poll_concurrency: int = 16,
+        poll_mode: str = "full",
+        poll_interval_seconds: float = 30.0,
+        hot_poll_interval_seconds: float = 10.0,
+        max_poll_interval_seconds: float = 1800.0,
+        poll_backoff_factor: float = 2.0,
+        tick_budget_seconds: float = 0.0,
+        tick_max_tickets: int = 0,
+        use_outbox: bool = False,
+        clock: Callable[[], datetime] = utc_now,
+        zammad_clock: Callable[[], datetime] = utc_now,
     ) -> None:
+        if poll_mode not in POLL_MODES:
+            raise ValueError(f"unknown poll mode '{poll_mode}'")
         self.repository = repository
         self.zammad_gateway = zammad_gateway
         self.response_engine = response_engine
         self.grading_service = grading_service
+        self.event_bus = event_bus or EventBus()
+        self.async_gateway = async_gateway
+        self.poll_concurrency = poll_concurrency
+        self.poll_mode = poll_mode
+        self.poll_interval_seconds = poll_interval_seconds
+        self.hot_poll_interval_seconds = hot_poll_interval_seconds
+        self.max_poll_interval_seconds = max(max_poll_interval_seconds, poll_interval_seconds)
+        self.poll_backoff_factor = max(poll_backoff_factor, 1.0)
+        # Zero disables the respective budget.
+        self.tick_budget_seconds = tick_budget_seconds
+        self.tick_max_tickets = tick_max_tickets
+        # Commit customer replies to the outbox with the conversation instead of
+        # posting them inline; the OutboxDispatcher delivers them.
+        self.use_outbox = use_outbox
+        self._clock = clock
+        # The change watermark is compared with Zammad's updated_at, which is real
+        # time, so it is stamped from this clock rather than the simulation clock.
+        self._zammad_clock = zammad_clock
 
     def tick(self) -> dict[str, int]:
-        open_tickets = self.repository.list_open_tickets()
-        processed = 0
-        replies_sent = 0
-        closed_count = 0
+        searched_at = self._zammad_clock()
+        started_at = self._clock()
+        watermark = self._load_watermark()
+        changes = None
+        if watermark is not None:
+            try:
+                changes = self.zammad_gateway.search_updated_tickets(
+                    since=watermark - CHANGE_WATERMARK_OVERLAP
+                )
+            except Exception as exc:  # pragma: no cover - network failure path
+                logger.exception("Ticket change search failed, polling all tickets: %s", exc)
+
+        plan = self._plan_poll(started_at, watermark, changes, searched_at)
+        deadline = self._tick_deadline()
+        results = [
+            PollOutcome(deferred=True) if _expired(deadline) else self._poll_ticket(ticket)
+            for ticket in plan.tickets
+        ]
+        results = self._settle(plan, results)
+        self._finish_tick(plan, results)
+        return self._tick_stats(plan, results)
+
+    async def tick_async(self, concurrency: int | None = None) -> dict[str, int]:
+        """Poll open tickets concurrently, at most ``concurrency`` at a time.
+
+        Uses ``async_gateway`` when one is configured, otherwise runs the sync
+        gateway's calls in worker threads. Each ticket is still handled in order
+        (update, replies, grading), so per-ticket behaviour matches ``tick``.
+        """
+        searched_at = self._zammad_clock()
+        started_at = self._clock()
+        gateway = self.async_gateway or ThreadedAsyncGateway(self.zammad_gateway)
+        watermark = await asyncio.to_thread(self._load_watermark)
+        changes = None
+        if watermark is not None:
+            try:
+                changes = await gateway.search_updated_tickets(
+                    since=watermark - CHANGE_WATERMARK_OVERLAP
+                )
+            except Exception as exc:  # pragma: no cover - network failure path
+                logger.exception("Ticket change search failed, polling all tickets: %s", exc)
+
+        plan = await asyncio.to_thread(
+            self._plan_poll, started_at, watermark, changes, searched_at
+        )
+        results = await self._poll_many_async(
+            gateway, plan.tickets, concurrency, deadline=self._tick_deadline()
+        )
+        results = self._settle(plan, results)
+        await asyncio.to_thread(self._finish_tick, plan, results)
+        return self._tick_stats(plan, results)
+
+    async def poll_tickets_async(
+        self,
+        zammad_ticket_ids: Collection[int],
+        concurrency: int | None = None,
+    ) -> dict[str, int]:
+        """Process specific Zammad tickets now, e.g. ones named by a webhook.
 
-        for ticket in open_tickets:
-            if ticket.zammad_ticket_id is None:
+        Ids that are not open simulator tickets are ignored.
+        """
+        tickets = await asyncio.to_thread(self.repository.list_pollable_tickets, zammad_ticket_ids)
+        gateway = self.async_gateway or ThreadedAsyncGateway(self.zammad_gateway)
+        results = await self._poll_many_async(gateway, tickets, concurrency)
+        await asyncio.to_thread(self._schedule_next_polls, tickets, results)
+        return self._tick_stats(_PollPlan(tickets=tickets), results)
+
+    async def _poll_many_async(
+        self,
+        gateway: AsyncZammadGateway,
+        tickets: list[TicketRecord],
+        concurrency: int | None,
+        deadline: float | None = None,
+    ) -> list[PollResult]:
+        semaphore = asyncio.Semaphore(max(concurrency or self.poll_concurrency, 1))
+
+        async def bounded(ticket: TicketRecord) -> PollResult:
+            async with semaphore:
+                if _expired(deadline):
+                    return PollOutcome(deferred=True)
+                return await self._poll_ticket_async(gateway, ticket)
+
+        return list(await asyncio.gather(*(bounded(ticket) for ticket in tickets)))
+
+    def _tick_deadline(self) -> float | None:
+        if self.tick_budget_seconds <= 0:
+            return None
+        return time.monotonic() + self.tick_budget_seconds
+
+    def _next_in_rotation(
+        self, zammad_ticket_ids: Collection[int] | None, limit: int | None
+    ) -> list[TicketRecord]:
+        """Pollable tickets oldest first, resuming after where the last tick stopped.
+
+        Change-driven ticks list tickets by age, so a capped tick continues from the
+        round-robin cursor and wraps around to the oldest tickets.
+        """
+        cursor = self.repository.get_poller_state(ROUND_ROBIN_CURSOR_KEY) or None
+        if cursor is not None:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                cursor = None
+        tickets = self.repository.list_pollable_tickets(
+            zammad_ticket_ids, limit=limit, after=cursor
+        )
+        if cursor is None or (limit is not None and len(tickets) >= limit):
+            return tickets
+        seen = {ticket.id for ticket in tickets}
+        wrapped = self.repository.list_pollable_tickets(
+            zammad_ticket_ids, limit=None if limit is None else limit - len(tickets)
+        )
+        return tickets + [ticket for ticket in wrapped if ticket.id not in seen]
+
+    @staticmethod
+    def _settle(plan: _PollPlan, results: list[PollResult]) -> list[PollResult]:
+        """Move tickets the deadline cut off into ``plan.deferred``; return the rest."""
+        polled: list[TicketRecord] = []
+        kept: list[PollResult] = []
+        for ticket, outcome in zip(plan.tickets, results, strict=True):
+            if outcome is not None and outcome.deferred:
+                plan.deferred.append(ticket)
+            else:
+                polled.append(ticket)
+                kept.append(outcome)
+        plan.tickets = polled
+        return kept
+
+    def _finish_tick(self, plan: _PollPlan, results: list[PollResult]) -> None:
+        self._store_watermark(plan, results)
+        self._schedule_next_polls(plan.tickets, results)
+        if self.poll_mode == "changes" and plan.tickets:
+            last = plan.tickets[-1]
+            self.repository.set_poller_state(
+                ROUND_ROBIN_CURSOR_KEY, encode_cursor(last.created_at, last.id)
+            )
+
+    def _schedule_next_polls(self, tickets: list[TicketRecord], results: list[PollResult]) -> None:
+        now = self._clock()
+        schedule: list[tuple[str, datetime, float]] = []
+        for ticket, outcome in zip(tickets, results, strict=True):
+            if outcome is not None and outcome.closed:
                 continue
+            interval = self._next_poll_interval(ticket, outcome)
+            schedule.append((ticket.id, now + timedelta(seconds=interval), interval))
+        self.repository.schedule_ticket_polls(schedule)
+
+    def _next_poll_interval(self, ticket: TicketRecord, outcome: PollResult) -> float:
+        current = ticket.poll_interval_seconds or self.poll_interval_seconds
+        if outcome is None:
+            # Zammad could not be read; retry at the same pace.
+            return current
+        if outcome.agent_activity:
+            return self.hot_poll_interval_seconds
+        # Idle: back off exponentially, from the hot interval up to the cold cap.
+        return min(current * self.poll_backoff_factor, self.max_poll_interval_seconds)
+
+    def _load_watermark(self) -> datetime | None:
+        if self.poll_mode != "changes":
+            return None
+        value = self.repository.get_poller_state(CHANGE_WATERMARK_KEY)
+        return from_iso(value) if value else None
+
+    def _plan_poll(
+        self,
+        now: datetime,
+        watermark: datetime | None,
+        changes: dict[int, datetime] | None,
+        searched_at: datetime,
+    ) -> _PollPlan:
+        """Pick this tick's tickets, capped at ``tick_max_tickets`` in the query itself.
+
+        Due tickets come most-overdue first, so whatever a tick leaves behind is
+        served first next time; change-driven ticks round-robin by ticket age.
+        """
+        limit = self.tick_max_tickets if self.tick_max_tickets > 0 else None
+        if self.poll_mode != "changes":
+            plan = _PollPlan(tickets=self.repository.list_due_tickets(now, limit=limit))
+            if limit is not None and len(plan.tickets) >= limit:
+                plan.backlog = self.repository.count_due_tickets(now) - len(plan.tickets)
+            return plan
+        if changes is None:
+            # No watermark yet, or the search failed: poll everything once and
+            # start the watermark from this tick.
+            plan = _PollPlan(
+                tickets=self._next_in_rotation(None, limit), next_watermark=searched_at
+            )
+            if limit is not None and len(plan.tickets) >= limit:
+                plan.backlog = self.repository.count_pollable_tickets() - len(plan.tickets)
+            return plan
+
+        plan = _PollPlan(
+            tickets=self._next_in_rotation(changes, limit),
+            # Watermark from Zammad's own timestamps, so clock skew between the two
+            # hosts cannot open a gap.
+            next_watermark=max([watermark, *changes.values()]) if watermark else searched_at,
+            updated_at=changes,
+        )
+        if limit is not None and len(plan.tickets) >= limit:
+            polled = {ticket.zammad_ticket_id for ticket in plan.tickets}
+            plan.backlog_zammad_ids = sorted(
+                self.repository.list_pollable_zammad_ids(changes.keys()) - polled
+            )
+            plan.backlog = len(plan.backlog_zammad_ids)
+        plan.unchanged = (
+            self.repository.count_pollable_tickets() - len(plan.tickets) - plan.backlog
+        )
+        return plan
+
+    def _store_watermark(self, plan: _PollPlan, results: list[PollResult]) -> None:
+        if plan.next_watermark is None:
+            return
+        unread = [
+            ticket.zammad_ticket_id
+            for ticket, result in zip(plan.tickets, results, strict=True)
+            if result is None
+        ]
+        unread.extend(ticket.zammad_ticket_id for ticket in plan.deferred)
+        unread.extend(plan.backlog_zammad_ids)
+        next_watermark = plan.next_watermark
+        if unread or plan.backlog:
+            if not plan.updated_at:
+                # A full sweep that missed tickets proves nothing; keep the old watermark.
+                return
+            # Keep unread (failed or deferred) tickets inside the next search window.
+            next_watermark = min([next_watermark, *(plan.updated_at[id_] for id_ in unread)])
+        self.repository.set_poller_state(CHANGE_WATERMARK_KEY, to_iso(next_watermark))
 
-            processed += 1
+    @staticmethod
+    def _tick_stats(plan: _PollPlan, results: list[PollResult]) -> dict[str, int]:
+        polled = [result for result in results if result is not None]
+        return {
+            "tickets_checked": len(plan.tickets),
+            "tickets_unchanged": plan.unchanged,
+            "backlog_remaining": len(plan.deferred) + plan.backlog,
+            "replies_sent": sum(outcome.replies_sent for outcome in polled),
+            "tickets_closed": sum(1 for outcome in polled if outcome.closed),
+        }
+
+    def _poll_ticket(self, ticket: TicketRecord) -> PollResult:
+        if ticket.zammad_ticket_id is None:
+            return None
+        try:
+            update = self.zammad_gateway.fetch_ticket_updates(
+                zammad_ticket_id=ticket.zammad_ticket_id,
+                after_article_id=ticket.last_seen_article_id,
+            )
+        except Exception as exc:  # pragma: no cover - network failure path
+            logger.exception("Failed to poll ticket %s: %s", ticket.id, exc)
+            return None
+
+        pending, max_article_id = self._articles_to_answer(ticket, update)
+        replies_sent = 0
+        exchanges: list[tuple[TicketArticle, str | None]] = []
+        for article in pending:
+            user_reply = self._draft_reply(ticket, article)
+            if user_reply is None:
+                continue
+            if self.use_outbox:
+                exchanges.append((article, user_reply))
+                replies_sent += 1
+                continue
             try:
-                articles = self.zammad_gateway.fetch_new_articles(
+                self.zammad_gateway.post_customer_reply(
                     zammad_ticket_id=ticket.zammad_ticket_id,
-                    after_article_id=ticket.last_seen_article_id,
+                    body=user_reply,
+                    subject=f"Re: {ticket.subject}",
                 )
             except Exception as exc:  # pragma: no cover - network failure path
-                logger.exception("Failed to poll articles for ticket %s: %s", ticket.id, exc)
+                logger.exception(
+                    "Failed to post customer reply for ticket %s: %s", ticket.id, exc
+                )
                 continue
+            replies_sent += 1
+            self._record_reply(ticket, article, user_reply)
 
-            max_article_id = ticket.last_seen_article_id
-            for article in articles:
-                max_article_id = max(max_article_id, article.id)
-                if not article.is_agent:
-                    continue
+        self._record_exchanges(ticket, exchanges, max_article_id)
+        is_closed = self._closed_after_replies(update, replies_sent)
+        if is_closed is None:
+            try:
+                is_closed = self.zammad_gateway.is_ticket_closed(ticket.zammad_ticket_id)
+            except Exception as exc:  # pragma: no cover - network failure path
+                logger.exception("Failed to read state for ticket %s: %s", ticket.id, exc)
+                return PollOutcome(replies_sent=replies_sent, agent_activity=True)
+        return self._conclude_poll(ticket, update, replies_sent, is_closed)
+
+    async def _poll_ticket_async(
+        self,
+        gateway: AsyncZammadGateway,
+        ticket: TicketRecord,
+    ) -> PollResult:
+        """Async twin of ``_poll_ticket``: same steps, with blocking work in threads."""
+        if ticket.zammad_ticket_id is None:
+            return None
+        try:
+            update = await gateway.fetch_ticket_updates(
+                zammad_ticket_id=ticket.zammad_ticket_id,
+                after_article_id=ticket.last_seen_article_id,
+            )
+        except Exception as exc:  # pragma: no cover - network failure path
+            logger.exception("Failed to poll ticket %s: %s", ticket.id, exc)
+            return None
 
+        pending, max_article_id = await asyncio.to_thread(
+            self._articles_to_answer, ticket, update
+        )
+        replies_sent = 0
+        exchanges: list[tuple[TicketArticle, str | None]] = []
+        for article in pending:
+            # The Ollama engine blocks on HTTP, so keep it off the event loop.
+            user_reply = await asyncio.to_thread(self._draft_reply, ticket, article)
+            if user_reply is None:
+                continue
+            if self.use_outbox:
+                exchanges.append((article, user_reply))
+                replies_sent += 1
+                continue
+            try:
+                await gateway.post_customer_reply(
+                    zammad_ticket_id=ticket.zammad_ticket_id,
+                    body=user_reply,
+                    subject=f"Re: {ticket.subject}",
+                )
+            except Exception as exc:  # pragma: no cover - network failure path
+                logger.exception(
+                    "Failed to post customer reply for ticket %s: %s", ticket.id, exc
+                )
+                continue
+            replies_sent += 1
+            await asyncio.to_thread(self._record_reply, ticket, article, user_reply)
+
+        await asyncio.to_thread(self._record_exchanges, ticket, exchanges, max_article_id)
+        is_closed = self._closed_after_replies(update, replies_sent)
+        if is_closed is None:
+            try:
+                is_closed = await gateway.is_ticket_closed(ticket.zammad_ticket_id)
+            except Exception as exc:  # pragma: no cover - network failure path
+                logger.exception("Failed to read state for ticket %s: %s", ticket.id, exc)
+                return PollOutcome(replies_sent=replies_sent, agent_activity=True)
+        return await asyncio.to_thread(
+            self._conclude_poll, ticket, update, replies_sent, is_closed
+        )
+
+    def _articles_to_answer(
+        self, ticket: TicketRecord, update: TicketUpdate
+    ) -> tuple[list[TicketArticle], int]:
+        """New agent articles not yet in the processed ledger, and the highest article id."""
+        processed = self._processed_article_ids(ticket, update.articles)
+        max_article_id = max(
+            [ticket.last_seen_article_id, *(article.id for article in update.articles)]
+        )
+        pending = [
+            article
+            for article in update.articles
+            if article.is_agent and article.id not in processed
+        ]
+        return pending, max_article_id
+
+    def _draft_reply(self, ticket: TicketRecord, article: TicketArticle) -> str | None:
+        """The customer's answer to an agent article; None if another poll claimed it."""
+        if not self.use_outbox and not self._claim_article(ticket, article):
+            return None
+        return self.response_engine.generate_reply(
+            agent_message=article.body,
+            hidden_truth=ticket.hidden_truth,
+        )
+
+    def _closed_after_replies(self, update: TicketUpdate, replies_sent: int) -> bool | None:
+        """Closed state once replies went out; None when it must be read from Zammad again."""
+        if not update.closed or not replies_sent:
+            return update.closed
+        if self.use_outbox:
+            # The exchanges reply reopens the ticket when it is delivered; the next poll
+            # sees the state that results.
+            return False
+        # A customer reply can reopen a closed ticket, so the state read before
+        # replying is stale (rare: closed tickets seldom get replies).
+        return None
+
+    def _conclude_poll(
+        self, ticket: TicketRecord, update: TicketUpdate, replies_sent: int, is_closed: bool
+    ) -> PollOutcome:
+        if is_closed:
+            self._finalize_ticket(ticket.id)
+        return PollOutcome(
+            replies_sent=replies_sent,
+            closed=is_closed,
+            agent_activity=any(article.is_agent for article in update.articles),
+        )
+
+    def _processed_article_ids(
+        self, ticket: TicketRecord, articles: list[TicketArticle]
+    ) -> set[int]:
+        """Agent articles already answered, e.g. before a crash kept last_seen behind."""
+        return self.repository.processed_article_ids(
+            ticket.id, [article.id for article in articles if article.is_agent]
+        )
+
+    def _claim_article(self, ticket: TicketRecord, article: TicketArticle) -> bool:
+        """Ledger an agent article before answering it inline; False if already claimed.
+
+        Claiming first makes the inline path at-most-once: a crash after the reply is
+        posted cannot replay the article (and the LLM call and the Zammad post) on the
+        next tick. A post that fails is not retried; the outbox gives exactly-once.
+        """
+        with self.repository.transaction():
+            if not self.repository.record_processed_article(ticket.id, article.id, replied=False):
+                logger.warning(
+                    "Article %s on ticket %s was already processed", article.id, ticket.id
+                )
+                return False
+            self.repository.add_interaction(
+                ticket_id=ticket.id,
+                actor="agent",
+                body=article.body,
+                metadata={"article_id": article.id},
+            )
+        self.event_bus.publish(
+            "ticket.agent_reply",
+            session_id=ticket.session_id,
+            ticket_id=ticket.id,
+            article_id=article.id,
+        )
+        return True
+
+    def _record_reply(self, ticket: TicketRecord, article: TicketArticle, user_reply: str) -> None:
+        """Store a customer reply that was posted inline for a claimed article."""
+        try:
+            with self.repository.transaction():
+                self.repository.mark_article_replied(ticket.id, article.id)
                 self.repository.add_interaction(
                     ticket_id=ticket.id,
-                    actor="agent",
-                    body=article.body,
-                    metadata={"article_id": article.id},
+                    actor="customer",
+                    body=user_reply,
+                    metadata={"event": "simulated_reply", "article_id": article.id},
                 )
+        except Exception as exc:
+            # The reply is already in Zammad and the article stays claimed, so it is
+            # not answered again; only the local transcript misses this reply.
+            logger.exception(
+                "Customer reply for ticket %s was posted but not recorded: %s", ticket.id, exc
+            )
+            return
+        self.event_bus.publish(
+            "ticket.customer_reply",
+            session_id=ticket.session_id,
+            ticket_id=ticket.id,
+            article_id=article.id,
+        )
 
-                user_reply = self.response_engine.generate_reply(
-                    agent_message=article.body,
-                    hidden_truth=ticket.hidden_truth,
-                )
+    def _record_exchanges(
+        self,
+        ticket: TicketRecord,
+        exchanges: list[tuple[TicketArticle, str | None]],
+        max_article_id: int,
+    ) -> None:
+        if not exchanges and max_article_id <= ticket.last_seen_article_id:
+            return
 
-                try:
-                    self.zammad_gateway.post_customer_reply(
-                        zammad_ticket_id=ticket.zammad_ticket_id,
-                        body=user_reply,
-                        subject=f"Re: {ticket.subject}",
+        recorded: list[tuple[TicketArticle, str | None]] = []
+        with self.repository.transaction():
+            for article, user_reply in exchanges:
+                if not self.repository.record_processed_article(
+                    ticket.id, article.id, replied=user_reply is not None
+                ):
+                    # Another poll (e.g. a webhook-triggered one) got here first.
+                    logger.warning(
+                        "Article %s on ticket %s was already processed", article.id, ticket.id
                     )
-                    replies_sent += 1
-                except Exception as exc:  # pragma: no cover - network failure path
-                    logger.exception("Failed to post customer reply for ticket %s: %s", ticket.id, exc)
                     continue
-
+                recorded.append((article, user_reply))
+                self.repository.add_interaction(
+                    ticket_id=ticket.id,
+                    actor="agent",
+                    body=article.body,
+                    metadata={"article_id": article.id},
+                )
+                if user_reply is None:
+                    continue
                 self.repository.add_interaction(
                     ticket_id=ticket.id,
                     actor="customer",
                     body=user_reply,
                     metadata={"event": "simulated_reply", "article_id": article.id},
                 )
+                if self.use_outbox:
+                    self.repository.add_outbox_entry(
+                        ticket_id=ticket.id,
+                        action=OUTBOX_CUSTOMER_REPLY,
+                        payload={
+                            "zammad_ticket_id": ticket.zammad_ticket_id,
+                            "body": user_reply,
+                            "subject": f"Re: {ticket.subject}",
+                        },
+                    )
 
             if max_article_id > ticket.last_seen_article_id:
                 self.repository.update_ticket_last_seen_article_id(ticket.id, max_article_id)
 
-            try:
-                is_closed = self.zammad_gateway.is_ticket_closed(ticket.zammad_ticket_id)
-            except Exception as exc:  # pragma: no cover - network failure path
-                logger.exception("Failed to read state for ticket %s: %s", ticket.id, exc)
-                continue
-
-            if is_closed:
-                self._finalize_ticket(ticket.id)
-                closed_count += 1
-
-        return {
-            "tickets_checked": processed,
-            "replies_sent": replies_sent,
-            "tickets_closed": closed_count,
-        }
+        # Publish only after the commit so subscribers never see rolled-back state.
+        for article, user_reply in recorded:
+            self.event_bus.publish(
+                "ticket.agent_reply",
+                session_id=ticket.session_id,
+                ticket_id=ticket.id,
+                article_id=article.id,
+            )
+            if user_reply is not None:
+                self.event_bus.publish(
+                    "ticket.customer_reply",
+                    session_id=ticket.session_id,
+                    ticket_id=ticket.id,
+                    article_id=article.id,
+                )
 
     def _finalize_ticket(self, ticket_id: str) -> None:
         ticket = self.repository.get_ticket(ticket_id)
@@ -118,3 +647,9 @@ class PollerService:
 
         self.repository.close_ticket(ticket_id=ticket_id, score=result)
         logger.info("Ticket %s closed and graded", ticket_id)
+        self.event_bus.publish(
+            "ticket.closed",
+            session_id=ticket.session_id,
+            ticket_id=ticket_id,
+            total_score=result.get("score", {}).get("total"),
+        )
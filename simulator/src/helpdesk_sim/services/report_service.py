@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from collections import Counter
-from datetime import timedelta
+from collections.abc import Callable
+from datetime import datetime, timedelta
 from typing import Literal
 
 from helpdesk_sim.domain.models import ReportSummary
@@ -10,11 +11,16 @@ from helpdesk_sim.utils import utc_now
 
 
 class ReportService:
-    def __init__(self, repository: SimulatorRepository) -> None:
+    def __init__(
+        self,
+        repository: SimulatorRepository,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
         self.repository = repository
+        self._clock = clock
 
     def generate(self, report_type: Literal["daily", "weekly"]) -> dict[str, object]:
-        now = utc_now()
+        now = self._clock()
         if report_type == "daily":
             period_start = now - timedelta(days=1)
         elif report_type == "weekly":
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import logging
 import random
-from datetime import timedelta
+from collections.abc import Callable
+from datetime import datetime, timedelta
 
 from helpdesk_sim.adapters.gateway import ZammadGateway
 from helpdesk_sim.domain.models import IncidentInjection, SessionProfile, TicketRecord, TicketTier
 from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.services.event_bus import EventBus
 from helpdesk_sim.services.generation_service import GenerationService
+from helpdesk_sim.services.outbox_dispatcher import OUTBOX_CREATE_TICKET
 from helpdesk_sim.utils import utc_now
 
 logger = logging.getLogger(__name__)
@@ -22,14 +25,21 @@ class SchedulerService:
         generation_service: GenerationService,
         zammad_gateway: ZammadGateway,
         rng: random.Random | None = None,
+        event_bus: EventBus | None = None,
+        use_outbox: bool = False,
+        clock: Callable[[], datetime] = utc_now,
     ) -> None:
         self.repository = repository
         self.generation_service = generation_service
         self.zammad_gateway = zammad_gateway
         self.rng = rng or random.Random()
+        self.event_bus = event_bus or EventBus()
+        # Queue Zammad creation for the OutboxDispatcher instead of calling Zammad inline.
+        self.use_outbox = use_outbox
+        self._clock = clock
 
     def tick(self) -> dict[str, int]:
-        now = utc_now()
+        now = self._clock()
         sessions = self.repository.list_active_sessions()
         generated_count = 0
 
@@ -76,16 +86,19 @@ class SchedulerService:
                     pending_batches=pending_batches,
                 )
                 session_config[self.RUNTIME_PENDING_BATCHES_KEY] = pending_batches
-                self.repository.update_session_config(session.id, session_config)
-            elif self.RUNTIME_PENDING_BATCHES_KEY in session_config:
-                session_config.pop(self.RUNTIME_PENDING_BATCHES_KEY, None)
-                self.repository.update_session_config(session.id, session_config)
-
-            self.repository.advance_session_window(
-                session_id=session.id,
-                next_window_at=next_window,
-                window_index=window_index,
-            )
+
+            with self.repository.transaction():
+                if profile.trickle_mode:
+                    self.repository.update_session_config(session.id, session_config)
+                elif self.RUNTIME_PENDING_BATCHES_KEY in session_config:
+                    session_config.pop(self.RUNTIME_PENDING_BATCHES_KEY, None)
+                    self.repository.update_session_config(session.id, session_config)
+
+                self.repository.advance_session_window(
+                    session_id=session.id,
+                    next_window_at=next_window,
+                    window_index=window_index,
+                )
 
         return {"sessions_checked": len(sessions), "tickets_generated": generated_count}
 
@@ -168,26 +181,43 @@ class SchedulerService:
         )
 
         zammad_ticket_id = None
-        try:
-            zammad_ticket_id = self.zammad_gateway.create_ticket(generated)
-        except Exception as exc:  # pragma: no cover - network failure path
-            logger.exception("Failed to create Zammad ticket: %s", exc)
+        if not self.use_outbox:
+            try:
+                zammad_ticket_id = self.zammad_gateway.create_ticket(generated)
+            except Exception as exc:  # pragma: no cover - network failure path
+                logger.exception("Failed to create Zammad ticket: %s", exc)
+
+        with self.repository.transaction():
+            record = self.repository.create_ticket(
+                session_id=session_id,
+                subject=generated.subject,
+                tier=generated.tier.value,
+                priority=generated.priority.value,
+                scenario_id=generated.scenario_id,
+                hidden_truth=generated.hidden_truth,
+                zammad_ticket_id=zammad_ticket_id,
+            )
 
-        record = self.repository.create_ticket(
+            self.repository.add_interaction(
+                ticket_id=record.id,
+                actor="customer",
+                body=generated.body,
+                metadata={"source": "generated", "zammad_ticket_id": zammad_ticket_id},
+            )
+            if self.use_outbox:
+                self.repository.add_outbox_entry(
+                    ticket_id=record.id,
+                    action=OUTBOX_CREATE_TICKET,
+                    payload={"ticket": generated.model_dump(mode="json")},
+                )
+        self.event_bus.publish(
+            "ticket.created",
             session_id=session_id,
-            subject=generated.subject,
-            tier=generated.tier.value,
-            priority=generated.priority.value,
-            scenario_id=generated.scenario_id,
-            hidden_truth=generated.hidden_truth,
-            zammad_ticket_id=zammad_ticket_id,
-        )
-
-        self.repository.add_interaction(
             ticket_id=record.id,
-            actor="customer",
-            body=generated.body,
-            metadata={"source": "generated", "zammad_ticket_id": zammad_ticket_id},
+            subject=record.subject,
+            tier=record.tier.value,
+            priority=record.priority.value,
+            zammad_ticket_id=zammad_ticket_id,
         )
         return record
 
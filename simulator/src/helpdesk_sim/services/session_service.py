@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Callable
+from datetime import datetime, timedelta
 
 from helpdesk_sim.domain.models import SessionRecord
 from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
@@ -9,9 +10,15 @@ from helpdesk_sim.utils import utc_now
 
 
 class SessionService:
-    def __init__(self, repository: SimulatorRepository, catalog: CatalogService) -> None:
+    def __init__(
+        self,
+        repository: SimulatorRepository,
+        catalog: CatalogService,
+        clock: Callable[[], datetime] = utc_now,
+    ) -> None:
         self.repository = repository
         self.catalog = catalog
+        self._clock = clock
 
     def list_profiles(self) -> list[str]:
         return self.catalog.list_profiles()
@@ -24,7 +31,7 @@ class SessionService:
 
     def clock_in(self, profile_name: str) -> SessionRecord:
         profile = self.catalog.get_profile(profile_name)
-        started_at = utc_now()
+        started_at = self._clock()
         ends_at = started_at + timedelta(hours=profile.duration_hours)
         next_window = started_at
         return self.repository.create_session(
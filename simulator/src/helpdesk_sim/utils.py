@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from datetime import UTC, datetime
 
 
@@ -13,3 +15,48 @@ def to_iso(value: datetime) -> str:
 
 def from_iso(value: str) -> datetime:
     return datetime.fromisoformat(value)
+
+
+def encode_cursor(created_at: datetime, record_id: str) -> str:
+    """Opaque keyset cursor pointing just past ``(created_at, record_id)``."""
+    return _encode_token(f"{to_iso(created_at)}|{record_id}")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Return the stored ``(created_at, id)`` pair for a cursor from ``encode_cursor``."""
+    created_at, _, record_id = _decode_token(cursor, "pagination").partition("|")
+    _parse_token_time(created_at, "pagination")
+    if not record_id:
+        raise ValueError("invalid pagination cursor")
+    return created_at, record_id
+
+
+def encode_change_cursor(since: datetime) -> str:
+    """Opaque cursor for "changes since" polling."""
+    return _encode_token(to_iso(since))
+
+
+def decode_change_cursor(cursor: str) -> datetime:
+    return _parse_token_time(_decode_token(cursor, "changes"), "changes")
+
+
+def _encode_token(value: str) -> str:
+    return base64.urlsafe_b64encode(value.encode()).decode("ascii").rstrip("=")
+
+
+def _decode_token(token: str, kind: str) -> str:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return base64.urlsafe_b64decode(padded).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"invalid {kind} cursor") from exc
+
+
+def _parse_token_time(value: str, kind: str) -> datetime:
+    try:
+        parsed = from_iso(value)
+    except ValueError as exc:
+        raise ValueError(f"invalid {kind} cursor") from exc
+    if parsed.tzinfo is None:
+        raise ValueError(f"invalid {kind} cursor")
+    return parsed
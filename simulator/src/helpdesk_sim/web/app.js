@@ -2,6 +2,9 @@ const state = {
   selectedSessionId: null,
   selectedTicketId: null,
   currentSessionTickets: [],
+  sessionChangesCursor: null,
+  liveEvents: false,
+  liveRefreshTimer: null,
   sessions: [],
   profileDefinitions: [],
   catalog: {
@@ -90,6 +93,20 @@ async function api(path, options = {}) {
   return data;
 }
 
+async function apiAllPages(path, listKey) {
+  const separator = path.includes("?") ? "&" : "?";
+  const first = await api(path, { method: "GET", headers: {} });
+  const items = [...(first[listKey] || [])];
+  let data = first;
+  while (data.next_cursor) {
+    const cursor = encodeURIComponent(data.next_cursor);
+    data = await api(`${path}${separator}after=${cursor}`, { method: "GET", headers: {} });
+    items.push(...(data[listKey] || []));
+  }
+  // Keep the first page's metadata: its changes_cursor predates every page we read.
+  return { ...first, [listKey]: items };
+}
+
 function writeLog(element, payload) {
   if (typeof payload === "string") {
     element.textContent = payload;
@@ -232,7 +249,7 @@ function renderSessions() {
 
     const sub = document.createElement("div");
     sub.className = "session-sub";
-    sub.textContent = `Tickets: ${session.ticket_count} | Pending queue: ${pendingCount} | Next window: ${toLocalTime(session.next_window_at)}`;
+    sub.textContent = `Tickets: ${session.ticket_count} (open ${session.open_ticket_count ?? 0}, closed ${session.closed_ticket_count ?? 0}) | Pending queue: ${pendingCount} | Next window: ${toLocalTime(session.next_window_at)}`;
 
     const actions = document.createElement("div");
     actions.className = "session-head";
@@ -471,9 +488,10 @@ async function loadSessionDetail(sessionId) {
   populateManualSessionSelect();
   clearDeleteBanner();
 
-  const data = await api(`/v1/sessions/${sessionId}`, { method: "GET", headers: {} });
+  const data = await apiAllPages(`/v1/sessions/${sessionId}`, "tickets");
   refs.selectedSession.textContent = `${data.session.profile_name} | ${sessionId}`;
   state.currentSessionTickets = data.tickets || [];
+  state.sessionChangesCursor = data.changes_cursor || null;
   renderTickets(state.currentSessionTickets);
 
   if (
@@ -489,12 +507,38 @@ async function loadSessionDetail(sessionId) {
   }
 }
 
+async function loadSessionChanges() {
+  const sessionId = state.selectedSessionId;
+  if (!sessionId || !state.sessionChangesCursor) return;
+
+  const since = encodeURIComponent(state.sessionChangesCursor);
+  const data = await api(`/v1/sessions/${sessionId}/changes?since=${since}`, {
+    method: "GET",
+    headers: {},
+  });
+  if (sessionId !== state.selectedSessionId) return;
+  state.sessionChangesCursor = data.next_cursor;
+
+  const changed = data.tickets || [];
+  if (!changed.length) return;
+  const byId = new Map(state.currentSessionTickets.map((ticket) => [ticket.id, ticket]));
+  changed.forEach((ticket) => byId.set(ticket.id, ticket));
+  state.currentSessionTickets = [...byId.values()].sort(
+    (a, b) => a.created_at.localeCompare(b.created_at) || a.id.localeCompare(b.id)
+  );
+  renderTickets(state.currentSessionTickets);
+
+  if (state.selectedTicketId && changed.some((ticket) => ticket.id === state.selectedTicketId)) {
+    await loadTicketInfo(state.selectedTicketId);
+  }
+}
+
 async function loadTicketInfo(ticketId) {
   state.selectedTicketId = ticketId;
   renderTickets(state.currentSessionTickets);
 
   const [ticketData, knowledgeData] = await Promise.all([
-    api(`/v1/tickets/${ticketId}`, { method: "GET", headers: {} }),
+    apiAllPages(`/v1/tickets/${ticketId}`, "interactions"),
     api(`/v1/tickets/${ticketId}/knowledge-articles`, { method: "GET", headers: {} }),
   ]);
 
@@ -1101,8 +1145,47 @@ refreshAll().catch((error) => {
   writeLog(refs.actionResult, `Initialization failed: ${error.message}`);
 });
 
+function scheduleLiveRefresh(event) {
+  if (event.type === "resync") {
+    refreshAll().catch((error) => {
+      writeLog(refs.actionResult, `Live refresh failed: ${error.message}`);
+    });
+    return;
+  }
+  // Coalesce bursts (a scheduler window creates many tickets at once) into one refresh.
+  if (state.liveRefreshTimer) return;
+  state.liveRefreshTimer = setTimeout(() => {
+    state.liveRefreshTimer = null;
+    Promise.all([loadSessions(), loadSessionChanges()]).catch((error) => {
+      writeLog(refs.actionResult, `Live refresh failed: ${error.message}`);
+    });
+  }, 250);
+}
+
+function connectLiveEvents() {
+  if (!window.EventSource) return;
+  const source = new EventSource("/v1/events");
+  source.onopen = () => {
+    state.liveEvents = true;
+  };
+  source.onerror = () => {
+    // EventSource reconnects on its own; polling covers the gap meanwhile.
+    state.liveEvents = false;
+  };
+  source.onmessage = (message) => {
+    try {
+      scheduleLiveRefresh(JSON.parse(message.data));
+    } catch {
+      // Ignore malformed frames; the next event or poll will catch up.
+    }
+  };
+}
+
+connectLiveEvents();
+
 setInterval(() => {
-  loadSessions().catch((error) => {
+  if (state.liveEvents) return;
+  Promise.all([loadSessions(), loadSessionChanges()]).catch((error) => {
     writeLog(refs.actionResult, `Auto-refresh failed: ${error.message}`);
   });
 }, 15000);
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+
+from helpdesk_sim.fake_zammad import FakeZammadConfig, FakeZammadServer
+
+
+@pytest.fixture
+def fake_zammad() -> Iterator[FakeZammadServer]:
+    """A fake Zammad served over real HTTP; tests may edit ``state.config`` to inject faults."""
+    with FakeZammadServer(FakeZammadConfig(tickets=3, customers=6, token="token")) as server:
+        yield server
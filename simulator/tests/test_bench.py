@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+
+from helpdesk_sim import bench
+from helpdesk_sim.bench import STAGES, main
+
+
+def test_bench_runs_a_shift_to_completion_and_writes_json(tmp_path) -> None:
+    output = tmp_path / "bench.json"
+
+    exit_code = main(
+        ["--sessions", "1", "--profiles", "normal_day", "--step-seconds", "900"]
+        + ["--output", str(output)]
+    )
+
+    assert exit_code == 0
+    report = json.loads(output.read_text())
+    assert report["completed"] is True
+    totals = report["totals"]
+    assert totals["tickets_generated"] > 0
+    assert totals["tickets_closed"] == totals["tickets_generated"]
+    assert totals["replies_sent"] > 0
+    assert set(report["stages"]) == set(STAGES)
+    assert report["stages"]["grading"]["count"] == totals["tickets_closed"]
+
+
+def test_shift_finishing_on_the_last_allowed_tick_counts_as_completed(
+    tmp_path, monkeypatch
+) -> None:
+    # Finish on the third tick regardless of how the simulated shift plays out.
+    checks = [0]
+
+    def finished_on_third_tick(repository, outbox_pending) -> bool:
+        checks[0] += 1
+        return checks[0] >= 3
+
+    monkeypatch.setattr(bench, "_finished", finished_on_third_tick)
+    output = tmp_path / "bench.json"
+    args = ["--sessions", "1", "--profiles", "normal_day", "--step-seconds", "900"]
+
+    assert main(args + ["--max-ticks", "3", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["completed"] is True
+    assert report["totals"]["ticks"] == 3
+
+    checks[0] = 0
+    assert main(args + ["--max-ticks", "2", "--output", str(output)]) == 1
+    assert json.loads(output.read_text())["completed"] is False
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+
+import pytest
+
+from helpdesk_sim.adapters.dry_run_gateway import DryRunGateway, ScriptedAgentBot
+from helpdesk_sim.adapters.zammad_resilience import ZammadApiError
+from helpdesk_sim.domain.models import GeneratedTicket, TicketPriority, TicketTier
+from helpdesk_sim.utils import utc_now
+
+
+def _ticket(subject: str = "Printer offline") -> GeneratedTicket:
+    return GeneratedTicket(
+        scenario_id="sample_scenario",
+        session_id="sample_session",
+        subject=subject,
+        body="The printer on floor 2 is offline.",
+        tier=TicketTier.tier1,
+        priority=TicketPriority.normal,
+        customer_name="Melissa Brooks",
+        customer_email="melissa.brooks@bmm.local",
+        hidden_truth={},
+    )
+
+
+def test_agent_bot_replies_and_closes_on_schedule() -> None:
+    now = [utc_now()]
+    gateway = DryRunGateway(
+        agent_bot=ScriptedAgentBot(reply_after_seconds=60, close_after_replies=2),
+        clock=lambda: now[0],
+    )
+    ticket_id = gateway.create_ticket(_ticket())
+
+    assert gateway.fetch_ticket_updates(ticket_id, after_article_id=1).articles == []
+    now[0] += timedelta(seconds=61)
+    update = gateway.fetch_ticket_updates(ticket_id, after_article_id=1)
+    assert [article.sender for article in update.articles] == ["agent"]
+    assert update.closed is False
+
+    gateway.post_customer_reply(ticket_id, "It says paper jam.", "Re: Printer offline")
+    now[0] += timedelta(seconds=61)
+    update = gateway.fetch_ticket_updates(ticket_id, after_article_id=3)
+    assert [article.id for article in update.articles] == [4]
+    assert update.closed is True
+    assert gateway.stats()["pending_agent_actions"] == 0
+
+
+def test_search_updated_tickets_returns_only_latest_changes() -> None:
+    now = [utc_now()]
+    gateway = DryRunGateway(zammad_clock=lambda: now[0])
+    ids = [gateway.create_ticket(_ticket(f"Ticket {index}")) for index in range(5)]
+    since = now[0] + timedelta(seconds=30)
+    now[0] += timedelta(seconds=60)
+    gateway.add_agent_reply(ids[1], "Looking into it.")
+    gateway.close_ticket(ids[3])
+
+    assert gateway.search_updated_tickets(since) == {ids[1]: now[0], ids[3]: now[0]}
+    assert len(gateway.search_updated_tickets(since - timedelta(minutes=5))) == 5
+
+
+def test_injected_failures_raise_retryable_api_errors() -> None:
+    gateway = DryRunGateway(failure_rate=1.0, rng=random.Random(1))
+    with pytest.raises(ZammadApiError) as raised:
+        gateway.create_ticket(_ticket())
+    assert raised.value.status_code == 503
+
+    gateway.failure_rate = 0.0
+    ticket_id = gateway.create_ticket(_ticket())
+    assert gateway.stats() == {
+        "tickets": 1,
+        "open_tickets": 1,
+        "articles": 1,
+        "pending_agent_actions": 0,
+        "injected_failures": 1,
+    }
+    assert gateway.is_ticket_closed(ticket_id) is False
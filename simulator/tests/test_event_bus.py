@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+from helpdesk_sim.services.event_bus import RESYNC_EVENT_TYPE, EventBus
+
+
+def test_events_published_from_worker_threads_reach_async_subscribers() -> None:
+    bus = EventBus()
+
+    async def scenario() -> list[str]:
+        async with bus.subscribe(session_id="s1") as subscription:
+            publisher = threading.Thread(
+                target=lambda: (
+                    bus.publish("ticket.created", session_id="s2", ticket_id="other"),
+                    bus.publish("ticket.created", session_id="s1", ticket_id="t1"),
+                )
+            )
+            publisher.start()
+            publisher.join()
+            first = await subscription.next(timeout=1)
+            assert first is not None
+            assert await subscription.next(timeout=0.05) is None
+            return [first.type, first.ticket_id]
+
+    assert asyncio.run(scenario()) == ["ticket.created", "t1"]
+    assert bus.subscriber_count == 0
+
+
+def test_subscribers_resume_from_last_event_id_and_resync_when_lagging() -> None:
+    bus = EventBus(max_pending=2)
+    seen = bus.publish("ticket.created", session_id="s1", ticket_id="t1")
+    bus.publish("ticket.agent_reply", session_id="s1", ticket_id="t1")
+
+    async def scenario() -> tuple[str, str]:
+        async with bus.subscribe(last_event_id=seen.id) as subscription:
+            replayed = await subscription.next(timeout=1)
+            for index in range(3):
+                bus.publish("ticket.closed", session_id="s1", ticket_id=f"t{index}")
+            await asyncio.sleep(0)
+            lagging = await subscription.next(timeout=1)
+            bus.close()
+            assert await subscription.next(timeout=1) is None
+            assert subscription.closed
+            assert replayed is not None and lagging is not None
+            return replayed.type, lagging.type
+
+    assert asyncio.run(scenario()) == ("ticket.agent_reply", RESYNC_EVENT_TYPE)
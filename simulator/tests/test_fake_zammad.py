@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from helpdesk_sim.adapters.zammad_async_gateway import AsyncZammadHttpGateway
+from helpdesk_sim.adapters.zammad_http_gateway import ZammadHttpGateway
+from helpdesk_sim.adapters.zammad_resilience import ZammadApiError, ZammadResilience
+from helpdesk_sim.domain.models import GeneratedTicket, TicketPriority, TicketTier
+from helpdesk_sim.fake_zammad import FakeZammadServer
+
+
+def _ticket() -> GeneratedTicket:
+    return GeneratedTicket(
+        scenario_id="sample_scenario",
+        session_id="sample_session",
+        subject="VPN drops every hour",
+        body="My VPN disconnects every hour.",
+        tier=TicketTier.tier1,
+        priority=TicketPriority.high,
+        customer_name="Melissa Brooks",
+        customer_email="melissa.brooks@bmm.local",
+        hidden_truth={"persona": {"role": "HR"}},
+    )
+
+
+def test_http_gateway_round_trip_against_fake_zammad(fake_zammad: FakeZammadServer) -> None:
+    gateway = ZammadHttpGateway(base_url=fake_zammad.base_url, token="token")
+    since = datetime.now(UTC) - timedelta(seconds=1)
+    try:
+        ticket_id = gateway.create_ticket(_ticket(), idempotency_key="abc123")
+        assert gateway.find_ticket_by_idempotency_key("abc123") == ticket_id
+        assert "melissa.brooks@bmm.local" in {
+            user["email"] for user in fake_zammad.state.users.values()
+        }
+
+        fake_zammad.state.add_agent_reply(ticket_id, "Please restart the VPN client.")
+        update = gateway.fetch_ticket_updates(ticket_id, after_article_id=0)
+        assert [article.sender for article in update.articles] == ["Customer", "Agent"]
+        assert update.closed is False
+        assert ticket_id in gateway.search_updated_tickets(since)
+
+        assert gateway.find_article_by_idempotency_key(ticket_id, "reply1") is None
+        gateway.post_customer_reply(
+            ticket_id, "That fixed it.", "Re: VPN", idempotency_key="reply1"
+        )
+        reply_id = gateway.find_article_by_idempotency_key(ticket_id, "reply1")
+        assert reply_id == fake_zammad.state.ticket_articles(ticket_id)[-1]["id"]
+        assert gateway.close_ticket(ticket_id) is True
+        assert gateway.delete_ticket(ticket_id) is True
+    finally:
+        gateway.close()
+
+
+def test_injected_errors_are_retried_by_the_gateway(fake_zammad: FakeZammadServer) -> None:
+    fake_zammad.state.config.error_rate = 1.0
+    resilience = ZammadResilience(max_attempts=3, retry_base_seconds=0.0, retry_max_seconds=0.0)
+    gateway = ZammadHttpGateway(base_url=fake_zammad.base_url, token="token", resilience=resilience)
+    try:
+        with pytest.raises(ZammadApiError) as raised:
+            gateway.is_ticket_closed(1)
+        assert raised.value.status_code == 503
+        assert resilience.stats()["retries"] == 2
+
+        fake_zammad.state.config.error_rate = 0.0
+        assert gateway.is_ticket_closed(1) is False
+    finally:
+        gateway.close()
+    assert fake_zammad.state.stats()["injected_errors"] == 3
+
+
+def test_async_gateway_reads_seeded_tickets(fake_zammad: FakeZammadServer) -> None:
+    async def scenario() -> tuple[int, int]:
+        gateway = AsyncZammadHttpGateway(base_url=fake_zammad.base_url, token="token")
+        try:
+            changes = await gateway.search_updated_tickets(datetime.now(UTC) - timedelta(hours=1))
+            update = await gateway.fetch_ticket_updates(1, after_article_id=0)
+        finally:
+            await gateway.aclose()
+        return len(changes), len(update.articles)
+
+    assert asyncio.run(scenario()) == (3, 2)
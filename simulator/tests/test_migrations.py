@@ -0,0 +1,117 @@
+import sqlite3
+from datetime import timedelta
+
+from helpdesk_sim.repositories.migrations import MIGRATIONS
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.utils import encode_cursor, utc_now
+
+LEGACY_SCHEMA = """
+CREATE TABLE sessions (
+    id TEXT PRIMARY KEY, profile_name TEXT NOT NULL, status TEXT NOT NULL,
+    started_at TEXT NOT NULL, ends_at TEXT NOT NULL, next_window_at TEXT NOT NULL,
+    window_index INTEGER NOT NULL DEFAULT 0, config_json TEXT NOT NULL
+);
+CREATE TABLE tickets (
+    id TEXT PRIMARY KEY, session_id TEXT NOT NULL, zammad_ticket_id INTEGER,
+    subject TEXT NOT NULL, tier TEXT NOT NULL, priority TEXT NOT NULL, status TEXT NOT NULL,
+    scenario_id TEXT NOT NULL, hidden_truth_json TEXT NOT NULL, score_json TEXT,
+    created_at TEXT NOT NULL, updated_at TEXT NOT NULL, closed_at TEXT,
+    last_seen_article_id INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE interactions (
+    id TEXT PRIMARY KEY, ticket_id TEXT NOT NULL, actor TEXT NOT NULL, body TEXT NOT NULL,
+    created_at TEXT NOT NULL, metadata_json TEXT
+);
+CREATE TABLE reports (
+    id TEXT PRIMARY KEY, report_type TEXT NOT NULL, period_start TEXT NOT NULL,
+    period_end TEXT NOT NULL, payload_json TEXT NOT NULL, created_at TEXT NOT NULL
+);
+INSERT INTO sessions VALUES ('legacy', 'normal_day', 'active', '2024-01-01T00:00:00+00:00',
+    '2024-01-01T08:00:00+00:00', '2024-01-01T00:00:00+00:00', 0, '{}');
+"""
+
+
+def _query_plan(repository: SimulatorRepository, call) -> str:
+    """Run a repository call, capture the SELECT it issues and EXPLAIN it."""
+    statements: list[str] = []
+    with repository.transaction(), repository._connect() as conn:
+        # Inside a transaction the repository reuses this thread's connection.
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+        selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+        assert selects, statements
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {selects[-1]}").fetchall()
+    return "\n".join(str(row["detail"]) for row in rows)
+
+
+def test_initialize_records_every_migration_once(tmp_path) -> None:
+    repository = SimulatorRepository(tmp_path / "sim.db")
+    repository.initialize()
+    repository.initialize()
+
+    assert repository.schema_version() == MIGRATIONS[-1].version
+    with repository._connect() as conn:
+        versions = [row[0] for row in conn.execute("SELECT version FROM schema_migrations")]
+    assert versions == [migration.version for migration in MIGRATIONS]
+
+
+def test_initialize_upgrades_pre_migration_database(tmp_path) -> None:
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.close()
+
+    repository = SimulatorRepository(db_path)
+    repository.initialize()
+
+    assert repository.get_session("legacy") is not None
+    assert repository.schema_version() == MIGRATIONS[-1].version
+
+
+def test_hot_queries_use_indexes(tmp_path) -> None:
+    repository = SimulatorRepository(tmp_path / "sim.db")
+    repository.initialize()
+    now = utc_now()
+
+    interactions_plan = _query_plan(repository, lambda: repository.list_interactions("t1"))
+    ticket_page_plan = _query_plan(
+        repository,
+        lambda: repository.list_tickets_for_session(
+            "s1", limit=50, after=encode_cursor(now, "t1"), include_hidden_truth=False
+        ),
+    )
+    closed_plan = _query_plan(
+        repository,
+        lambda: repository.list_closed_tickets_between(now - timedelta(days=1), now),
+    )
+    pollable_plan = _query_plan(repository, repository.list_pollable_tickets)
+    rotation_plan = _query_plan(
+        repository,
+        lambda: repository.list_pollable_tickets(limit=50, after=encode_cursor(now, "t1")),
+    )
+    changes_plan = _query_plan(
+        repository, lambda: repository.list_session_changes("s1", since=now)
+    )
+    summaries_plan = _query_plan(repository, repository.list_session_summaries)
+    due_plan = _query_plan(repository, lambda: repository.list_due_tickets(now))
+    outbox_plan = _query_plan(repository, lambda: repository.list_due_outbox(now, limit=50))
+
+    assert "idx_interactions_ticket_keyset" in interactions_plan
+    assert "TEMP B-TREE" not in interactions_plan
+    assert "idx_tickets_session_created" in ticket_page_plan
+    assert "TEMP B-TREE" not in ticket_page_plan
+    assert "idx_tickets_status_closed" in closed_plan
+    assert "idx_tickets_pollable" in pollable_plan
+    assert "TEMP B-TREE" not in pollable_plan
+    assert "idx_tickets_pollable" in rotation_plan
+    assert "TEMP B-TREE" not in rotation_plan
+    assert "COVERING INDEX idx_tickets_session_status" in summaries_plan
+    assert "idx_tickets_session_updated" in changes_plan
+    assert "idx_interactions_ticket_keyset" in changes_plan
+    assert "idx_tickets_poll_due" in due_plan
+    assert "TEMP B-TREE" not in due_plan
+    assert "idx_outbox_due" in outbox_plan
+    assert "idx_outbox_ticket" in outbox_plan
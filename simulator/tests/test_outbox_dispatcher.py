@@ -0,0 +1,238 @@
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+
+from helpdesk_sim.adapters.dry_run_gateway import DryRunGateway
+from helpdesk_sim.domain.models import OutboxStatus
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.services.catalog_service import CatalogService
+from helpdesk_sim.services.event_bus import EventBus
+from helpdesk_sim.services.generation_service import GenerationService
+from helpdesk_sim.services.grading_service import GradingService
+from helpdesk_sim.services.outbox_dispatcher import OutboxDispatcher
+from helpdesk_sim.services.poller_service import PollerService
+from helpdesk_sim.services.response_engine import RuleBasedResponseEngine
+from helpdesk_sim.services.scheduler_service import SchedulerService
+from helpdesk_sim.services.session_service import SessionService
+from helpdesk_sim.utils import utc_now
+
+TEMPLATES = Path(__file__).resolve().parents[1] / "src" / "helpdesk_sim" / "templates"
+
+
+class _FlakyGateway(DryRunGateway):
+    """Fails the next ``failures`` writes; ``lose_responses`` makes them fail after applying."""
+
+    def __init__(self, failures: int = 0, lose_responses: bool = False) -> None:
+        super().__init__()
+        self.failures = failures
+        self.lose_responses = lose_responses
+        self.create_calls = 0
+        self.reply_calls = 0
+
+    def create_ticket(self, ticket, idempotency_key=None):
+        self.create_calls += 1
+        if self.failures and not self.lose_responses:
+            self.failures -= 1
+            raise httpx.ConnectError("Zammad unreachable")
+        ticket_id = super().create_ticket(ticket, idempotency_key=idempotency_key)
+        if self.failures:
+            self.failures -= 1
+            raise httpx.ReadTimeout("response lost")
+        return ticket_id
+
+    def post_customer_reply(self, zammad_ticket_id, body, subject, idempotency_key=None):
+        self.reply_calls += 1
+        super().post_customer_reply(zammad_ticket_id, body, subject, idempotency_key)
+        if self.failures:
+            self.failures -= 1
+            raise httpx.ReadTimeout("response lost")
+
+
+def _build(tmp_path, gateway: DryRunGateway):
+    repository = SimulatorRepository(tmp_path / "sim.db")
+    repository.initialize()
+    catalog = CatalogService(templates_dir=TEMPLATES)
+    catalog.load()
+    event_bus = EventBus()
+    scheduler = SchedulerService(
+        repository=repository,
+        generation_service=GenerationService(catalog=catalog),
+        zammad_gateway=gateway,
+        event_bus=event_bus,
+        use_outbox=True,
+    )
+    poller = PollerService(
+        repository=repository,
+        zammad_gateway=gateway,
+        response_engine=RuleBasedResponseEngine(),
+        grading_service=GradingService(),
+        event_bus=event_bus,
+        use_outbox=True,
+    )
+    now = [utc_now() + timedelta(seconds=1)]
+    dispatcher = OutboxDispatcher(
+        repository=repository,
+        zammad_gateway=gateway,
+        event_bus=event_bus,
+        retry_base_seconds=5,
+        retry_max_seconds=60,
+        clock=lambda: now[0],
+    )
+    session = SessionService(repository=repository, catalog=catalog).clock_in("manual_only")
+    return repository, scheduler, poller, dispatcher, session, now
+
+
+def test_ticket_is_committed_unlinked_and_linked_once_delivery_succeeds(tmp_path) -> None:
+    gateway = _FlakyGateway(failures=2)
+    repository, scheduler, poller, dispatcher, session, now = _build(tmp_path, gateway)
+
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is None
+    assert gateway.create_calls == 0
+    assert poller.tick()["tickets_checked"] == 0
+
+    assert dispatcher.dispatch_once()["retried"] == 1
+    # Backing off: nothing is due until the retry time passes.
+    assert dispatcher.dispatch_once() == {"delivered": 0, "retried": 0, "failed": 0, "pending": 1}
+    now[0] += timedelta(seconds=5)
+    assert dispatcher.dispatch_once()["retried"] == 1
+    now[0] += timedelta(seconds=10)
+    assert dispatcher.dispatch_once()["delivered"] == 1
+
+    linked = repository.get_ticket(ticket.id)
+    assert linked is not None and linked.zammad_ticket_id == 1000
+    assert repository.outbox_counts() == {"pending": 0, "failed": 0}
+    assert poller.tick()["tickets_checked"] == 1
+
+
+def test_retry_after_lost_response_does_not_create_a_second_ticket(tmp_path) -> None:
+    gateway = _FlakyGateway(failures=1, lose_responses=True)
+    repository, scheduler, _, dispatcher, session, now = _build(tmp_path, gateway)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+
+    assert dispatcher.dispatch_once()["retried"] == 1
+    now[0] += timedelta(seconds=5)
+    assert dispatcher.dispatch_once()["delivered"] == 1
+
+    assert gateway.create_calls == 1
+    linked = repository.get_ticket(ticket.id)
+    assert linked is not None and linked.zammad_ticket_id == 1000
+    assert gateway._next_ticket_id == 1001
+
+
+def test_failed_lookup_after_lost_response_reschedules_instead_of_creating_again(
+    tmp_path,
+) -> None:
+    gateway = _FlakyGateway(failures=1, lose_responses=True)
+    repository, scheduler, _, dispatcher, session, now = _build(tmp_path, gateway)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert dispatcher.dispatch_once()["retried"] == 1
+
+    find_ticket = gateway.find_ticket_by_idempotency_key
+
+    def search_down(idempotency_key):
+        raise httpx.ConnectError("search unavailable")
+
+    gateway.find_ticket_by_idempotency_key = search_down
+    now[0] += timedelta(seconds=5)
+    assert dispatcher.dispatch_once()["retried"] == 1
+    assert gateway.create_calls == 1
+
+    gateway.find_ticket_by_idempotency_key = find_ticket
+    now[0] += timedelta(seconds=10)
+    assert dispatcher.dispatch_once()["delivered"] == 1
+    assert gateway.create_calls == 1
+    linked = repository.get_ticket(ticket.id)
+    assert linked is not None and linked.zammad_ticket_id == 1000
+
+
+def test_retry_after_lost_reply_response_does_not_post_a_second_reply(tmp_path) -> None:
+    gateway = _FlakyGateway(lose_responses=True)
+    _, scheduler, poller, dispatcher, session, now = _build(tmp_path, gateway)
+    scheduler.create_manual_ticket(session_id=session.id)
+    assert dispatcher.dispatch_once()["delivered"] == 1
+
+    gateway.add_agent_reply(1000, "Could you share the exact error message?")
+    assert poller.tick()["replies_sent"] == 1
+    gateway.failures = 1
+    assert dispatcher.dispatch_once()["retried"] == 1
+    now[0] += timedelta(seconds=5)
+    assert dispatcher.dispatch_once()["delivered"] == 1
+
+    assert gateway.reply_calls == 1
+    senders = [article.sender for article in gateway.fetch_new_articles(1000, 0)]
+    assert senders == ["customer", "agent", "customer"]
+
+
+def test_crash_between_send_and_completion_does_not_deliver_twice(
+    tmp_path, monkeypatch
+) -> None:
+    gateway = _FlakyGateway()
+    repository, scheduler, poller, dispatcher, session, _ = _build(tmp_path, gateway)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+
+    def crash(entry, zammad_ticket_id):
+        raise KeyboardInterrupt("process killed")
+
+    monkeypatch.setattr(dispatcher, "_complete", crash)
+    with pytest.raises(KeyboardInterrupt):
+        dispatcher.dispatch_once()
+    monkeypatch.undo()
+    assert dispatcher.dispatch_once()["delivered"] == 1
+    assert gateway.create_calls == 1
+    linked = repository.get_ticket(ticket.id)
+    assert linked is not None and linked.zammad_ticket_id == 1000
+
+    gateway.add_agent_reply(1000, "Could you share the exact error message?")
+    assert poller.tick()["replies_sent"] == 1
+    monkeypatch.setattr(dispatcher, "_complete", crash)
+    with pytest.raises(KeyboardInterrupt):
+        dispatcher.dispatch_once()
+    monkeypatch.undo()
+    assert dispatcher.dispatch_once()["delivered"] == 1
+    assert gateway.reply_calls == 1
+
+
+def test_customer_replies_are_queued_with_the_conversation_and_delivered_in_order(
+    tmp_path,
+) -> None:
+    gateway = DryRunGateway()
+    repository, scheduler, poller, dispatcher, session, _ = _build(tmp_path, gateway)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    dispatcher.dispatch_once()
+
+    gateway.add_agent_reply(1000, "Could you share the exact error message?")
+    gateway.add_agent_reply(1000, "Which device are you using?")
+    assert poller.tick()["replies_sent"] == 2
+    actors = [row.actor for row in repository.list_interactions(ticket.id)]
+    assert actors == ["customer", "agent", "customer", "agent", "customer"]
+    # Nothing reached Zammad yet; the second reply waits for the first.
+    assert len(gateway.fetch_new_articles(1000, 0)) == 3
+    assert len(repository.list_due_outbox(utc_now(), limit=10)) == 1
+
+    assert dispatcher.dispatch_once()["delivered"] == 1
+    assert dispatcher.dispatch_once()["delivered"] == 1
+    senders = [article.sender for article in gateway.fetch_new_articles(1000, 0)]
+    assert senders == ["customer", "agent", "agent", "customer", "customer"]
+
+
+def test_rejected_payload_is_marked_failed_without_retrying(tmp_path) -> None:
+    gateway = DryRunGateway()
+    repository, scheduler, _, dispatcher, session, _ = _build(tmp_path, gateway)
+
+    def rejected(ticket, idempotency_key=None):
+        request = httpx.Request("POST", "http://zammad/api/v1/tickets")
+        response = httpx.Response(422, request=request)
+        raise httpx.HTTPStatusError("unprocessable", request=request, response=response)
+
+    gateway.create_ticket = rejected
+    scheduler.create_manual_ticket(session_id=session.id)
+
+    assert dispatcher.dispatch_once()["failed"] == 1
+    assert repository.outbox_counts() == {"pending": 0, "failed": 1}
+    with repository._connect() as conn:
+        row = conn.execute("SELECT status, last_error FROM outbox").fetchone()
+    assert row["status"] == OutboxStatus.failed.value
+    assert "unprocessable" in row["last_error"]
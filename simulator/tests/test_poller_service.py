@@ -0,0 +1,421 @@
+import asyncio
+import sqlite3
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from helpdesk_sim.adapters.dry_run_gateway import DryRunGateway
+from helpdesk_sim.adapters.gateway import TicketUpdate
+from helpdesk_sim.clock import SimulationClock
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.services import poller_service
+from helpdesk_sim.services.catalog_service import CatalogService
+from helpdesk_sim.services.event_bus import EventBus
+from helpdesk_sim.services.generation_service import GenerationService
+from helpdesk_sim.services.grading_service import GradingService
+from helpdesk_sim.services.poller_service import PollerService
+from helpdesk_sim.services.response_engine import RuleBasedResponseEngine
+from helpdesk_sim.services.scheduler_service import SchedulerService
+from helpdesk_sim.services.session_service import SessionService
+from helpdesk_sim.utils import from_iso, to_iso, utc_now
+
+TEMPLATES = Path(__file__).resolve().parents[1] / "src" / "helpdesk_sim" / "templates"
+
+
+def _build(tmp_path):
+    repository = SimulatorRepository(tmp_path / "sim.db")
+    repository.initialize()
+    catalog = CatalogService(templates_dir=TEMPLATES)
+    catalog.load()
+    gateway = DryRunGateway()
+    event_bus = EventBus()
+    scheduler = SchedulerService(
+        repository=repository,
+        generation_service=GenerationService(catalog=catalog),
+        zammad_gateway=gateway,
+        event_bus=event_bus,
+    )
+    poller = PollerService(
+        repository=repository,
+        zammad_gateway=gateway,
+        response_engine=RuleBasedResponseEngine(),
+        grading_service=GradingService(),
+        event_bus=event_bus,
+    )
+    session = SessionService(repository=repository, catalog=catalog).clock_in("manual_only")
+    return repository, gateway, scheduler, poller, session
+
+
+def test_poller_records_agent_reply_and_customer_follow_up(tmp_path) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is not None
+
+    gateway.add_agent_reply(ticket.zammad_ticket_id, "Could you share the exact error message?")
+    stats = poller.tick()
+
+    assert stats["tickets_checked"] == 1
+    assert stats["replies_sent"] == 1
+    actors = [row.actor for row in repository.list_interactions(ticket.id)]
+    assert actors == ["customer", "agent", "customer"]
+    updated = repository.get_ticket(ticket.id)
+    assert updated is not None
+    assert updated.last_seen_article_id == 2
+
+    # A second tick must not replay the same agent article.
+    assert poller.tick()["replies_sent"] == 0
+    assert [event.type for event in poller.event_bus.recent_events()] == [
+        "ticket.created",
+        "ticket.agent_reply",
+        "ticket.customer_reply",
+    ]
+
+
+def test_poller_grades_ticket_closed_in_zammad(tmp_path) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is not None
+
+    gateway.close_ticket(ticket.zammad_ticket_id)
+    stats = poller.tick()
+
+    assert stats["tickets_closed"] == 1
+    closed = repository.get_ticket(ticket.id)
+    assert closed is not None
+    assert closed.status.value == "closed"
+    assert closed.score is not None
+    closed_event = poller.event_bus.recent_events()[-1]
+    assert closed_event.type == "ticket.closed"
+    assert closed_event.session_id == session.id
+
+
+def test_tick_async_matches_sync_tick_on_dry_run_gateway(tmp_path) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is not None
+
+    gateway.add_agent_reply(ticket.zammad_ticket_id, "Could you share the exact error message?")
+    stats = asyncio.run(poller.tick_async())
+
+    assert stats == {
+        "tickets_checked": 1,
+        "tickets_unchanged": 0,
+        "backlog_remaining": 0,
+        "replies_sent": 1,
+        "tickets_closed": 0,
+    }
+    actors = [row.actor for row in repository.list_interactions(ticket.id)]
+    assert actors == ["customer", "agent", "customer"]
+    assert asyncio.run(poller.tick_async())["replies_sent"] == 0
+
+
+class _SlowAsyncGateway:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+
+    async def fetch_ticket_updates(
+        self, zammad_ticket_id: int, after_article_id: int
+    ) -> TicketUpdate:
+        await self._call()
+        return TicketUpdate(articles=[], closed=False)
+
+    async def post_customer_reply(self, zammad_ticket_id: int, body: str, subject: str) -> None:
+        await self._call()
+
+    async def is_ticket_closed(self, zammad_ticket_id: int) -> bool:
+        await self._call()
+        return False
+
+    async def aclose(self) -> None:
+        return None
+
+
+def test_tick_async_bounds_concurrent_ticket_polls(tmp_path) -> None:
+    _, _, scheduler, poller, session = _build(tmp_path)
+    for _ in range(12):
+        scheduler.create_manual_ticket(session_id=session.id)
+    slow = _SlowAsyncGateway(latency=0.1)
+    poller.async_gateway = slow
+
+    started = time.perf_counter()
+    stats = asyncio.run(poller.tick_async(concurrency=4))
+    elapsed = time.perf_counter() - started
+
+    assert stats["tickets_checked"] == 12
+    assert slow.max_in_flight == 4
+    # 12 tickets x 100 ms would take 1.2 s one at a time.
+    assert elapsed < 0.9
+
+
+def test_change_driven_tick_polls_only_tickets_updated_since_watermark(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setattr(poller_service, "CHANGE_WATERMARK_OVERLAP", timedelta(0))
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    poller.poll_mode = "changes"
+    tickets = [scheduler.create_manual_ticket(session_id=session.id) for _ in range(3)]
+
+    # Without a watermark the first tick sweeps every open ticket once.
+    assert poller.tick()["tickets_checked"] == 3
+    assert repository.get_poller_state(poller_service.CHANGE_WATERMARK_KEY) is not None
+
+    assert poller.tick() == {
+        "tickets_checked": 0,
+        "tickets_unchanged": 3,
+        "backlog_remaining": 0,
+        "replies_sent": 0,
+        "tickets_closed": 0,
+    }
+
+    touched = tickets[1].zammad_ticket_id
+    assert touched is not None
+    gateway.add_agent_reply(touched, "Could you share the exact error message?")
+    stats = asyncio.run(poller.tick_async())
+    assert stats["tickets_checked"] == 1
+    assert stats["replies_sent"] == 1
+
+
+def test_change_driven_tick_falls_back_to_full_poll_when_search_fails(
+    tmp_path, monkeypatch
+) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    poller.poll_mode = "changes"
+    scheduler.create_manual_ticket(session_id=session.id)
+    poller.tick()
+    stored = repository.get_poller_state(poller_service.CHANGE_WATERMARK_KEY)
+
+    def broken_search(since):
+        raise RuntimeError("search index unavailable")
+
+    monkeypatch.setattr(gateway, "search_updated_tickets", broken_search)
+    assert poller.tick()["tickets_checked"] == 1
+    assert repository.get_poller_state(poller_service.CHANGE_WATERMARK_KEY) >= stored
+
+
+def test_polling_backs_off_idle_tickets_and_speeds_up_after_agent_activity(tmp_path) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is not None
+    start = utc_now() + timedelta(seconds=1)
+    now = [start]
+    poller._clock = lambda: now[0]
+
+    def interval() -> float | None:
+        stored = repository.get_ticket(ticket.id)
+        assert stored is not None
+        return stored.poll_interval_seconds
+
+    assert poller.tick()["tickets_checked"] == 1
+    assert interval() == 60  # idle: 30 s base doubled
+
+    now[0] = start + timedelta(seconds=30)
+    assert poller.tick()["tickets_checked"] == 0  # not due yet
+
+    gateway.add_agent_reply(ticket.zammad_ticket_id, "Could you share the exact error message?")
+    now[0] = start + timedelta(seconds=61)
+    assert poller.tick()["replies_sent"] == 1
+    assert interval() == 10  # hot after agent activity
+
+    now[0] = start + timedelta(seconds=72)
+    assert poller.tick()["tickets_checked"] == 1
+    assert interval() == 20
+
+    for _ in range(12):
+        now[0] += timedelta(hours=1)
+        poller.tick()
+    assert interval() == 1800  # capped
+
+
+def test_tick_budget_defers_overdue_tickets_and_round_robins_across_ticks(
+    tmp_path, monkeypatch
+) -> None:
+    repository, _, scheduler, poller, session = _build(tmp_path)
+    poller.poll_mode = "changes"
+    poller.tick_max_tickets = 2
+    tickets = [scheduler.create_manual_ticket(session_id=session.id) for _ in range(5)]
+    polled: list[str] = []
+    poll_ticket = poller._poll_ticket
+
+    def recording_poll(ticket):
+        polled.append(ticket.id)
+        return poll_ticket(ticket)
+
+    monkeypatch.setattr(poller, "_poll_ticket", recording_poll)
+
+    stats = poller.tick()
+    assert stats["tickets_checked"] == 2
+    assert stats["backlog_remaining"] == 3
+    # An unfinished first sweep must not advance the change watermark.
+    assert repository.get_poller_state(poller_service.CHANGE_WATERMARK_KEY) is None
+
+    poller.tick()
+    poller.tick()
+    assert polled[:5] == [ticket.id for ticket in tickets]
+    assert polled[5] == tickets[0].id
+
+
+def test_tick_budget_caps_due_tickets_in_the_query(tmp_path, monkeypatch) -> None:
+    repository, _, scheduler, poller, session = _build(tmp_path)
+    poller.tick_max_tickets = 2
+    for _ in range(5):
+        scheduler.create_manual_ticket(session_id=session.id)
+    limits: list[int | None] = []
+    list_due_tickets = repository.list_due_tickets
+
+    def recording_list(now, limit=None):
+        limits.append(limit)
+        return list_due_tickets(now, limit=limit)
+
+    monkeypatch.setattr(repository, "list_due_tickets", recording_list)
+
+    stats = poller.tick()
+    assert stats["tickets_checked"] == 2
+    assert stats["backlog_remaining"] == 3
+    assert limits == [2]
+
+
+def test_capped_change_tick_holds_the_watermark_at_the_oldest_unread_change(
+    tmp_path, monkeypatch
+) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    poller.poll_mode = "changes"
+    tickets = [scheduler.create_manual_ticket(session_id=session.id) for _ in range(4)]
+    poller.tick()
+    watermark = repository.get_poller_state(poller_service.CHANGE_WATERMARK_KEY)
+    assert watermark is not None
+
+    for ticket in tickets[1:]:
+        assert ticket.zammad_ticket_id is not None
+        gateway.add_agent_reply(ticket.zammad_ticket_id, "Could you share the exact error?")
+    changes = gateway.search_updated_tickets(
+        since=from_iso(watermark) - poller_service.CHANGE_WATERMARK_OVERLAP
+    )
+    polled: list[int] = []
+    poll_ticket = poller._poll_ticket
+
+    def recording_poll(ticket):
+        polled.append(ticket.zammad_ticket_id)
+        return poll_ticket(ticket)
+
+    monkeypatch.setattr(poller, "_poll_ticket", recording_poll)
+    poller.tick_max_tickets = 1
+    stats = poller.tick()
+
+    assert stats["tickets_checked"] == 1
+    assert stats["backlog_remaining"] == len(changes) - 1
+    assert stats["tickets_unchanged"] == len(tickets) - len(changes)
+    unread = [zammad_id for zammad_id in changes if zammad_id not in polled]
+    assert repository.get_poller_state(poller_service.CHANGE_WATERMARK_KEY) == to_iso(
+        min(changes[zammad_id] for zammad_id in unread)
+    )
+
+
+def test_tick_deadline_leaves_remaining_tickets_for_the_next_tick(tmp_path) -> None:
+    _, _, scheduler, poller, session = _build(tmp_path)
+    for _ in range(6):
+        scheduler.create_manual_ticket(session_id=session.id)
+    poller.async_gateway = _SlowAsyncGateway(latency=0.2)
+    poller.tick_budget_seconds = 0.3
+
+    stats = asyncio.run(poller.tick_async(concurrency=1))
+    assert stats["tickets_checked"] == 2
+    assert stats["backlog_remaining"] == 4
+
+    # Deferred tickets were not rescheduled, so they are still due.
+    poller.tick_budget_seconds = 0
+    assert asyncio.run(poller.tick_async(concurrency=4))["tickets_checked"] == 4
+
+
+def test_articles_in_processed_ledger_are_not_answered_twice(tmp_path) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is not None
+    gateway.add_agent_reply(ticket.zammad_ticket_id, "Could you share the exact error message?")
+    assert poller.tick()["replies_sent"] == 1
+
+    # Simulate a crash that left last_seen_article_id behind the stored conversation.
+    repository.update_ticket_last_seen_article_id(ticket.id, 0)
+    repository.schedule_ticket_polls([(ticket.id, utc_now(), 30)])
+    stats = poller.tick()
+
+    assert stats["tickets_checked"] == 1
+    assert stats["replies_sent"] == 0
+    actors = [row.actor for row in repository.list_interactions(ticket.id)]
+    assert actors == ["customer", "agent", "customer"]
+    stored = repository.get_ticket(ticket.id)
+    assert stored is not None and stored.last_seen_article_id > 0
+
+
+def test_inline_reply_is_not_posted_again_when_recording_it_fails(tmp_path, monkeypatch) -> None:
+    repository, gateway, scheduler, poller, session = _build(tmp_path)
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is not None
+    gateway.add_agent_reply(ticket.zammad_ticket_id, "Could you share the exact error message?")
+
+    def fail(*args, **kwargs) -> None:
+        raise sqlite3.OperationalError("disk I/O error")
+
+    # The reply reaches Zammad, then the local write after the post fails.
+    with monkeypatch.context() as patch:
+        patch.setattr(repository, "mark_article_replied", fail)
+        patch.setattr(repository, "update_ticket_last_seen_article_id", fail)
+        with pytest.raises(sqlite3.OperationalError):
+            poller.tick()
+    customer_articles = [
+        article
+        for article in gateway.fetch_new_articles(ticket.zammad_ticket_id, 0)
+        if article.sender == "customer"
+    ]
+    assert len(customer_articles) == 2
+
+    repository.schedule_ticket_polls([(ticket.id, utc_now(), 30)])
+    assert repository.get_ticket(ticket.id).last_seen_article_id == 0
+    assert poller.tick()["replies_sent"] == 0
+    assert len(gateway.fetch_new_articles(ticket.zammad_ticket_id, 0)) == 3
+
+
+def test_change_watermark_follows_zammad_time_on_an_accelerated_clock(tmp_path) -> None:
+    clock = SimulationClock(time_scale=60)
+    repository = SimulatorRepository(tmp_path / "sim.db", clock=clock)
+    repository.initialize()
+    catalog = CatalogService(templates_dir=TEMPLATES)
+    catalog.load()
+    gateway = DryRunGateway(clock=clock)
+    scheduler = SchedulerService(
+        repository=repository,
+        generation_service=GenerationService(catalog=catalog),
+        zammad_gateway=gateway,
+        clock=clock,
+    )
+    poller = PollerService(
+        repository=repository,
+        zammad_gateway=gateway,
+        response_engine=RuleBasedResponseEngine(),
+        grading_service=GradingService(),
+        poll_mode="changes",
+        clock=clock,
+    )
+    session = SessionService(repository=repository, catalog=catalog, clock=clock).clock_in(
+        "manual_only"
+    )
+    ticket = scheduler.create_manual_ticket(session_id=session.id)
+    assert ticket.zammad_ticket_id is not None
+
+    # Simulated time runs an hour ahead of Zammad's clock.
+    clock.advance(3600)
+    assert poller.tick()["tickets_checked"] == 1
+    gateway.add_agent_reply(ticket.zammad_ticket_id, "Could you share the exact error message?")
+
+    stats = poller.tick()
+    assert stats["tickets_checked"] == 1
+    assert stats["replies_sent"] == 1
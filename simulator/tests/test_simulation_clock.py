@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from helpdesk_sim.api.routes import router
+from helpdesk_sim.bootstrap import build_runtime
+from helpdesk_sim.clock import SimulationClock
+from helpdesk_sim.config import Settings
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+START = datetime(2026, 3, 2, 9, 0, tzinfo=UTC)
+
+
+def test_clock_scales_real_time_and_advances() -> None:
+    real = [100.0]
+    clock = SimulationClock(time_scale=60, start=START, monotonic=lambda: real[0])
+
+    real[0] += 2
+    assert clock() == START + timedelta(minutes=2)
+    assert clock.advance(3600) == START + timedelta(hours=1, minutes=2)
+    assert clock.real_seconds(120) == 2
+    assert clock.simulated_span(timedelta(seconds=2)) == timedelta(minutes=2)
+    frozen = SimulationClock(time_scale=0)
+    assert frozen.simulated_span(timedelta(seconds=2)) == timedelta(seconds=2)
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+
+
+def test_full_shift_runs_in_simulated_time(tmp_path) -> None:
+    settings = Settings(
+        _env_file=None,
+        db_path=tmp_path / "sim.db",
+        use_dry_run=True,
+        time_scale=0,
+        simulation_start=START,
+        dry_run_agent_bot=True,
+        dry_run_agent_reply_seconds=300,
+        dry_run_agent_jitter_seconds=0,
+        dry_run_agent_close_after=2,
+    )
+    runtime = build_runtime(settings=settings, cwd=PACKAGE_ROOT)
+    app = FastAPI()
+    app.include_router(router)
+    app.state.runtime = runtime
+    client = TestClient(app)
+    try:
+        session = runtime.session_service.clock_in("normal_day")
+        assert session.started_at == START
+
+        generated = 0
+        for _ in range(8 * 12 + 1):
+            response = client.post("/v1/admin/clock/advance", json={"seconds": 300})
+            assert response.status_code == 200
+            generated += response.json()["ticks"]["scheduler"]["tickets_generated"]
+
+        assert client.get("/v1/admin/clock").json()["clock"]["now"].startswith("2026-03-02T17:05")
+        assert runtime.session_service.get_session(session.id).status.value == "completed"
+        tickets = runtime.repository.list_tickets_for_session(session.id, limit=100)
+        assert len(tickets) == generated >= 16
+        closed = [ticket for ticket in tickets if ticket.closed_at is not None]
+        assert closed
+        for ticket in closed:
+            metrics = ticket.score["metrics"]
+            # Two agent replies five simulated minutes apart, seen by five-minute ticks.
+            assert 5 <= metrics["first_response_minutes"] <= 10
+            assert 10 <= metrics["resolution_minutes"] <= 25
+    finally:
+        client.close()
+        runtime.repository.close()
@@ -0,0 +1,244 @@
+import sqlite3
+import threading
+from datetime import timedelta
+
+import pytest
+
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
+from helpdesk_sim.utils import encode_cursor, utc_now
+
+
+def _repository(tmp_path) -> SimulatorRepository:
+    repository = SimulatorRepository(tmp_path / "sim.db")
+    repository.initialize()
+    return repository
+
+
+def _create_session(repository: SimulatorRepository):
+    now = utc_now()
+    return repository.create_session(
+        profile_name="normal_day",
+        started_at=now,
+        ends_at=now + timedelta(hours=8),
+        next_window_at=now,
+        config={"name": "normal_day"},
+    )
+
+
+def test_repository_uses_wal_and_reuses_connections(tmp_path) -> None:
+    repository = _repository(tmp_path)
+
+    with repository._connect() as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        first_connection = conn
+    with repository._connect() as conn:
+        second_connection = conn
+
+    assert journal_mode == "wal"
+    assert first_connection is second_connection
+
+
+def test_repository_close_releases_idle_connections(tmp_path) -> None:
+    repository = _repository(tmp_path)
+    session = _create_session(repository)
+
+    repository.close()
+
+    # Late callers still work after shutdown; they just stop being pooled.
+    assert repository.get_session(session.id) is not None
+
+
+def test_transaction_commits_all_writes_or_none(tmp_path) -> None:
+    repository = _repository(tmp_path)
+    session = _create_session(repository)
+
+    with pytest.raises(RuntimeError, match="boom"), repository.transaction():
+        ticket = repository.create_ticket(
+            session_id=session.id,
+            subject="Rolled back",
+            tier="tier1",
+            priority="normal",
+            scenario_id="s1",
+            hidden_truth={},
+            zammad_ticket_id=None,
+        )
+        repository.add_interaction(ticket_id=ticket.id, actor="customer", body="hello")
+        raise RuntimeError("boom")
+
+    assert repository.get_ticket(ticket.id) is None
+    assert repository.list_interactions(ticket.id) == []
+
+    with repository.transaction():
+        ticket = repository.create_ticket(
+            session_id=session.id,
+            subject="Committed",
+            tier="tier1",
+            priority="normal",
+            scenario_id="s1",
+            hidden_truth={},
+            zammad_ticket_id=None,
+        )
+        with repository.transaction():
+            repository.add_interaction(ticket_id=ticket.id, actor="customer", body="hello")
+        # Reads inside the transaction see its own uncommitted writes.
+        assert len(repository.list_interactions(ticket.id)) == 1
+
+    assert repository.get_ticket(ticket.id) is not None
+
+
+def test_write_queue_group_commits_concurrent_writes(tmp_path) -> None:
+    repository = SimulatorRepository(tmp_path / "sim.db", write_queue=True, write_batch_window_ms=5)
+    repository.initialize()
+    session = _create_session(repository)
+    ticket = repository.create_ticket(
+        session_id=session.id,
+        subject="Burst",
+        tier="tier1",
+        priority="normal",
+        scenario_id="s1",
+        hidden_truth={},
+        zammad_ticket_id=None,
+    )
+
+    def burst() -> None:
+        for _ in range(25):
+            repository.add_interaction(ticket_id=ticket.id, actor="agent", body="ping")
+
+    threads = [threading.Thread(target=burst) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    writer = repository._writer
+    assert writer is not None
+    assert len(repository.list_interactions(ticket.id)) == 200
+    assert writer.batches_committed < writer.writes_committed
+    repository.close()
+
+
+def test_write_queue_isolates_failing_writes_and_supports_transactions(tmp_path) -> None:
+    repository = SimulatorRepository(tmp_path / "sim.db", write_queue=True)
+    repository.initialize()
+    session = _create_session(repository)
+
+    failing = repository.submit_write(lambda conn: conn.execute("INSERT INTO missing VALUES (1)"))
+    surviving = repository.submit_write(
+        lambda conn: conn.execute(
+            "UPDATE sessions SET window_index = 3 WHERE id = ?", (session.id,)
+        ).rowcount
+    )
+
+    with pytest.raises(sqlite3.OperationalError):
+        failing.result()
+    assert surviving.result() == 1
+
+    with repository.transaction():
+        repository.advance_session_window(session.id, session.next_window_at, 7)
+        refreshed = repository.get_session(session.id)
+        assert refreshed is not None and refreshed.window_index == 7
+
+    stored = repository.get_session(session.id)
+    assert stored is not None
+    assert stored.window_index == 7
+    repository.close()
+
+
+def test_list_session_summaries_counts_tickets_by_status(tmp_path) -> None:
+    repository = _repository(tmp_path)
+    busy = _create_session(repository)
+    idle = _create_session(repository)
+    tickets = [
+        repository.create_ticket(
+            session_id=busy.id,
+            subject=f"Ticket {index}",
+            tier="tier1",
+            priority="normal",
+            scenario_id="s1",
+            hidden_truth={},
+            zammad_ticket_id=None,
+        )
+        for index in range(3)
+    ]
+    repository.close_ticket(tickets[0].id, score={})
+
+    summaries = {summary.id: summary for summary in repository.list_session_summaries()}
+
+    assert summaries[busy.id].ticket_count == 3
+    assert summaries[busy.id].open_ticket_count == 2
+    assert summaries[busy.id].closed_ticket_count == 1
+    assert summaries[idle.id].ticket_count == 0
+    assert summaries[idle.id].open_ticket_count == 0
+
+
+def test_keyset_pages_cover_tickets_and_interactions_once(tmp_path) -> None:
+    repository = _repository(tmp_path)
+    session = _create_session(repository)
+    created = [
+        repository.create_ticket(
+            session_id=session.id,
+            subject=f"Ticket {index}",
+            tier="tier1",
+            priority="normal",
+            scenario_id="s1",
+            hidden_truth={"root_cause": "secret"},
+            zammad_ticket_id=None,
+        )
+        for index in range(7)
+    ]
+    for index in range(5):
+        repository.add_interaction(ticket_id=created[0].id, actor="customer", body=f"m{index}")
+
+    seen: list[str] = []
+    after = None
+    while True:
+        page = repository.list_tickets_for_session(
+            session.id, limit=3, after=after, include_hidden_truth=False
+        )
+        seen.extend(ticket.id for ticket in page)
+        assert all(ticket.hidden_truth == {} for ticket in page)
+        if len(page) < 3:
+            break
+        after = encode_cursor(page[-1].created_at, page[-1].id)
+
+    first_page = repository.list_interactions(created[0].id, limit=2)
+    rest = repository.list_interactions(
+        created[0].id, after=encode_cursor(first_page[-1].created_at, first_page[-1].id)
+    )
+
+    assert sorted(seen) == sorted(ticket.id for ticket in created)
+    assert len(seen) == len(set(seen))
+    assert [row.body for row in first_page + rest] == [f"m{index}" for index in range(5)]
+    assert repository.list_tickets_for_session(session.id)[0].hidden_truth == {
+        "root_cause": "secret"
+    }
+    with pytest.raises(ValueError, match="cursor"):
+        repository.list_interactions(created[0].id, after="not-a-cursor")
+
+
+def test_session_changes_return_only_touched_tickets_and_new_interactions(tmp_path) -> None:
+    repository = _repository(tmp_path)
+    session = _create_session(repository)
+    quiet, busy = (
+        repository.create_ticket(
+            session_id=session.id,
+            subject=subject,
+            tier="tier1",
+            priority="normal",
+            scenario_id="s1",
+            hidden_truth={"root_cause": "secret"},
+            zammad_ticket_id=None,
+        )
+        for subject in ("Quiet", "Busy")
+    )
+    repository.add_interaction(ticket_id=busy.id, actor="customer", body="before")
+    since = utc_now()
+    repository.add_interaction(ticket_id=busy.id, actor="agent", body="after")
+
+    tickets, interactions = repository.list_session_changes(session.id, since=since)
+
+    assert [ticket.id for ticket in tickets] == [busy.id]
+    assert tickets[0].hidden_truth == {}
+    assert [row.body for row in interactions] == ["after"]
+    assert quiet.id not in {row.ticket_id for row in interactions}
+    assert repository.list_session_changes(session.id, since=utc_now()) == ([], [])
@@ -0,0 +1,122 @@
+import asyncio
+import json
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from helpdesk_sim.adapters.zammad_webhook import SIGNATURE_HEADER, sign_payload
+from helpdesk_sim.api.routes import router
+from helpdesk_sim.bootstrap import build_runtime
+from helpdesk_sim.config import Settings
+
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "zammad_webhooks"
+SECRET = "webhook-secret"
+
+
+def _client(tmp_path, secret: str = SECRET):
+    settings = Settings(
+        _env_file=None,
+        db_path=tmp_path / "sim.db",
+        use_dry_run=True,
+        zammad_webhook_secret=secret,
+    )
+    runtime = build_runtime(settings=settings, cwd=PACKAGE_ROOT)
+    app = FastAPI()
+    app.include_router(router)
+    app.state.runtime = runtime
+    return TestClient(app), runtime
+
+
+def _post_fixture(client: TestClient, name: str, secret: str = SECRET):
+    body = (FIXTURES / name).read_bytes()
+    return client.post(
+        "/v1/webhooks/zammad",
+        content=body,
+        headers={SIGNATURE_HEADER: sign_payload(body, secret), "Content-Type": "application/json"},
+    )
+
+
+def _manual_ticket(runtime):
+    session = runtime.session_service.clock_in("manual_only")
+    created = runtime.scheduler_service.create_manual_ticket(session_id=session.id)
+    # Zammad creation goes through the outbox; deliver it so the ticket is linked.
+    assert created.zammad_ticket_id is None
+    assert asyncio.run(runtime.workers.run_outbox_once())["delivered"] == 1
+    ticket = runtime.repository.get_ticket(created.id)
+    # The recorded payloads refer to Zammad ticket 1000, the dry-run gateway's first id.
+    assert ticket is not None and ticket.zammad_ticket_id == 1000
+    return ticket
+
+
+def test_article_webhook_processes_ticket_without_a_poll_sweep(tmp_path) -> None:
+    client, runtime = _client(tmp_path)
+    try:
+        ticket = _manual_ticket(runtime)
+        gateway = runtime.scheduler_service.zammad_gateway
+        gateway.add_agent_reply(1000, "Could you share the exact error message you see?")
+
+        response = _post_fixture(client, "article_created.json")
+        assert response.status_code == 202
+        assert response.json()["zammad_ticket_id"] == 1000
+
+        stats = asyncio.run(runtime.workers.run_pending_tickets_once())
+        assert stats["tickets_checked"] == 1
+        assert stats["replies_sent"] == 1
+        actors = [row.actor for row in runtime.repository.list_interactions(ticket.id)]
+        assert actors == ["customer", "agent", "customer"]
+
+        # The queue is drained: a second run does nothing.
+        assert asyncio.run(runtime.workers.run_pending_tickets_once())["tickets_checked"] == 0
+    finally:
+        runtime.repository.close()
+
+
+def test_state_change_webhook_grades_closed_ticket(tmp_path) -> None:
+    client, runtime = _client(tmp_path)
+    try:
+        ticket = _manual_ticket(runtime)
+        runtime.scheduler_service.zammad_gateway.close_ticket(1000)
+
+        assert _post_fixture(client, "state_changed.json").status_code == 202
+        stats = asyncio.run(runtime.workers.run_pending_tickets_once())
+
+        assert stats["tickets_closed"] == 1
+        closed = runtime.repository.get_ticket(ticket.id)
+        assert closed is not None
+        assert closed.status.value == "closed"
+    finally:
+        runtime.repository.close()
+
+
+def test_webhook_rejects_bad_signatures_and_unconfigured_receiver(tmp_path) -> None:
+    client, runtime = _client(tmp_path)
+    try:
+        assert _post_fixture(client, "article_created.json", secret="wrong").status_code == 401
+        unsigned = client.post("/v1/webhooks/zammad", content=b"{}")
+        assert unsigned.status_code == 401
+        assert asyncio.run(runtime.workers.run_pending_tickets_once())["tickets_checked"] == 0
+    finally:
+        runtime.repository.close()
+
+    disabled_client, disabled_runtime = _client(tmp_path / "disabled", secret="")
+    try:
+        assert _post_fixture(disabled_client, "article_created.json").status_code == 404
+    finally:
+        disabled_runtime.repository.close()
+
+
+def test_webhook_accepts_templated_ticket_id_payload(tmp_path) -> None:
+    client, runtime = _client(tmp_path)
+    try:
+        body = json.dumps({"ticket_id": "1000", "event": "article.created"}).encode()
+        response = client.post(
+            "/v1/webhooks/zammad",
+            content=body,
+            headers={SIGNATURE_HEADER: sign_payload(body, SECRET, "sha256")},
+        )
+        assert response.status_code == 202
+        assert response.json()["accepted"] is True
+    finally:
+        runtime.repository.close()
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import UTC, datetime
+
+import httpx
 import pytest
 
-from helpdesk_sim.adapters.zammad_http_gateway import ZammadHttpGateway
+from helpdesk_sim.adapters.customer_directory import CustomerDirectory
+from helpdesk_sim.adapters.ttl_cache import TtlCache
+from helpdesk_sim.adapters.zammad_async_gateway import AsyncZammadHttpGateway
+from helpdesk_sim.adapters.zammad_http_gateway import METADATA_PATHS, ZammadHttpGateway
+from helpdesk_sim.adapters.zammad_resilience import ZammadApiError
 from helpdesk_sim.domain.models import GeneratedTicket, TicketPriority, TicketTier
+from helpdesk_sim.repositories.sqlite_store import SimulatorRepository
 
 
 def _sample_ticket() -> GeneratedTicket:
@@ -279,3 +288,351 @@ def test_close_ticket_calls_put_and_returns_true_when_closed() -> None:
         ("PUT", "/api/v1/tickets/66016"),
         ("GET", "/api/v1/tickets/66016"),
     ]
+
+
+def test_requests_share_one_authenticated_client_until_closed() -> None:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path == "/api/v1/tickets/7":
+            return httpx.Response(200, json={"state": "open"})
+        return httpx.Response(404, text="missing")
+
+    gateway = ZammadHttpGateway(
+        base_url="http://zammad.local/",
+        token="secret",
+        transport=httpx.MockTransport(handler),
+    )
+    client = gateway._client
+
+    assert gateway.is_ticket_closed(7) is False
+    with pytest.raises(RuntimeError, match="404"):
+        gateway._request("GET", "/api/v1/tickets/8")
+
+    assert gateway._client is client
+    assert [str(request.url) for request in seen] == [
+        "http://zammad.local/api/v1/tickets/7",
+        "http://zammad.local/api/v1/tickets/8",
+    ]
+    assert all(request.headers["Authorization"] == "Token token=secret" for request in seen)
+
+    gateway.close()
+    assert client.is_closed
+
+
+def test_metadata_is_cached_with_ttl_and_manual_invalidation() -> None:
+    gateway = ZammadHttpGateway(base_url="http://zammad.local", token="token")
+    now = [0.0]
+    gateway._metadata = TtlCache(ttl_seconds=60, clock=lambda: now[0])
+    calls: list[str] = []
+
+    def fake_request(method: str, path: str, json: dict[str, object] | None = None) -> object:
+        calls.append(path)
+        if path == "/api/v1/roles":
+            return [{"id": 3, "name": "Customer"}]
+        if path == "/api/v1/ticket_states":
+            return [{"id": 1, "name": "new"}, {"id": 4, "name": "closed"}]
+        if path == "/api/v1/tickets/9":
+            return {"state_id": 4}
+        return []
+
+    gateway._request = fake_request  # type: ignore[method-assign]
+    gateway.warm_up()
+    assert sorted(calls) == sorted(METADATA_PATHS.values())
+
+    calls.clear()
+    assert gateway._customer_role_id() == 3
+    assert gateway._customer_role_id() == 3
+    assert gateway._new_ticket_state_id() == 1
+    assert gateway.is_ticket_closed(9) is True
+    assert calls == ["/api/v1/tickets/9"]
+
+    assert gateway.invalidate_caches("metadata", "roles") == 1
+    gateway._customer_role_id()
+    now[0] = 61.0
+    gateway._closed_ticket_state_id()
+    assert calls[1:] == ["/api/v1/roles", "/api/v1/ticket_states"]
+
+    stats = gateway.cache_stats()["metadata"]
+    assert stats["hits"] == 4
+    assert stats["loads"] == 6
+    with pytest.raises(ValueError, match="unknown cache"):
+        gateway.invalidate_caches("nope")
+
+
+def test_warm_customer_directory_leaves_one_post_per_ticket_across_restarts(tmp_path) -> None:
+    repository = SimulatorRepository(tmp_path / "sim.db")
+    repository.initialize()
+    calls: list[tuple[str, str]] = []
+
+    def fake_request(method: str, path: str, json: dict[str, object] | None = None) -> object:
+        calls.append((method, path))
+        if path == "/api/v1/roles":
+            return [{"id": 3, "name": "Customer"}]
+        if path == "/api/v1/users/search?query=hr":
+            return [{"id": 77, "email": "emily.carter@bmm.local", "role_ids": [3]}]
+        if path.startswith("/api/v1/users/search?query="):
+            return [{"id": 78, "email": "melissa.brooks@bmm.local"}]
+        if method == "POST" and path == "/api/v1/tickets":
+            return {"id": 105}
+        return []
+
+    def build_gateway() -> ZammadHttpGateway:
+        directory = CustomerDirectory(
+            seed_departments=["HR"],
+            seed_emails=["melissa.brooks@bmm.local"],
+            on_update=repository.save_customer_directory_entry,
+        )
+        directory.load(repository.list_customer_directory())
+        gateway = ZammadHttpGateway(
+            base_url="http://zammad.local",
+            token="token",
+            customer_directory=directory,
+        )
+        gateway._request = fake_request  # type: ignore[method-assign]
+        return gateway
+
+    gateway = build_gateway()
+    gateway.warm_up()
+    calls.clear()
+    gateway.create_ticket(_sample_ticket())
+    gateway.create_ticket(_sample_ticket())
+    assert calls == [("POST", "/api/v1/tickets"), ("POST", "/api/v1/tickets")]
+
+    # After a restart the persisted directory is already warm: no customer searches.
+    restarted = build_gateway()
+    calls.clear()
+    restarted.warm_up()
+    assert not [call for call in calls if "users/search" in call[1]]
+    assert restarted.cache_stats()["customers"]["departments"] == 1
+
+
+def test_async_gateway_polls_articles_and_resolves_state_ids_once() -> None:
+    seen: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(f"{request.method} {request.url.path}")
+        assert request.headers["Authorization"] == "Token token=token"
+        if request.url.path == "/api/v1/ticket_articles/by_ticket/7":
+            return httpx.Response(
+                200,
+                json=[
+                    {"id": 2, "body": "Try a restart", "sender": "Agent"},
+                    {"id": 1, "body": "Laptop is slow", "sender": "Customer"},
+                ],
+            )
+        if request.url.path == "/api/v1/tickets/7":
+            return httpx.Response(200, json={"id": 7, "state_id": 4})
+        if request.url.path == "/api/v1/ticket_states":
+            return httpx.Response(200, json=[{"id": 4, "name": "closed", "state_type": "closed"}])
+        if request.url.path == "/api/v1/ticket_articles":
+            return httpx.Response(201, json={"id": 3})
+        return httpx.Response(404)
+
+    async def exercise() -> tuple[list[int], bool, bool]:
+        gateway = AsyncZammadHttpGateway(
+            base_url="http://zammad.local",
+            token="token",
+            transport=httpx.MockTransport(handler),
+        )
+        try:
+            articles = await gateway.fetch_new_articles(7, after_article_id=1)
+            await gateway.post_customer_reply(7, body="Done", subject="Re: slow")
+            first = await gateway.is_ticket_closed(7)
+            second = await gateway.is_ticket_closed(7)
+        finally:
+            await gateway.aclose()
+        return [article.id for article in articles], first, second
+
+    article_ids, first, second = asyncio.run(exercise())
+
+    assert article_ids == [2]
+    assert first is True and second is True
+    assert seen.count("GET /api/v1/ticket_states") == 1
+    assert "POST /api/v1/ticket_articles" in seen
+
+
+def _ticket_all_payload() -> dict[str, object]:
+    return {
+        "ticket_id": 7,
+        "ticket_article_ids": [1, 2, 3],
+        "assets": {
+            "Ticket": {"7": {"id": 7, "state_id": 4}},
+            "TicketArticle": {
+                "1": {"id": 1, "body": "Laptop is slow", "sender_id": 2, "from": "Emily"},
+                "3": {"id": 3, "body": "Try a restart", "sender_id": 1, "from": "Sam Lee"},
+                "2": {"id": 2, "body": "Any update?", "sender_id": 2, "from": "Emily"},
+            },
+            "TicketState": {"4": {"id": 4, "name": "closed"}},
+        },
+    }
+
+
+def test_fetch_ticket_updates_reads_articles_and_state_in_one_request() -> None:
+    gateway = ZammadHttpGateway(base_url="http://zammad.local", token="token")
+    calls: list[str] = []
+
+    def fake_request(method: str, path: str, json: dict[str, object] | None = None) -> object:
+        calls.append(f"{method} {path}")
+        if path == "/api/v1/tickets/7?all=true":
+            return _ticket_all_payload()
+        raise AssertionError(f"unexpected request {method} {path}")
+
+    gateway._request = fake_request  # type: ignore[method-assign]
+    update = gateway.fetch_ticket_updates(7, after_article_id=1)
+
+    assert calls == ["GET /api/v1/tickets/7?all=true"]
+    assert [article.id for article in update.articles] == [2, 3]
+    assert [article.is_agent for article in update.articles] == [False, True]
+    assert update.closed is True
+
+
+def test_fetch_ticket_updates_falls_back_without_assets() -> None:
+    gateway = ZammadHttpGateway(base_url="http://zammad.local", token="token")
+    calls: list[str] = []
+
+    def fake_request(method: str, path: str, json: dict[str, object] | None = None) -> object:
+        calls.append(path)
+        if path == "/api/v1/tickets/7?all=true":
+            return {"id": 7, "state": "open"}
+        if path == "/api/v1/ticket_articles/by_ticket/7":
+            return [{"id": 2, "body": "Try a restart", "sender": "Agent"}]
+        if path == "/api/v1/tickets/7":
+            return {"id": 7, "state": "open"}
+        raise AssertionError(f"unexpected request {method} {path}")
+
+    gateway._request = fake_request  # type: ignore[method-assign]
+    update = gateway.fetch_ticket_updates(7, after_article_id=0)
+
+    assert [article.id for article in update.articles] == [2]
+    assert update.closed is False
+    assert calls == [
+        "/api/v1/tickets/7?all=true",
+        "/api/v1/ticket_articles/by_ticket/7",
+        "/api/v1/tickets/7",
+    ]
+
+
+def test_async_fetch_ticket_updates_caches_unlisted_state_ids() -> None:
+    seen: list[str] = []
+    payload = _ticket_all_payload()
+    payload["assets"].pop("TicketState")  # type: ignore[union-attr]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/api/v1/tickets/7":
+            return httpx.Response(200, json=payload)
+        if request.url.path == "/api/v1/ticket_states":
+            return httpx.Response(403, json={"error": "not authorized"})
+        if request.url.path == "/api/v1/ticket_states/4":
+            return httpx.Response(200, json={"id": 4, "name": "closed"})
+        return httpx.Response(404)
+
+    async def exercise() -> list[bool]:
+        gateway = AsyncZammadHttpGateway(
+            base_url="http://zammad.local",
+            token="token",
+            transport=httpx.MockTransport(handler),
+        )
+        try:
+            return [
+                (await gateway.fetch_ticket_updates(7, after_article_id=3)).closed
+                for _ in range(3)
+            ]
+        finally:
+            await gateway.aclose()
+
+    assert asyncio.run(exercise()) == [True, True, True]
+    assert seen.count("/api/v1/tickets/7") == 3
+    assert seen.count("/api/v1/ticket_states") == 1
+    assert seen.count("/api/v1/ticket_states/4") == 1
+
+
+def test_search_updated_tickets_pages_through_sorted_results() -> None:
+    gateway = ZammadHttpGateway(base_url="http://zammad.local", token="token")
+    paths: list[str] = []
+
+    def fake_request(method: str, path: str, json: dict[str, object] | None = None) -> object:
+        paths.append(path)
+        first = 1 if "page=1&" in path else 101
+        size = 100 if first == 1 else 2
+        ids = list(range(first, first + size))
+        return {
+            "tickets": ids,
+            "assets": {
+                "Ticket": {
+                    str(ticket_id): {"id": ticket_id, "updated_at": "2026-01-05T10:00:00.123Z"}
+                    for ticket_id in ids
+                }
+            },
+        }
+
+    gateway._request = fake_request  # type: ignore[method-assign]
+    changes = gateway.search_updated_tickets(datetime(2026, 1, 5, 9, 59, tzinfo=UTC))
+
+    assert len(changes) == 102
+    assert changes[101] == datetime(2026, 1, 5, 10, 0, 0, 123000, tzinfo=UTC)
+    assert len(paths) == 2
+    assert "query=updated_at%3A%3E%3D2026-01-05T09%3A59%3A00Z" in paths[0]
+    assert "sort_by=updated_at&order_by=asc" in paths[0]
+
+
+def test_idempotency_lookup_raises_when_search_fails() -> None:
+    gateway = ZammadHttpGateway(base_url="http://zammad.local", token="token")
+
+    def fake_request(method: str, path: str, json: dict[str, object] | None = None) -> object:
+        raise ZammadApiError("search unavailable", status_code=503)
+
+    gateway._request = fake_request  # type: ignore[method-assign]
+    with pytest.raises(ZammadApiError):
+        gateway.find_ticket_by_idempotency_key("abc123")
+
+
+def test_async_gateway_state_lookups_follow_shared_cache_invalidation() -> None:
+    seen: list[str] = []
+    state_names = ["open"]
+
+    def states() -> list[dict[str, object]]:
+        return [{"id": 4, "name": state_names[0], "state_type": state_names[0]}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/api/v1/ticket_states":
+            return httpx.Response(200, json=states())
+        return httpx.Response(200, json=[])
+
+    async def async_handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/api/v1/tickets/7":
+            return httpx.Response(200, json={"id": 7, "state_id": 4})
+        if request.url.path == "/api/v1/ticket_states":
+            return httpx.Response(200, json=states())
+        return httpx.Response(404)
+
+    sync_gateway = ZammadHttpGateway(
+        base_url="http://zammad.local", token="token", transport=httpx.MockTransport(handler)
+    )
+    gateway = AsyncZammadHttpGateway(
+        base_url="http://zammad.local",
+        token="token",
+        transport=httpx.MockTransport(async_handler),
+        metadata_cache=sync_gateway.metadata_cache,
+    )
+
+    async def closed() -> bool:
+        return await gateway.is_ticket_closed(7)
+
+    try:
+        sync_gateway.warm_up()
+        assert asyncio.run(closed()) is False
+        assert seen.count("/api/v1/ticket_states") == 1
+        assert sync_gateway.cache_stats()["metadata"]["hits"] == 1
+
+        state_names[0] = "closed"
+        assert sync_gateway.invalidate_caches("metadata", "ticket_states") == 1
+        assert asyncio.run(closed()) is True
+        assert seen.count("/api/v1/ticket_states") == 2
+    finally:
+        sync_gateway.close()
+        asyncio.run(gateway.aclose())
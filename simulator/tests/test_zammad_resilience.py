@@ -0,0 +1,180 @@
+import asyncio
+
+import httpx
+import pytest
+
+from helpdesk_sim.adapters.zammad_async_gateway import AsyncZammadHttpGateway
+from helpdesk_sim.adapters.zammad_http_gateway import ZammadHttpGateway
+from helpdesk_sim.adapters.zammad_resilience import (
+    CircuitOpenError,
+    TokenBucket,
+    ZammadApiError,
+    ZammadResilience,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _gateway(handler, resilience: ZammadResilience) -> ZammadHttpGateway:
+    return ZammadHttpGateway(
+        base_url="http://zammad.local",
+        token="secret",
+        transport=httpx.MockTransport(handler),
+        resilience=resilience,
+    )
+
+
+def test_token_bucket_allows_a_burst_then_spaces_calls_at_the_rate() -> None:
+    clock = _FakeClock()
+    bucket = TokenBucket(rate_per_second=10, burst=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+    clock.now += 1.0
+    assert bucket.reserve() == 0.0
+    assert TokenBucket(rate_per_second=0).reserve() == 0.0
+
+
+def test_idempotent_calls_retry_transient_errors_but_posts_do_not() -> None:
+    statuses = iter([503, 429, 200])
+    posts: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            posts.append(request)
+            return httpx.Response(502)
+        return httpx.Response(next(statuses), json={"id": 7, "state": "open"})
+
+    resilience = ZammadResilience(max_attempts=3, retry_base_seconds=0, retry_max_seconds=0)
+    gateway = _gateway(handler, resilience)
+
+    assert gateway.is_ticket_closed(7) is False
+    with pytest.raises(ZammadApiError) as error:
+        gateway.post_customer_reply(7, body="Thanks", subject="Re: VPN")
+    assert error.value.status_code == 502
+    assert len(posts) == 1
+    stats = resilience.stats()
+    assert stats["retries"] == 2
+    assert stats["failures"] == 3
+    gateway.close()
+
+
+def test_circuit_breaker_fails_fast_then_probes_and_closes() -> None:
+    clock = _FakeClock()
+    healthy = [False]
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if not healthy[0]:
+            raise httpx.ReadTimeout("Zammad is slow", request=request)
+        return httpx.Response(200, json={"id": 7, "state": "closed"})
+
+    resilience = ZammadResilience(
+        breaker_failure_threshold=2, breaker_reset_seconds=30, clock=clock
+    )
+    gateway = _gateway(handler, resilience)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ReadTimeout):
+            gateway.is_ticket_closed(7)
+    with pytest.raises(CircuitOpenError):
+        gateway.is_ticket_closed(7)
+    assert len(calls) == 2
+    assert resilience.stats()["breaker_state"] == "open"
+
+    # After the reset timeout one probe goes out; a failure re-opens the breaker.
+    clock.now += 30
+    with pytest.raises(httpx.ReadTimeout):
+        gateway.is_ticket_closed(7)
+    with pytest.raises(CircuitOpenError):
+        gateway.is_ticket_closed(7)
+
+    clock.now += 30
+    healthy[0] = True
+    assert gateway.is_ticket_closed(7) is True
+    stats = resilience.stats()
+    assert stats["breaker_state"] == "closed"
+    assert stats["breaker_opened"] == 2
+    assert stats["rejected"] == 2
+    gateway.close()
+
+
+def test_cancelled_half_open_probe_does_not_leave_the_breaker_stuck() -> None:
+    clock = _FakeClock()
+    resilience = ZammadResilience(
+        breaker_failure_threshold=1, breaker_reset_seconds=30, clock=clock
+    )
+
+    async def fail() -> None:
+        raise httpx.ConnectError("Zammad unreachable")
+
+    async def ok() -> str:
+        return "ok"
+
+    async def scenario() -> str:
+        with pytest.raises(httpx.ConnectError):
+            await resilience.acall("GET", fail)
+        clock.now += 30
+        started = asyncio.Event()
+
+        async def hang() -> None:
+            started.set()
+            await asyncio.Event().wait()
+
+        probe = asyncio.create_task(resilience.acall("GET", hang))
+        await started.wait()
+        assert resilience.breaker.state == "half_open"
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return await resilience.acall("GET", ok)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert resilience.breaker.state == "closed"
+
+
+def test_unanswered_half_open_probe_expires_after_the_reset_timeout() -> None:
+    clock = _FakeClock()
+    resilience = ZammadResilience(
+        breaker_failure_threshold=1, breaker_reset_seconds=30, clock=clock
+    )
+    resilience.breaker.record_failure()
+    clock.now += 30
+    assert resilience.breaker.allow() is True
+    assert resilience.breaker.allow() is False
+
+    clock.now += 30
+    assert resilience.call("GET", lambda: "ok") == "ok"
+    assert resilience.breaker.state == "closed"
+
+
+def test_async_gateway_shares_retry_policy() -> None:
+    statuses = iter([500, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), json={"id": 7, "state": "open"})
+
+    resilience = ZammadResilience(max_attempts=2, retry_base_seconds=0, retry_max_seconds=0)
+
+    async def exercise() -> bool:
+        gateway = AsyncZammadHttpGateway(
+            base_url="http://zammad.local",
+            token="token",
+            transport=httpx.MockTransport(handler),
+            resilience=resilience,
+        )
+        try:
+            return await gateway.is_ticket_closed(7)
+        finally:
+            await gateway.aclose()
+
+    assert asyncio.run(exercise()) is False
+    assert resilience.stats()["retries"] == 1